@@ -81,8 +81,18 @@ def get_directory_results(search_query, location='', limit=6):
     """
     Given a user's search query, find matching directory employers.
 
+    `search_query` is a raw string or a jobs.search.ListingSearch; either way
+    it goes through the same normalization as the /jobs/ listing search, so
+    the sidebar and the feed always agree on what was searched for.
+
     Returns list of dicts with employer info and deep-link URLs.
     """
+    from jobs.search import ListingSearch
+
+    if not isinstance(search_query, ListingSearch):
+        search_query = ListingSearch(search_query)
+    search_query = search_query.text
+
     mapping, alias = match_title(search_query)
     if not mapping:
         return [], None
@@ -293,6 +293,34 @@ CACHES = {
     }
 }
 
+# Cache shared by the gunicorn workers (jobs/sharedcache.py): expensive page
+# payloads are built once per TTL for the service, not per worker.
+#   file  - FileBasedCache under SHARED_CACHE_DIR (the default in production).
+#           Shared only by processes on one machine: on Render, cron jobs are
+#           separate services with their own /tmp, so `refresh_home_cache` and
+#           the sync/score commands' refreshes never reach the web service's
+#           copy there; the web workers rebuild it themselves once it expires.
+#   redis - Django's RedisCache at REDIS_URL (needs the `redis` package).
+#           Required for cron services to refresh the web service's cache.
+#   locmem - per-process, for dev/tests
+SHARED_CACHE_BACKEND = config('SHARED_CACHE_BACKEND', default='locmem' if DEBUG else 'file')
+if SHARED_CACHE_BACKEND == 'redis':
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+    }
+elif SHARED_CACHE_BACKEND == 'file':
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('SHARED_CACHE_DIR', default='/tmp/rjrp-shared-cache'),
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    }
+else:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+    }
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -91,10 +91,12 @@ def robots_txt(request):
         "# from /jobs/; nothing links to them.",
         "Disallow: /jobs/preview/",
         "",
-        "# Don't crawl deep paginated list pages — every ?page=N hit rebuilds the",
-        "# full merged/sorted feed in memory (expensive, no SEO value over page 1).",
+        "# Don't crawl deep paginated list pages (keyset ?cursor= links, plus the",
+        "# legacy ?page=N form) — no SEO value over page 1.",
         "Disallow: /*?page=",
         "Disallow: /*&page=",
+        "Disallow: /*?cursor=",
+        "Disallow: /*&cursor=",
         "",
         f"Sitemap: https://realjobsrealpeople.net/sitemap.xml",
     ])
@@ -0,0 +1,266 @@
+"""
+ATS pipeline analytics: the PipelineDailyRollup counters and the dashboard
+metrics read from them.
+
+analytics_dashboard used to run a COUNT per stage for the distribution, two
+distinct().count() per stage pair for conversion rates and, for time in
+stage, a .first() lookup of the next history row for every
+ApplicationStageHistory row — O(history) queries per page load. The
+metrics now come from per-employer daily counters:
+
+- a row without a stage holds the applications received that day;
+- a stage row holds the entries into the stage, the applications reaching
+  it for the first time (the funnel: old from_count/to_count) and the exits
+  out of it with the seconds spent in it (time in stage).
+
+apply_job and move_application_stage add to the day's rows as things
+happen (record_application / record_stage_change: a couple of small
+queries each). rebuild_rollups() recomputes everything from history in one
+window query — LEAD(changed_at) OVER (PARTITION BY application ORDER BY
+changed_at) is when the application left each stage, ROW_NUMBER() OVER
+(PARTITION BY application, stage) picks out first visits — plus one grouped
+count of applications. Migration 0040 runs it to backfill. Deleting
+applications (directly, or with their job or applicant) rebuilds the
+affected employers once the transaction commits (rebuild_after_delete, from
+the JobApplication post_delete signal), so the rollup drops their counts.
+
+pipeline_metrics() and applications_by_date() read the dashboard figures in
+a fixed number of queries, however big the pipeline.
+
+Two concurrent first writes for an (employer, day, stage) can both insert
+when stage is NULL (NULLs don't collide in the unique constraint). Readers
+always SUM over rows, so a duplicate row is harmless.
+"""
+
+from collections import defaultdict
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum, Window
+from django.db.models.functions import Lead, RowNumber, TruncDate
+from django.utils import timezone
+
+
+ROLLUP_COUNTERS = ('applications', 'entered', 'reached', 'exited', 'seconds_in_stage')
+
+_CHUNK = 5000
+
+
+def _bump(employer_id, day, stage_id, **counts):
+    """Add `counts` to the (employer, day, stage) row, creating it if needed."""
+    from jobs.models import PipelineDailyRollup
+
+    rows = PipelineDailyRollup.objects.filter(employer_id=employer_id, date=day, stage_id=stage_id)
+    increments = {field: F(field) + n for field, n in counts.items()}
+    if rows.update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            PipelineDailyRollup.objects.create(
+                employer_id=employer_id, date=day, stage_id=stage_id, **counts,
+            )
+    except IntegrityError:
+        # Created concurrently since the update
+        rows.update(**increments)
+
+
+def record_application(application):
+    """Count a new application for its job's employer."""
+    employer_id = application.job.posted_by_id
+    if employer_id is None:
+        return
+    _bump(employer_id, timezone.localdate(application.applied_date), None, applications=1)
+
+
+def record_stage_change(history):
+    """
+    Count a just-created ApplicationStageHistory row: an entry into its
+    stage (and a first visit, if it is one) and an exit from the stage the
+    application was in, with the time spent there.
+    """
+    from jobs.models import ApplicationStageHistory
+
+    application = history.application
+    employer_id = application.job.posted_by_id
+    if employer_id is None or history.stage_id is None:
+        return
+    earlier = ApplicationStageHistory.objects.filter(
+        application_id=application.pk,
+        changed_at__lte=history.changed_at,
+    ).exclude(pk=history.pk)
+    previous = earlier.order_by('-changed_at', '-pk').values_list('stage_id', 'changed_at').first()
+    first_visit = not earlier.filter(stage_id=history.stage_id).exists()
+
+    day = timezone.localdate(history.changed_at)
+    _bump(employer_id, day, history.stage_id, entered=1, reached=int(first_visit))
+    if previous is not None and previous[0] is not None:
+        stage_id, entered_at = previous
+        seconds = int((history.changed_at - entered_at).total_seconds())
+        _bump(employer_id, day, stage_id, exited=1, seconds_in_stage=seconds)
+
+
+def rollup_counters(employer_ids=None, apps=global_apps):
+    """
+    {(employer_id, date, stage_id or None): {counter: n}} recomputed from
+    applications and stage history, for `employer_ids` (everyone when None).
+    `apps` is the model registry (a migration passes its historical one).
+    """
+    ApplicationStageHistory = apps.get_model('jobs', 'ApplicationStageHistory')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+
+    applications = JobApplication.objects.filter(job__posted_by__isnull=False)
+    history = ApplicationStageHistory.objects.filter(application__job__posted_by__isnull=False)
+    if employer_ids is not None:
+        employer_ids = list(employer_ids)
+        applications = applications.filter(job__posted_by_id__in=employer_ids)
+        history = history.filter(application__job__posted_by_id__in=employer_ids)
+
+    counters = defaultdict(lambda: dict.fromkeys(ROLLUP_COUNTERS, 0))
+    received = applications.annotate(day=TruncDate('applied_date')).values(
+        'job__posted_by_id', 'day',
+    ).annotate(n=Count('id')).order_by()
+    for row in received:
+        counters[row['job__posted_by_id'], row['day'], None]['applications'] = row['n']
+
+    in_order = [F('changed_at').asc(), F('id').asc()]
+    visits = history.annotate(
+        left_at=Window(Lead('changed_at'), partition_by=[F('application_id')], order_by=in_order),
+        visit=Window(RowNumber(), partition_by=[F('application_id'), F('stage_id')], order_by=in_order),
+    ).order_by().values_list(
+        'application__job__posted_by_id', 'stage_id', 'changed_at', 'left_at', 'visit',
+    )
+    for employer_id, stage_id, entered_at, left_at, visit in visits.iterator(chunk_size=_CHUNK):
+        if stage_id is None:
+            # Stage since deleted; still ends the visit before it (left_at above)
+            continue
+        entry = counters[employer_id, timezone.localdate(entered_at), stage_id]
+        entry['entered'] += 1
+        if visit == 1:
+            entry['reached'] += 1
+        if left_at is not None:
+            leaving = counters[employer_id, timezone.localdate(left_at), stage_id]
+            leaving['exited'] += 1
+            leaving['seconds_in_stage'] += int((left_at - entered_at).total_seconds())
+    return counters
+
+
+def rebuild_rollups(employer_ids=None, apps=global_apps):
+    """Replace the rollup rows of `employer_ids` (everyone when None). Returns rows written."""
+    PipelineDailyRollup = apps.get_model('jobs', 'PipelineDailyRollup')
+
+    counters = rollup_counters(employer_ids, apps)
+    rows = PipelineDailyRollup.objects.all()
+    if employer_ids is not None:
+        rows = rows.filter(employer_id__in=list(employer_ids))
+    with transaction.atomic():
+        rows.delete()
+        PipelineDailyRollup.objects.bulk_create(
+            [
+                PipelineDailyRollup(employer_id=employer_id, date=day, stage_id=stage_id, **counts)
+                for (employer_id, day, stage_id), counts in counters.items()
+            ],
+            batch_size=_CHUNK,
+        )
+    return len(counters)
+
+
+def rebuild_after_delete(application, origin=None):
+    """
+    A JobApplication was deleted: queue one rebuild of its employer's rollup
+    for when the transaction commits. A delete() call fires this for every
+    application it removes (cascades included), so employers already queued
+    by the same call are skipped; `origin` is the signal's delete() origin.
+    """
+    from jobs.models import Job
+
+    jobs, employers = (origin if origin is not None else application).__dict__.setdefault(
+        '_rollup_rebuilds', (set(), set()),
+    )
+    if application.job_id in jobs:
+        return
+    jobs.add(application.job_id)
+    # A cascade deletes the job after its applications, so it can still be read here
+    employer_id = Job.objects.filter(pk=application.job_id).values_list(
+        'posted_by_id', flat=True,
+    ).first()
+    if employer_id is None or employer_id in employers:
+        return
+    employers.add(employer_id)
+    transaction.on_commit(lambda: rebuild_rollups([employer_id]))
+
+
+def applications_by_date(employer, since):
+    """[{'date', 'count'}] of applications received per day from the date `since`."""
+    from jobs.models import PipelineDailyRollup
+
+    return list(
+        PipelineDailyRollup.objects.filter(
+            employer=employer, stage__isnull=True, date__gte=since,
+        ).values('date').annotate(count=Sum('applications')).order_by('date')
+    )
+
+
+def pipeline_metrics(employer):
+    """
+    The dashboard's pipeline figures for `employer` in three queries:
+    total_applications, stage_distribution, conversion_rates and
+    time_in_stage (same shapes as the template has always used).
+    """
+    from jobs.models import HiringStage, JobApplication, PipelineDailyRollup
+
+    stages = list(HiringStage.objects.filter(employer=employer).order_by('order'))
+    current = dict(
+        JobApplication.objects.filter(job__posted_by=employer)
+        .values('current_stage').annotate(n=Count('id')).order_by()
+        .values_list('current_stage', 'n')
+    )
+    totals = {
+        row['stage']: row
+        for row in PipelineDailyRollup.objects.filter(employer=employer, stage__isnull=False)
+        .values('stage').annotate(
+            reached=Sum('reached'), exited=Sum('exited'), seconds=Sum('seconds_in_stage'),
+        ).order_by()
+    }
+
+    stage_distribution = [
+        {'name': stage.name, 'color': stage.color, 'count': current.get(stage.pk, 0)}
+        for stage in stages
+    ]
+    if current.get(None):
+        stage_distribution.insert(0, {
+            'name': 'No Stage',
+            'color': '#e9ecef',
+            'count': current[None],
+        })
+
+    def reached(stage):
+        return totals[stage.pk]['reached'] if stage.pk in totals else 0
+
+    conversion_rates = []
+    for stage, next_stage in zip(stages, stages[1:]):
+        current_count, next_count = reached(stage), reached(next_stage)
+        rate = (next_count / current_count * 100) if current_count > 0 else 0
+        conversion_rates.append({
+            'from_stage': stage.name,
+            'to_stage': next_stage.name,
+            'from_count': current_count,
+            'to_count': next_count,
+            'rate': round(rate, 1)
+        })
+
+    time_in_stage = []
+    for stage in stages:
+        row = totals.get(stage.pk)
+        avg_days = row['seconds'] / 86400 / row['exited'] if row and row['exited'] else 0
+        time_in_stage.append({
+            'stage': stage.name,
+            'color': stage.color,
+            'avg_days': round(avg_days, 1)
+        })
+
+    return {
+        'total_applications': sum(current.values()),
+        'stage_distribution': stage_distribution,
+        'conversion_rates': conversion_rates,
+        'time_in_stage': time_in_stage,
+    }
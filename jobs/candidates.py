@@ -0,0 +1,122 @@
+"""
+Candidate search over job-seeker profiles.
+
+candidate_search used to load every searchable job-seeker profile, call
+is_verified() on each — two one-to-one lookups per profile — and re-filter
+with an `id IN (...)` list of the survivors before a five-column icontains
+search. It now runs on two columns of UserProfile kept current here:
+
+- contact_verified: is_verified() (phone OR email verified) as a boolean,
+  so the verified pool is a WHERE clause (partial index in 0042);
+- search_vector: weighted tsvector over the user's name and desired title
+  (A), skills (B) and bio (C), GIN-indexed on Postgres (0042), matched with
+  websearch syntax and ranked with ts_rank like listing search
+  (jobs/search.py).
+
+refresh_candidates() rewrites both for a queryset of profiles in one UPDATE.
+The signals in jobs/signals.py call it when a profile, a user's name or a
+phone/email verification is saved or deleted; `manage.py
+update_search_index --candidates` rebuilds every profile.
+
+SQLite (dev/test) has no tsvector: matching falls back to icontains across
+the same five columns and rank is unavailable.
+
+Usage:
+    search = CandidateSearch(request.GET.get('search', ''))
+    candidates = search.filter(candidate_pool())
+"""
+
+from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import BooleanField, Exists, ExpressionWrapper, F, OuterRef, Q, Subquery
+
+from jobs.search import SEARCH_CONFIG, normalize_query
+
+
+def contact_verified_expression():
+    """SQL for is_verified(): the profile's user has a verified phone or email."""
+    from jobs.models import EmailVerification, PhoneVerification
+
+    return ExpressionWrapper(
+        Exists(PhoneVerification.objects.filter(user_id=OuterRef('user_id'), is_verified=True))
+        | Exists(EmailVerification.objects.filter(user_id=OuterRef('user_id'), is_verified=True)),
+        output_field=BooleanField(),
+    )
+
+
+def candidate_search_vector():
+    """Weighted tsvector expression for a UserProfile row."""
+    user = User.objects.filter(pk=OuterRef('user_id'))
+    return (
+        SearchVector(
+            Subquery(user.values('first_name')), Subquery(user.values('last_name')),
+            weight='A', config=SEARCH_CONFIG,
+        )
+        + SearchVector('desired_title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('skills', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('bio', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def refresh_candidates(queryset):
+    """
+    Recompute contact_verified (and search_vector on Postgres) for every
+    profile in `queryset` in one UPDATE. Returns rows written.
+    """
+    values = {'contact_verified': contact_verified_expression()}
+    if connections[queryset.db].vendor == 'postgresql':
+        values['search_vector'] = candidate_search_vector()
+    return queryset.update(**values)
+
+
+def candidate_pool(recruiter=False):
+    """Searchable, verified job seekers; for recruiters only those open to contact."""
+    from jobs.models import UserProfile
+
+    candidates = UserProfile.objects.filter(
+        user_type='job_seeker',
+        profile_searchable=True,
+        contact_verified=True,
+    )
+    if recruiter:
+        candidates = candidates.filter(allow_recruiter_contact=True)
+    return candidates
+
+
+class CandidateSearch:
+    """A normalized candidate query and the filter/ranking built from it."""
+
+    def __init__(self, raw):
+        self.raw = raw or ''
+        self.text = normalize_query(self.raw)
+
+    def __bool__(self):
+        return bool(self.text)
+
+    def _query(self):
+        return SearchQuery(self.text, search_type='websearch', config=SEARCH_CONFIG)
+
+    @staticmethod
+    def _uses_tsvector(queryset):
+        return connections[queryset.db].vendor == 'postgresql'
+
+    def filter(self, queryset):
+        """Restrict a UserProfile queryset to profiles matching the query."""
+        if not self:
+            return queryset
+        if self._uses_tsvector(queryset):
+            return queryset.filter(search_vector=self._query())
+        return queryset.filter(
+            Q(user__first_name__icontains=self.text) |
+            Q(user__last_name__icontains=self.text) |
+            Q(skills__icontains=self.text) |
+            Q(desired_title__icontains=self.text) |
+            Q(bio__icontains=self.text)
+        )
+
+    def rank(self, queryset):
+        """ts_rank expression for ordering matches, or None off Postgres."""
+        if not self or not self._uses_tsvector(queryset):
+            return None
+        return SearchRank(F('search_vector'), self._query())
@@ -0,0 +1,161 @@
+"""
+Company name resolution for scraped listings.
+
+Company.find_or_create used to fall back, on every exact-match miss, to
+loading every Company and running difflib.SequenceMatcher against each one —
+a full-table read plus O(N) comparisons per new company name, which made the
+first sync of a new source crawl. CompanyResolver does the same matching
+from an in-memory index built once per run:
+
+1. exact match on normalized_name, or on a CompanyAlias recorded by an
+   earlier fuzzy match;
+2. otherwise trigram blocking: the companies sharing the most character
+   trigrams with the name are the only candidates, and of those only the
+   MAX_CANDIDATES best whose lengths still allow a ratio at the threshold
+   reach SequenceMatcher; the best ratio >= threshold wins;
+3. otherwise a new company. Creates are queued and written together by
+   flush() (resolve_many() flushes), and a queued name is indexed
+   immediately, so "Acme Inc" and "Acme Inc." in one batch make one company.
+
+Every fuzzy hit is stored as a CompanyAlias, so the next run resolves that
+name by exact lookup.
+
+Usage:
+    resolver = CompanyResolver()                     # once per sync run
+    ids = resolver.resolve_many(['Acme Inc', ...])   # {name: company_id}
+"""
+
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+
+DEFAULT_THRESHOLD = 0.85
+
+# SequenceMatcher comparisons per unmatched name, at most.
+MAX_CANDIDATES = 10
+
+
+def normalize_company_name(name):
+    return name.lower().strip()
+
+
+def _trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CompanyResolver:
+    """Maps company names to Company ids; see the module docstring."""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        from jobs.models import Company, CompanyAlias
+
+        self.threshold = threshold
+        self.last_created = set()  # company ids created by the last flush()
+        self._exact = {}           # normalized name or alias -> company id
+        self._names = []           # indexed normalized names, by position
+        self._name_ids = []        # company id per position (None until flushed)
+        self._grams = defaultdict(list)
+        self._pending = {}         # normalized -> display name, to create
+        self._new_aliases = {}     # normalized alias -> normalized target name
+
+        rows = Company.objects.order_by('name').values_list('pk', 'normalized_name')
+        for pk, normalized in rows.iterator(chunk_size=5000):
+            if normalized not in self._exact:
+                self._exact[normalized] = pk
+                self._index(normalized, pk)
+        for alias, company_id in CompanyAlias.objects.values_list('alias', 'company_id'):
+            self._exact.setdefault(alias, company_id)
+
+    def _index(self, normalized, company_id):
+        position = len(self._names)
+        self._names.append(normalized)
+        self._name_ids.append(company_id)
+        for gram in _trigrams(normalized):
+            self._grams[gram].append(position)
+
+    def _fuzzy(self, normalized):
+        """Position of the best indexed name with ratio >= threshold, or None."""
+        shared = Counter()
+        for gram in _trigrams(normalized):
+            shared.update(self._grams.get(gram, ()))
+        length = len(normalized)
+        best, best_ratio = None, self.threshold
+        compared = 0
+        for position, _count in shared.most_common():
+            candidate = self._names[position]
+            # ratio = 2 * matches / total length <= 2 * min length / total
+            if 2 * min(length, len(candidate)) < self.threshold * (length + len(candidate)):
+                continue
+            ratio = SequenceMatcher(None, normalized, candidate).ratio()
+            if ratio > best_ratio or (ratio == best_ratio and best is None):
+                best, best_ratio = position, ratio
+            compared += 1
+            if compared >= MAX_CANDIDATES:
+                break
+        return best
+
+    def _resolve(self, name):
+        """Company id, or the normalized key of a queued create."""
+        normalized = normalize_company_name(name)
+        if normalized in self._exact:
+            return self._exact[normalized]
+        if normalized in self._pending:
+            return normalized
+
+        position = self._fuzzy(normalized)
+        if position is None:
+            self._pending[normalized] = name
+            self._index(normalized, None)
+            return normalized
+
+        company_id = self._name_ids[position]
+        if company_id is None:
+            self._new_aliases[normalized] = self._names[position]
+            return self._names[position]
+        self._new_aliases[normalized] = company_id
+        self._exact[normalized] = company_id
+        return company_id
+
+    def flush(self):
+        """Create the queued companies and store new aliases (bulk inserts)."""
+        from jobs.models import Company, CompanyAlias
+
+        self.last_created = set()
+        if self._pending:
+            Company.objects.bulk_create(
+                [
+                    Company(name=name, normalized_name=normalized)
+                    for normalized, name in self._pending.items()
+                ],
+                ignore_conflicts=True,
+            )
+            created = dict(
+                Company.objects.filter(name__in=list(self._pending.values()))
+                .values_list('name', 'pk')
+            )
+            for normalized, name in self._pending.items():
+                self._exact[normalized] = created[name]
+                self.last_created.add(created[name])
+            for position, company_id in enumerate(self._name_ids):
+                if company_id is None:
+                    self._name_ids[position] = self._exact[self._names[position]]
+            self._pending = {}
+
+        if self._new_aliases:
+            aliases = []
+            for alias, target in self._new_aliases.items():
+                company_id = self._exact[target] if isinstance(target, str) else target
+                self._exact[alias] = company_id
+                aliases.append(CompanyAlias(alias=alias, company_id=company_id))
+            CompanyAlias.objects.bulk_create(aliases, ignore_conflicts=True)
+            self._new_aliases = {}
+
+    def resolve_many(self, company_names):
+        """{company_name: company_id} for `company_names`, creating as needed."""
+        keys = {name: self._resolve(name) for name in company_names}
+        self.flush()
+        return {
+            name: self._exact[key] if isinstance(key, str) else key
+            for name, key in keys.items()
+        }
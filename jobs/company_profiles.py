@@ -0,0 +1,214 @@
+"""
+Set-based rebuild of CompanyHiringProfile.
+
+update_company_profiles used to walk every Company and fire ~15 COUNT /
+aggregate queries for each, pull every closed listing into Python for
+lifespans and read LENGTH(description) row by row — tens of thousands of
+queries a night. profile_metrics() computes the same metrics for all the
+companies at once:
+
+- one grouped aggregate over ScrapedJobListing (GROUP BY company_id) with
+  filtered COUNTs for the activity, movement, salary and evergreen figures,
+  AVG(repost_count), SUM(LENGTH(description)) and COUNT(DISTINCT
+  description_hash) — the boilerplate ratio is (total - distinct) / total,
+  the duplicate count the old per-hash loop added up;
+- one grouped query for lifespans: AVG and percentile_cont(0.5) of the whole
+  days between date_first_seen and date_removed of closed listings on
+  Postgres; other backends (SQLite in dev/test) read the closed listings'
+  dates in one query and take the mean and median in Python.
+
+Companies without listings get the empty-profile values. rebuild_profiles()
+writes every profile with one upsert on company, touching only the computed
+columns (has_recent_layoffs, glassdoor_rating, ... are left alone).
+
+Usage:
+    metrics = profile_metrics(company_ids)            # {company_id: {...}}
+    created, updated = rebuild_profiles(metrics)
+"""
+
+import statistics
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Avg, Count, Q, Sum
+from django.db.models.functions import Length
+from django.utils import timezone
+
+
+# CompanyHiringProfile columns written by rebuild_profiles()
+PROFILE_FIELDS = (
+    'total_active_listings', 'total_historical_listings', 'total_distinct_departments',
+    'avg_listing_lifespan_days', 'median_listing_lifespan_days', 'listing_close_rate_30d',
+    'net_job_movement_30d', 'net_job_movement_90d', 'repost_frequency',
+    'boilerplate_ratio', 'avg_description_length', 'has_salary_info_ratio',
+    'evergreen_listing_count', 'reputation_score',
+)
+
+_CHUNK = 500
+
+
+def reputation_score(metrics):
+    """Composite 0-100 score from a profile_metrics() entry (simplified algorithm)."""
+    reputation = 50.0  # Base
+
+    # Positive factors
+    if metrics['avg_listing_lifespan_days'] and metrics['avg_listing_lifespan_days'] < 45:
+        reputation += 10  # Fast hiring cycle
+    if metrics['listing_close_rate_30d'] and metrics['listing_close_rate_30d'] > 20:
+        reputation += 10  # Actively filling roles
+    if metrics['net_job_movement_30d'] > 0:
+        reputation += min(metrics['net_job_movement_30d'] * 2, 10)  # Growing
+    if metrics['has_salary_info_ratio'] > 0.5:
+        reputation += 5  # Transparent about salary
+
+    # Negative factors
+    if metrics['evergreen_listing_count'] > 3:
+        reputation -= min(metrics['evergreen_listing_count'] * 2, 15)  # Too many stale listings
+    if metrics['boilerplate_ratio'] > 0.5:
+        reputation -= 10  # Copy-paste job postings
+
+    return max(0, min(100, reputation))
+
+
+def _listing_aggregates(listings, now):
+    thirty_days_ago = now - timedelta(days=30)
+    ninety_days_ago = now - timedelta(days=90)
+    has_description = ~Q(description='')
+    return listings.values('company_id').annotate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status='active')),
+        departments=Count('department', distinct=True),
+        closed_30d=Count('id', filter=Q(date_removed__gte=thirty_days_ago)),
+        seen_before_30d=Count('id', filter=Q(date_first_seen__lt=thirty_days_ago)),
+        new_30d=Count('id', filter=Q(date_first_seen__gte=thirty_days_ago)),
+        new_90d=Count('id', filter=Q(date_first_seen__gte=ninety_days_ago)),
+        closed_90d=Count('id', filter=Q(date_removed__gte=ninety_days_ago)),
+        reposts=Avg('repost_count'),
+        distinct_hashes=Count('description_hash', distinct=True),
+        description_chars=Sum(Length('description'), filter=has_description),
+        with_description=Count('id', filter=has_description),
+        with_salary=Count('id', filter=Q(salary_min__isnull=False) | Q(salary_max__isnull=False)),
+        evergreen=Count('id', filter=Q(
+            status='active', date_first_seen__lt=ninety_days_ago, repost_count=0,
+        )),
+    ).order_by()
+
+
+def _lifespans(company_ids):
+    """{company_id: (avg days, median days)} over closed listings with a date_removed."""
+    from jobs.models import ScrapedJobListing
+
+    if connection.vendor == 'postgresql':
+        company_filter = '' if company_ids is None else 'AND company_id = ANY(%s)'
+        sql = f'''
+            SELECT company_id, AVG(days), percentile_cont(0.5) WITHIN GROUP (ORDER BY days)
+            FROM (
+                SELECT company_id,
+                       FLOOR(EXTRACT(EPOCH FROM date_removed - date_first_seen) / 86400) AS days
+                FROM {ScrapedJobListing._meta.db_table}
+                WHERE status = 'closed' AND date_removed IS NOT NULL
+                  AND company_id IS NOT NULL {company_filter}
+            ) AS lifespans
+            WHERE days >= 0
+            GROUP BY company_id
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [] if company_ids is None else [list(company_ids)])
+            return {
+                company_id: (float(avg), float(median))
+                for company_id, avg, median in cursor.fetchall()
+            }
+
+    closed = ScrapedJobListing.objects.filter(
+        status='closed', date_removed__isnull=False, company__isnull=False,
+    ).order_by()
+    if company_ids is not None:
+        closed = closed.filter(company_id__in=company_ids)
+    days_by_company = defaultdict(list)
+    for company_id, first_seen, removed in closed.values_list(
+        'company_id', 'date_first_seen', 'date_removed',
+    ).iterator(chunk_size=5000):
+        days = (removed - first_seen).days
+        if days >= 0:
+            days_by_company[company_id].append(days)
+    return {
+        company_id: (statistics.mean(days), float(statistics.median(days)))
+        for company_id, days in days_by_company.items()
+    }
+
+
+def profile_metrics(company_ids=None, now=None):
+    """
+    {company_id: {PROFILE_FIELDS column: value}} for `company_ids` (every
+    company when None; ids are taken as given, not re-checked).
+    """
+    from jobs.models import Company, ScrapedJobListing
+
+    now = now or timezone.now()
+    listings = ScrapedJobListing.objects.filter(company__isnull=False)
+    if company_ids is None:
+        wanted = Company.objects.values_list('pk', flat=True)
+    else:
+        wanted = company_ids = list(company_ids)
+        listings = listings.filter(company_id__in=company_ids)
+
+    aggregates = {row['company_id']: row for row in _listing_aggregates(listings, now)}
+    lifespans = _lifespans(company_ids)
+
+    metrics = {}
+    for company_id in wanted:
+        row = aggregates.get(company_id)
+        total = row['total'] if row else 0
+        avg_lifespan, median_lifespan = lifespans.get(company_id, (None, None))
+        entry = {
+            'total_active_listings': row['active'] if row else 0,
+            'total_historical_listings': total,
+            'total_distinct_departments': row['departments'] if row else 0,
+            'avg_listing_lifespan_days': avg_lifespan,
+            'median_listing_lifespan_days': median_lifespan,
+            'listing_close_rate_30d': (
+                row['closed_30d'] / row['seen_before_30d'] * 100
+                if row and row['seen_before_30d'] else None
+            ),
+            'net_job_movement_30d': row['new_30d'] - row['closed_30d'] if row else 0,
+            'net_job_movement_90d': row['new_90d'] - row['closed_90d'] if row else 0,
+            'repost_frequency': (row['reposts'] or 0) if row else 0,
+            'boilerplate_ratio': (total - row['distinct_hashes']) / total if total > 1 else 0.0,
+            'avg_description_length': (
+                row['description_chars'] // row['with_description']
+                if row and row['with_description'] else 0
+            ),
+            'has_salary_info_ratio': row['with_salary'] / total if total else 0,
+            'evergreen_listing_count': row['evergreen'] if row else 0,
+        }
+        entry['reputation_score'] = reputation_score(entry)
+        metrics[company_id] = entry
+    return metrics
+
+
+def rebuild_profiles(metrics):
+    """
+    Write profile_metrics() output with one upsert per chunk of companies.
+    Returns (created, updated) counts.
+    """
+    from jobs.models import CompanyHiringProfile
+
+    company_ids = list(metrics)
+    existing = set()
+    for i in range(0, len(company_ids), _CHUNK):
+        existing.update(
+            CompanyHiringProfile.objects.filter(company_id__in=company_ids[i:i + _CHUNK])
+            .values_list('company_id', flat=True)
+        )
+    CompanyHiringProfile.objects.bulk_create(
+        [
+            CompanyHiringProfile(company_id=company_id, **entry)
+            for company_id, entry in metrics.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['company'],
+        update_fields=PROFILE_FIELDS + ('last_calculated',),
+        batch_size=_CHUNK,
+    )
+    return len(company_ids) - len(existing), len(existing)
@@ -0,0 +1,376 @@
+"""
+Keyset-paginated merged feed for the unified /jobs/ page.
+
+Each source (verified Job postings, observed ScrapedJobListings) is ordered in
+the database by its own sort key and read with LIMIT page_size + 1 from a
+keyset position; the sources are then merged lazily with heapq.merge into one
+page. A request touches about page_size rows per source whatever the page
+depth — the old path pulled up to CAP=500 rows from EACH source, wrapped every
+row in UnifiedListing and sorted ~1000 objects in Python just to render 25,
+and pages past the cap were unreachable.
+
+The position travels in an opaque ?cursor= token: the merged-order key of the
+last row on the page (or the first row, when paging backwards). Observed rows
+are ranked by persisted columns (see "Persisted rank columns" below), so the
+keys don't depend on the time of the request.
+
+Usage:
+    feed = Feed([
+        FeedSource(verified_qs, verified_sort_keys('relevant'), group=0),
+        FeedSource(observed_qs, observed_sort_keys('relevant'), group=1),
+    ])
+    page = feed.page(cursor, page_size=25)
+"""
+
+import base64
+import binascii
+import datetime
+import heapq
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.utils import timezone
+
+
+PAGE_SIZE = 25
+
+# "Most relevant" blend for observed listings: half the HAS score plus up to
+# 30 freshness points that decay linearly over the first 30 days.
+RELEVANCE_HAS_WEIGHT = 0.5
+RELEVANCE_FRESHNESS_DAYS = 30
+
+SORT_MODES = ('relevant', 'newest', 'activity')
+
+
+class EpochSeconds(Func):
+    """Seconds since the Unix epoch for a datetime expression, as a float."""
+    output_field = FloatField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return self.as_sqlite(compiler, connection, **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template='EXTRACT(EPOCH FROM %(expressions)s)::double precision',
+            **extra_context,
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template="((julianday(%(expressions)s) - 2440587.5) * 86400.0)",
+            **extra_context,
+        )
+
+
+def observed_posted_expression():
+    """The date an observed listing is shown as posted (see UnifiedListing.posted_date)."""
+    return Coalesce('date_posted_external', 'date_first_seen')
+
+
+# --- Persisted rank columns ---------------------------------------------------
+#
+# The observed sort keys live on ScrapedJobListing as indexed columns
+# (feed_posted_at / feed_activity / feed_relevance, see migrations 0028/0029) so
+# ORDER BY ... LIMIT walks an index instead of computing a blended score for
+# every matching row. They're written by ScrapedJobListing.save(), by
+# HiringActivityScore.save() (i.e. the daily rescore), and the time-decaying
+# part of feed_relevance is re-aged by `manage.py refresh_feed_ranks`.
+
+def relevance_score(activity, posted_at, now=None):
+    """Python form of relevance_expression(), for single-row writes."""
+    now = now or timezone.now()
+    age_days = (now - posted_at).total_seconds() / 86400.0 if posted_at else RELEVANCE_FRESHNESS_DAYS
+    freshness = max(0.0, RELEVANCE_FRESHNESS_DAYS - age_days)
+    return RELEVANCE_HAS_WEIGHT * (activity or 0) + freshness
+
+
+def relevance_expression(now=None, activity='feed_activity'):
+    """
+    Set-based form of relevance_score() over feed_activity/feed_posted_at.
+
+    `activity` may be another expression for the HAS score, for UPDATEs that
+    write feed_activity in the same statement (SET sees the old column values).
+    """
+    now = now or timezone.now()
+    age_days = (Value(now.timestamp()) - EpochSeconds('feed_posted_at')) / Value(86400.0)
+    return (
+        Value(RELEVANCE_HAS_WEIGHT) * Cast(activity, FloatField())
+        + Greatest(Value(0.0), Value(float(RELEVANCE_FRESHNESS_DAYS)) - age_days, output_field=FloatField())
+    )
+
+
+def refresh_feed_ranks(queryset, now=None):
+    """
+    Re-age feed_relevance for `queryset` in one UPDATE; returns rows written.
+
+    Only rows whose freshness bonus can still change are touched: those posted
+    within the freshness window, plus any that aged out since the last run and
+    still carry a bonus (feed_relevance != 0.5 * feed_activity).
+    """
+    now = now or timezone.now()
+    window_start = now - datetime.timedelta(days=RELEVANCE_FRESHNESS_DAYS)
+    aged_out = ~Q(feed_relevance=Value(RELEVANCE_HAS_WEIGHT) * Cast('feed_activity', FloatField()))
+    return queryset.filter(Q(feed_posted_at__gte=window_start) | aged_out).update(
+        feed_relevance=relevance_expression(now),
+    )
+
+
+def observed_sort_keys(sort_mode):
+    """ORDER BY keys for observed listings: the persisted rank columns."""
+    if sort_mode == 'newest':
+        return [('_fk_posted', F('feed_posted_at'))]
+    if sort_mode == 'activity':
+        return [('_fk_has', F('feed_activity'))]
+    return [('_fk_rel', F('feed_relevance'))]
+
+
+def verified_sort_keys(sort_mode):
+    """
+    ORDER BY keys for verified postings.
+
+    Every legacy mode reduced to "newest first" inside the verified tier
+    (freshness for relevant, 100 - age for activity), so one key serves all.
+    """
+    return [('_fk_posted', F('posted_date'))]
+
+
+class FeedSource:
+    """
+    One database-ordered stream in the merged feed.
+
+    Args:
+        queryset: fully filtered queryset for this source.
+        keys: list of (alias, expression) ORDER BY terms, all descending. The
+            primary key is always appended as the final tiebreak.
+        group: tier rank; every row of a lower group sorts before any row of a
+            higher group (verified postings are group 0, observed group 1).
+        wrap: optional callable applied to each row before it's returned.
+    """
+
+    def __init__(self, queryset, keys, group=0, wrap=None):
+        self.queryset = queryset
+        self.keys = keys
+        self.group = group
+        self.wrap = wrap
+        self.index = 0  # assigned by Feed
+
+    def _annotated(self):
+        return self.queryset.annotate(**{alias: expr for alias, expr in self.keys})
+
+    def key_values(self, obj):
+        return [getattr(obj, alias) for alias, _expr in self.keys]
+
+    def _position_q(self, cursor, forward):
+        """
+        Q selecting rows strictly after (forward) or before the cursor in
+        merged order, or None for "no rows" / an empty Q for "every row".
+        """
+        if self.group != cursor.group:
+            if (self.group > cursor.group) == forward:
+                return Q()
+            return None
+
+        if self.index == cursor.source:
+            tie = Q(pk__lt=cursor.pk) if forward else Q(pk__gt=cursor.pk)
+        elif (self.index > cursor.source) == forward:
+            tie = Q()
+        else:
+            tie = None
+
+        # Lexicographic comparison over descending keys:
+        # k0 past v0 | (k0 == v0 & k1 past v1) | ... | (all equal & tie)
+        lookup = 'lt' if forward else 'gt'
+        aliases = [alias for alias, _expr in self.keys]
+        terms = []
+        for i, alias in enumerate(aliases):
+            equal_prefix = [Q(**{aliases[j]: cursor.keys[j]}) for j in range(i)]
+            terms.append(reduce(and_, equal_prefix + [Q(**{f'{alias}__{lookup}': cursor.keys[i]})]))
+        if tie is not None:
+            equal_all = [Q(**{aliases[j]: cursor.keys[j]}) for j in range(len(aliases))]
+            terms.append(reduce(and_, equal_all + [tie]))
+        if not terms:
+            return None
+        return reduce(or_, terms)
+
+    def fetch(self, cursor, limit, forward=True):
+        """Rows in merged order (forward) or reverse merged order, at most `limit`."""
+        qs = self._annotated()
+        if cursor is not None:
+            position = self._position_q(cursor, forward)
+            if position is None:
+                return []
+            qs = qs.filter(position)
+        aliases = [alias for alias, _expr in self.keys]
+        if forward:
+            ordering = [F(alias).desc() for alias in aliases] + ['-pk']
+        else:
+            ordering = [F(alias).asc() for alias in aliases] + ['pk']
+        return list(qs.order_by(*ordering)[:limit])
+
+    def merge_key(self, obj):
+        """Ascending sort tuple for heapq.merge (keys are stored descending)."""
+        return (
+            self.group,
+            *[-_sortable(value) for value in self.key_values(obj)],
+            self.index,
+            -obj.pk,
+        )
+
+
+def _sortable(value):
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if value is None:
+        return float('-inf')
+    return float(value)
+
+
+class FeedCursor:
+    """Opaque keyset position: the merged-order key of one row."""
+
+    def __init__(self, group, source, keys, pk, page=1, forward=True):
+        self.group = group
+        self.source = source
+        self.keys = keys
+        self.pk = pk
+        self.page = page
+        self.forward = forward
+
+    def encode(self):
+        payload = {
+            'g': self.group,
+            's': self.source,
+            'k': [_encode_value(v) for v in self.keys],
+            'pk': self.pk,
+            'p': self.page,
+            'd': 'n' if self.forward else 'p',
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, token):
+        """Parse a cursor token; returns None for anything malformed."""
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            payload = json.loads(raw)
+            return cls(
+                group=int(payload['g']),
+                source=int(payload['s']),
+                keys=[_decode_value(v) for v in payload['k']],
+                pk=int(payload['pk']),
+                page=max(1, int(payload.get('p', 1))),
+                forward=payload.get('d', 'n') != 'p',
+            )
+        except (ValueError, TypeError, KeyError, binascii.Error, json.JSONDecodeError):
+            return None
+
+
+def _encode_value(value):
+    if isinstance(value, datetime.datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        return datetime.datetime.fromisoformat(value['dt'])
+    if isinstance(value, (int, float)):
+        return value
+    raise ValueError(f'Unsupported cursor key value: {value!r}')
+
+
+class FeedPage:
+    """One rendered page of the merged feed. Iterable like a Paginator page."""
+
+    def __init__(self, items, number, has_next, has_previous, next_cursor, previous_cursor):
+        self.items = items
+        self.number = number
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class Feed:
+    """k-way merge of FeedSources with keyset pagination."""
+
+    def __init__(self, sources):
+        self.sources = sources
+        for index, source in enumerate(sources):
+            source.index = index
+
+    def page(self, cursor=None, page_size=PAGE_SIZE):
+        forward = cursor.forward if cursor else True
+        limit = page_size + 1
+
+        streams = []
+        for source in self.sources:
+            rows = source.fetch(cursor, limit, forward=forward)
+            streams.append([(source.merge_key(row), source, row) for row in rows])
+
+        merged = heapq.merge(*streams, key=lambda entry: entry[0], reverse=not forward)
+        entries = []
+        fetched_more = False
+        for entry in merged:
+            if len(entries) == page_size:
+                fetched_more = True
+                break
+            entries.append(entry)
+        if not forward:
+            entries.reverse()
+
+        number = 1
+        if cursor is not None:
+            number = cursor.page + 1 if forward else max(1, cursor.page - 1)
+
+        if forward:
+            has_next = fetched_more
+            has_previous = cursor is not None
+        else:
+            has_next = True
+            has_previous = fetched_more and number > 1
+
+        next_cursor = previous_cursor = None
+        if entries and has_next:
+            next_cursor = self._cursor_for(entries[-1], number, forward=True)
+        # Page 2's "previous" is simply the un-cursored first page.
+        if entries and has_previous and number > 2:
+            previous_cursor = self._cursor_for(entries[0], number, forward=False)
+
+        items = [
+            source.wrap(row) if source.wrap else row
+            for _key, source, row in entries
+        ]
+        return FeedPage(
+            items, number, has_next, has_previous,
+            next_cursor.encode() if next_cursor else None,
+            previous_cursor.encode() if previous_cursor else None,
+        )
+
+    def _cursor_for(self, entry, number, forward):
+        _key, source, row = entry
+        return FeedCursor(
+            group=source.group,
+            source=source.index,
+            keys=source.key_values(row),
+            pk=row.pk,
+            page=number,
+            forward=forward,
+        )
@@ -0,0 +1,79 @@
+"""
+Content fingerprints of scraped listings: description_hash and title_hash.
+
+ScrapedJobListing.save() used to strip HTML, normalize and SHA-256 the
+description and title on every save — including the update_fields saves of
+check_listing_links, expire_stale_listings and the HAS publish sync, which
+never touch either. Fingerprinting is now lazy:
+
+- the model remembers title/company_name/description as loaded (from_db)
+  or as last hashed, and needs_fingerprint() is true only when one of them
+  has changed since, or the hashes are empty;
+- a deferred input counts as unchanged: it can't have been assigned without
+  being loaded, so a save() on an only() queryset never fetches it;
+- fingerprint_listings() hashes a batch of listings in one pass, each
+  distinct description once (multi-location copies share one). sync_genzjobs
+  calls it per batch before the upsert; save() goes through it for one.
+"""
+
+import hashlib
+import re
+
+
+FINGERPRINT_INPUTS = ('title', 'company_name', 'description')
+
+_TAGS = re.compile(r'<[^>]+>')
+
+
+def description_hash(description):
+    """SHA-256 of the description, HTML stripped and whitespace/case normalized."""
+    plain = _TAGS.sub('', description) if description else ''
+    normalized = ' '.join(plain.lower().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def title_hash(title, company_name):
+    """SHA-256 of the normalized title and company name."""
+    normalized = ' '.join(title.lower().split())
+    return hashlib.sha256(f'{normalized}|{company_name.lower()}'.encode()).hexdigest()
+
+
+def current_inputs(listing):
+    """The listing's fingerprint inputs, or None if any of them is deferred."""
+    values = listing.__dict__
+    if any(field not in values for field in FINGERPRINT_INPUTS):
+        return None
+    return tuple(values[field] for field in FINGERPRINT_INPUTS)
+
+
+def remember_inputs(listing):
+    """Record the current inputs as the ones the stored hashes were built from."""
+    listing._fingerprinted_inputs = current_inputs(listing)
+
+
+def needs_fingerprint(listing):
+    inputs = current_inputs(listing)
+    if inputs is None:
+        return False
+    return (
+        not listing.description_hash
+        or not listing.title_hash
+        or inputs != listing._fingerprinted_inputs
+    )
+
+
+def fingerprint_listings(listings):
+    """Rehash the listings whose inputs changed. Returns how many were hashed."""
+    by_description = {}
+    hashed = 0
+    for listing in listings:
+        if not needs_fingerprint(listing):
+            continue
+        description = listing.description
+        if description not in by_description:
+            by_description[description] = description_hash(description)
+        listing.description_hash = by_description[description]
+        listing.title_hash = title_hash(listing.title, listing.company_name)
+        remember_inputs(listing)
+        hashed += 1
+    return hashed
@@ -0,0 +1,229 @@
+"""
+Keyset streaming from the genzjobs database, and the sync high-water marks.
+
+sync_genzjobs used to pull every active id into a list, fetch rows by
+`id IN (...)` and hand the same list to closure detection. Both now read the
+remote table in short keyset-paged queries — `WHERE (updatedAt, id) > mark
+ORDER BY updatedAt, id LIMIT n` — so neither holds the full id set in memory
+nor keeps a long-lived server-side cursor open on the Neon connection.
+
+- changed_batches(): rows updated after an (updated_at, id) mark, in order;
+  the last row of each batch is the next mark.
+- active_ids(): every active genzjobs id, paged by id, for the set
+  difference in detect_closed_genzjobs.
+- load_watermark() / save_watermark(): the SyncWatermark row of a source
+  scope, so each run picks up where the previous one stopped.
+- Prefetcher: runs a batch iterator (the remote reads) in a background
+  thread, a bounded number of batches ahead of the local writes, so Neon
+  latency and local write time overlap (sync_genzjobs --prefetch).
+- still_active() / verification_updates() / push_verification(): the
+  chunked set operations behind closure detection and --write-back — one
+  remote read and at most one remote UPDATE per chunk, sending only the rows
+  whose flags differ, instead of a get() and save() per listing.
+
+A stored mark is read back WATERMARK_OVERLAP early: a row committed late
+with an older updatedAt (a long genzjobs transaction) is still seen. Rows in
+the overlap are re-read but skipped by the sync's fingerprint check.
+Rows without an updatedAt are never streamed (Prisma's @updatedAt always
+sets it).
+"""
+
+import datetime
+import queue
+import threading
+import time
+from datetime import timedelta
+
+from django.db import connections, router
+from django.db.models import Q
+from django.utils import timezone
+
+
+ALL_SOURCES = '*'
+
+# Listings per remote read/write in closure detection and write-back.
+CHUNK_SIZE = 500
+
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+def _aware(value):
+    # genzjobs timestamps are `timestamp without time zone` (UTC).
+    if value is not None and timezone.is_naive(value):
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def watermark_scope(source=None):
+    """SyncWatermark.scope for a --source filter (ALL_SOURCES when unset)."""
+    return f'source:{source.lower()}' if source else ALL_SOURCES
+
+
+def load_watermark(scope):
+    """Start mark (updated_at, id) for `scope`, WATERMARK_OVERLAP early; None if unset."""
+    from jobs.models import SyncWatermark
+
+    mark = SyncWatermark.objects.filter(scope=scope).first()
+    if mark is None or mark.high_water_at is None:
+        return None
+    return mark.high_water_at - WATERMARK_OVERLAP, ''
+
+
+def save_watermark(scope, updated_at, last_id):
+    from jobs.models import SyncWatermark
+
+    SyncWatermark.objects.update_or_create(
+        scope=scope,
+        defaults={'high_water_at': _aware(updated_at), 'high_water_id': last_id},
+    )
+
+
+def changed_batches(queryset, after=None, batch_size=500):
+    """
+    Yield lists of up to `batch_size` GenzjobsListing rows from `queryset`
+    past the `after` (updated_at, id) mark, ordered by (updated_at, id). One
+    query per batch.
+    """
+    queryset = queryset.filter(updated_at__isnull=False).order_by('updated_at', 'id')
+    while True:
+        page = queryset
+        if after is not None:
+            at, last_id = after
+            page = page.filter(Q(updated_at__gt=at) | Q(updated_at=at, id__gt=last_id))
+        batch = list(page[:batch_size])
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+        after = _aware(batch[-1].updated_at), batch[-1].id
+
+
+def active_ids(queryset, chunk_size=5000):
+    """Yield the ids of `queryset` (GenzjobsListing) in id order, keyset-paged."""
+    queryset = queryset.order_by('id').values_list('id', flat=True)
+    last_id = None
+    while True:
+        page = queryset if last_id is None else queryset.filter(id__gt=last_id)
+        ids = list(page[:chunk_size])
+        yield from ids
+        if len(ids) < chunk_size:
+            return
+        last_id = ids[-1]
+
+
+class Prefetcher:
+    """
+    Iterate `items` in a background thread, at most `depth` items ahead.
+
+    The bounded queue is the backpressure: when the consumer falls behind the
+    producer blocks. `waited` (consumer blocked on an empty queue) and
+    `stalled` (producer blocked on a full one) show which side is the
+    bottleneck. An exception in the producer is re-raised in the consumer;
+    leaving the loop early stops the producer. The producer thread closes
+    its own database connections when it finishes.
+    """
+
+    _ITEM, _DONE, _ERROR = range(3)
+
+    def __init__(self, items, depth):
+        self._items = items
+        self._queue = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='genzjobs-prefetch', daemon=True)
+        self.waited = 0.0
+        self.stalled = 0.0
+
+    def _put(self, entry):
+        started = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self._queue.put(entry, timeout=0.1)
+            except queue.Full:
+                continue
+            self.stalled += time.monotonic() - started
+            return True
+        return False
+
+    def _run(self):
+        try:
+            for item in self._items:
+                if not self._put((self._ITEM, item)):
+                    return
+            self._put((self._DONE, None))
+        except BaseException as exc:
+            self._put((self._ERROR, exc))
+        finally:
+            connections.close_all()
+
+    def __iter__(self):
+        self._thread.start()
+        try:
+            while True:
+                started = time.monotonic()
+                kind, value = self._queue.get()
+                self.waited += time.monotonic() - started
+                if kind == self._DONE:
+                    return
+                if kind == self._ERROR:
+                    raise value
+                yield value
+        finally:
+            self._stop.set()
+            self._thread.join()
+
+
+def still_active(genzjobs_ids):
+    """The subset of `genzjobs_ids` that exists and is active in genzjobs (one query)."""
+    from jobs.models import GenzjobsListing
+
+    return set(
+        GenzjobsListing.objects.filter(id__in=list(genzjobs_ids), is_active=True)
+        .values_list('id', flat=True)
+    )
+
+
+def verification_updates(local_rows, remote):
+    """
+    Diff local publish state against genzjobs.
+
+    `local_rows`: (genzjobs_id, published, employer_id or None) tuples;
+    `remote`: {genzjobs_id: (is_rjrp_verified, rjrp_employer_id)}. Returns
+    (updates, missing): `updates` are (id, verified, employer_id or None)
+    rows whose flags differ — a None employer id leaves the remote column
+    alone, as does an unpublished row's — and `missing` the ids genzjobs no
+    longer has.
+    """
+    updates, missing = [], []
+    for genzjobs_id, published, employer_id in local_rows:
+        if genzjobs_id not in remote:
+            missing.append(genzjobs_id)
+            continue
+        verified, remote_employer_id = remote[genzjobs_id]
+        employer_id = str(employer_id) if published and employer_id is not None else None
+        if verified != published or (employer_id is not None and employer_id != remote_employer_id):
+            updates.append((genzjobs_id, published, employer_id))
+    return updates, missing
+
+
+def push_verification(updates):
+    """
+    Write verification_updates() rows to genzjobs in one
+    UPDATE ... FROM (VALUES ...). Returns rows updated. Postgres only, like
+    the genzjobs database.
+    """
+    from jobs.models import GenzjobsListing
+
+    if not updates:
+        return 0
+    values = ', '.join(['(%s, %s::boolean, %s::text)'] * len(updates))
+    sql = f'''
+        UPDATE job_listings AS jl
+        SET "isRjrpVerified" = v.verified,
+            "rjrpEmployerId" = COALESCE(v.employer_id, jl."rjrpEmployerId")
+        FROM (VALUES {values}) AS v(id, verified, employer_id)
+        WHERE jl.id = v.id
+    '''
+    params = [value for row in updates for value in row]
+    with connections[router.db_for_write(GenzjobsListing)].cursor() as cur:
+        cur.execute(sql, params)
+        return cur.rowcount
@@ -0,0 +1,303 @@
+"""
+Homepage payload: the expensive, user-independent data behind `home()`.
+
+Built by build_home_payload() and served through jobs/sharedcache.py — one
+copy in the shared cache for the whole deployment, rebuilt single-flight
+with stale-while-revalidate, and kept warm by `manage.py refresh_home_cache`
+so requests normally never pay for a rebuild at all. The template still
+renders per request so the (per-user) navbar auth state stays correct.
+
+The aggregates themselves — totals, freshness tiers, the 24h delta block,
+the employer ranking over the published set, the rejected ticker — are
+precomputed into HomeStat rows, one per block. The commands
+that change listing data rewrite the blocks they affect when they finish
+(refresh_home_stats(LISTING_STATS) in sync_genzjobs, score_listings,
+expire_stale_listings, detect_closed_genzjobs and check_listing_links;
+COMPANY_STATS in update_company_profiles), so a payload rebuild is one
+HomeStat read plus a few small lookups, and a cold cache during the 09:00
+rescore costs nothing. The 24h/48h/7d counts are as of the last of those
+runs (the sync runs every 15 minutes).
+
+NOTE: the payload holds RAW model instances (which pickle cleanly), not
+UnifiedListing wrappers — the wrapper's __getattr__ infinitely recurses
+under pickle. The wrapping is cheap; it's the DB queries we're caching.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from .models import CompanyHiringProfile, HiringActivityScore, HomeStat, Job, ScrapedJobListing
+from .sharedcache import get_or_refresh, refresh
+
+
+# 30-minute freshness keeps rebuilds rare; the extra stale window means an
+# expired payload is served while ONE process rebuilds it instead of every
+# request queuing behind the queries.
+HOME_CACHE_KEY = 'home_page_data_v5'  # v5: shared cache envelope
+HOME_CACHE_TTL = 1800
+HOME_STALE_TTL = 1800
+
+OBSERVED_LIVE = dict(published_to_board=True, status__in=['active', 'published'])
+
+# HomeStat blocks the listing pipeline moves (sync, rescore, expiry, closure)
+LISTING_STATS = ('listings', 'employers', 'ticker')
+# ... and the one update_company_profiles moves
+COMPANY_STATS = ('companies',)
+
+
+def _listing_stats(now):
+    # Every count is one pass over the table: the 24h/48h/7d windows move on
+    # their own as rows age, so they can't be kept as running deltas, but
+    # they can share a single scan with the totals.
+    day_ago = now - timedelta(hours=24)
+    live = Q(**OBSERVED_LIVE)
+    counts = ScrapedJobListing.objects.aggregate(
+        total=Count('id', filter=live),
+        h24=Count('id', filter=live & Q(date_first_seen__gte=day_ago)),
+        h48=Count('id', filter=live & Q(date_first_seen__gte=now - timedelta(hours=48))),
+        d7=Count('id', filter=live & Q(date_first_seen__gte=now - timedelta(days=7))),
+        # Everything currently tracked from employer hiring systems that hasn't
+        # been confirmed closed. tracked - published = listings that did NOT
+        # clear the 65-point publish bar (the number the hero leads with).
+        tracked=Count('id', filter=~Q(status='closed')),
+        closed_24h=Count('id', filter=Q(date_removed__gte=day_ago)),
+        reposts_24h=Count('id', filter=Q(date_first_seen__gte=day_ago, repost_count__gte=1)),
+    )
+    published = ScrapedJobListing.objects.filter(live)
+    return {
+        'total_observed': counts['total'],
+        'total_tracked': counts['tracked'],
+        'observed_companies': published.values('company_name').distinct().count(),
+        'fresh_counts': {key: counts[key] for key in ('h24', 'h48', 'd7')},
+        'closed_24h': counts['closed_24h'],
+        'reposts_24h': counts['reposts_24h'],
+        # Newest published listings for the card grid (score as tiebreaker)
+        'fresh_listing_ids': list(
+            published.order_by('-date_first_seen', '-activity_score__total_score')
+            .values_list('pk', flat=True)[:6]
+        ),
+    }
+
+
+def _company_stats(now):
+    return {
+        'ramping': CompanyHiringProfile.objects.filter(
+            net_job_movement_30d__gte=5
+        ).count(),
+        'quiet': CompanyHiringProfile.objects.filter(
+            total_active_listings__gte=10
+        ).filter(
+            Q(listing_close_rate_30d__isnull=True) | Q(listing_close_rate_30d__lte=0)
+        ).count(),
+    }
+
+
+def _employer_stats(now):
+    # One grouped aggregate over the published set (~22k rows), precomputed.
+    # Ranked by average HAS among companies with a meaningful live count —
+    # behavior, not logo size.
+    # NOTE: no salary column here (yet). Structured salary_min/max is only
+    # populated for some feed sources; direct-ATS listings carry salary in
+    # description text the sync doesn't parse, so a "% salary listed" column
+    # would falsely shame the most transparent employers. Reinstate once
+    # salary extraction backfills the structured fields.
+    employer_rows = list(
+        ScrapedJobListing.objects.filter(**OBSERVED_LIVE).values('company_name')
+        .annotate(
+            live=Count('id'),
+            avg_has=Avg('activity_score__total_score'),
+            new_week=Count('id', filter=Q(date_first_seen__gte=now - timedelta(days=7))),
+        )
+        .filter(live__gte=15, avg_has__isnull=False)
+        .order_by('-avg_has')[:6]
+    )
+    for row in employer_rows:
+        row['avg_has'] = round(row['avg_has'])
+    return {'rows': employer_rows}
+
+
+def _ticker_stats(now):
+    # "Rejected today" ticker (anonymized). Company names are deliberately
+    # withheld: a low score is a probability estimate of hiring activity,
+    # not an accusation of bad faith.
+    ticker_items = []
+    rejected_rows = (
+        ScrapedJobListing.objects.filter(
+            published_to_board=False, status__in=['active', 'stale']
+        )
+        .select_related('activity_score')
+        .defer('description', 'description_summary', 'raw_data', 'search_vector')
+        .order_by('-date_last_seen')[:40]
+    )
+    for listing in rejected_rows:
+        try:
+            score = listing.activity_score.total_score
+        except (HiringActivityScore.DoesNotExist, AttributeError):
+            continue
+        # Skip junk titles (spammy feeds shout in all caps) — the ticker is
+        # brand surface, so only show listings that read like real roles.
+        title = (listing.title or '').strip()
+        if len(title) < 8 or (len(title) > 20 and title == title.upper()):
+            continue
+        if listing.repost_count >= 3:
+            reason = 'reposted %d times with near-identical text' % listing.repost_count
+        elif listing.days_since_posted() >= 90:
+            reason = 'open %d days' % listing.days_since_posted()
+        elif not (listing.salary_min or listing.salary_max):
+            reason = 'no salary, weak activity signals'
+        else:
+            reason = 'weak hiring-activity signals'
+        label = listing.get_job_category_display() if listing.job_category else 'Listing'
+        ticker_items.append({
+            'label': label,
+            'title': listing.title[:80],
+            'reason': reason,
+            'score': score,
+        })
+        if len(ticker_items) >= 6:
+            break
+    return {'items': ticker_items}
+
+
+STAT_BUILDERS = {
+    'listings': _listing_stats,
+    'companies': _company_stats,
+    'employers': _employer_stats,
+    'ticker': _ticker_stats,
+}
+
+
+def refresh_home_stats(parts=None):
+    """Recompute and store the HomeStat blocks `parts` (all when None); returns {part: data}."""
+    now = timezone.now()
+    stats = {part: STAT_BUILDERS[part](now) for part in (parts or STAT_BUILDERS)}
+    HomeStat.objects.bulk_create(
+        [HomeStat(part=part, data=data) for part, data in stats.items()],
+        update_conflicts=True,
+        unique_fields=['part'],
+        update_fields=['data', 'computed_at'],
+    )
+    return stats
+
+
+def load_home_stats():
+    """{part: data} for every block, in one query; a missing block is built and stored."""
+    stats = dict(HomeStat.objects.values_list('part', 'data'))
+    missing = [part for part in STAT_BUILDERS if part not in stats]
+    if missing:
+        stats.update(refresh_home_stats(missing))
+    return stats
+
+
+def build_home_payload():
+    """
+    Assemble the dict the template context is built from: the HomeStat
+    blocks, the few verified Jobs (a small table, read live) and the six
+    fresh listing cards.
+    """
+    stats = load_home_stats()
+    listing_stats = stats['listings']
+
+    # ---- Hero: the filter numbers -----------------------------------
+    # Verified postings (employer-posted)
+    verified_jobs = list(Job.objects.filter(is_active=True).order_by('-posted_date')[:4])
+    total_verified = Job.objects.filter(is_active=True).count()
+    total_observed = listing_stats['total_observed']
+    total_jobs = total_verified + total_observed
+
+    total_tracked = listing_stats['total_tracked']
+    total_rejected = max(total_tracked - total_observed, 0)
+
+    # Distinct company count, one aggregate per table. Slight double-count
+    # possible for a company in both tables; negligible for a homepage stat.
+    verified_companies = (
+        Job.objects.filter(is_active=True)
+        .values('company').distinct().count()
+    )
+    total_companies = verified_companies + listing_stats['observed_companies']
+
+    # ---- Freshness tiers (counts drive the "Beat the crowd" pills) --
+    fresh_counts = listing_stats['fresh_counts']
+
+    # Fresh listing cards, by the ids stored with the stats. defer() the
+    # heavy columns the cards never read (see job_list note on
+    # raw_data/description_summary RSS cost).
+    fresh_ids = listing_stats['fresh_listing_ids']
+    by_pk = (
+        ScrapedJobListing.objects.filter(pk__in=fresh_ids)
+        .select_related('activity_score')
+        .defer('description_summary', 'raw_data', 'search_vector')
+        .in_bulk()
+    )
+    fresh_listings = [by_pk[pk] for pk in fresh_ids if pk in by_pk]
+
+    # Compact per-card "why it's here" chips, derived from fields we
+    # already have in hand (not a full breakdown — that lives on the
+    # detail page). Keyed by pk because custom attrs shouldn't ride
+    # through the pickle cache.
+    fresh_reasons = {}
+    for listing in fresh_listings:
+        reasons = []
+        if listing.salary_min or listing.salary_max:
+            reasons.append('Salary listed')
+        days = listing.days_since_posted()
+        if days <= 2:
+            reasons.append('Posted in the last 48h')
+        elif days <= 7:
+            reasons.append('Posted this week')
+        if listing.repost_count == 0:
+            reasons.append('Not a repost')
+        try:
+            breakdown = listing.activity_score.score_breakdown or {}
+            velocity = breakdown.get('company_velocity', {})
+            if isinstance(velocity, dict) and velocity.get('points', 0) >= 4:
+                reasons.append('Company hiring actively')
+        except (HiringActivityScore.DoesNotExist, AttributeError):
+            pass
+        fresh_reasons[listing.pk] = reasons[:3]
+
+    # ---- "What changed since yesterday" delta block ------------------
+    delta = {
+        'new_24h': fresh_counts['h24'],
+        'closed_24h': listing_stats['closed_24h'],
+        'reposts_24h': listing_stats['reposts_24h'],
+        'ramping': stats['companies']['ramping'],
+        'quiet': stats['companies']['quiet'],
+    }
+
+    data = {
+        'verified_jobs': verified_jobs,
+        'fresh_listings': fresh_listings,
+        'fresh_reasons': fresh_reasons,
+        'fresh_counts': fresh_counts,
+        'delta': delta,
+        'ticker_items': stats['ticker']['items'],
+        'employer_rows': stats['employers']['rows'],
+        'total_jobs': total_jobs,
+        'total_tracked': total_tracked,
+        'total_rejected': total_rejected,
+        'total_companies': total_companies,
+        # Pre-formatted display strings (humanize isn't installed)
+        'fmt': {
+            'total_jobs': f'{total_jobs:,}',
+            'total_tracked': f'{total_tracked:,}',
+            'total_rejected': f'{total_rejected:,}',
+            'total_companies': f'{total_companies:,}',
+            'new_24h': f"{delta['new_24h']:,}",
+            'h48': f"{fresh_counts['h48']:,}",
+            'd7': f"{fresh_counts['d7']:,}",
+        },
+    }
+    return data
+
+
+def get_home_payload():
+    """The cached homepage payload, rebuilding it if needed (single-flight)."""
+    return get_or_refresh(HOME_CACHE_KEY, build_home_payload, HOME_CACHE_TTL, HOME_STALE_TTL)
+
+
+def refresh_home_payload():
+    """Rebuild and store the homepage payload now (background refresher)."""
+    return refresh(HOME_CACHE_KEY, build_home_payload, HOME_CACHE_TTL, HOME_STALE_TTL)
@@ -0,0 +1,175 @@
+"""
+Concurrent source-URL checks for check_listing_links.
+
+The command used to issue one blocking requests.head() per listing, which at
+up to 15s a request covered a small slice of the published board per run.
+LinkChecker checks many URLs at once on one event loop (aiohttp) while
+staying polite to the ATS hosts most listings share:
+
+- one ClientSession, so connections are pooled and reused across the run
+  (at most `concurrency` open, at most `per_host` to a host);
+- at most `per_host` requests in flight per host, and request starts to a
+  host spaced at least `host_delay` seconds apart;
+- links are interleaved by host, so a run over thousands of Greenhouse URLs
+  doesn't park every worker on boards.greenhouse.io;
+- TRANSIENT_CODES and timeouts are retried `retries` times with exponential
+  backoff (or the server's Retry-After, capped), off the host's slots.
+
+check() is synchronous — it runs the loop until the given links are done —
+so the caller writes each chunk's results to the database between calls
+while the session, and its connections, stay open.
+
+Usage:
+    with LinkChecker(timeout=15) as checker:
+        for key, outcome, status_code in checker.check([(key, url), ...]):
+            ...
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+
+# HTTP status codes that indicate a dead listing
+DEAD_STATUS_CODES = {404, 410, 403}
+
+# Status codes that might be temporary — don't close these
+TRANSIENT_CODES = {429, 500, 502, 503, 504}
+
+# check() outcomes
+LIVE, DEAD, TRANSIENT, TIMEOUT, ERROR = 'live', 'dead', 'transient', 'timeout', 'error'
+
+HEADERS = {
+    'User-Agent': 'RJRP-LinkChecker/1.0 (job board health check)',
+    'Accept': 'text/html',
+}
+
+MAX_RETRY_AFTER = 60
+
+
+def interleave_by_host(links):
+    """Reorder (key, url) pairs round-robin across hosts, keeping each host's order."""
+    by_host = OrderedDict()
+    for key, url in links:
+        by_host.setdefault(urlsplit(url).hostname or '', []).append((key, url))
+    queues = [iter(group) for group in by_host.values()]
+    ordered = []
+    while queues:
+        remaining = []
+        for group in queues:
+            item = next(group, None)
+            if item is not None:
+                ordered.append(item)
+                remaining.append(group)
+        queues = remaining
+    return ordered
+
+
+class _Host:
+    """Per-host slots and request spacing."""
+
+    def __init__(self, per_host):
+        self.slots = asyncio.Semaphore(per_host)
+        self.next_start = 0.0
+
+
+class LinkChecker:
+    """Checks (key, url) links; see the module docstring."""
+
+    def __init__(self, timeout=15, concurrency=50, per_host=4, host_delay=0.25,
+                 retries=2, backoff=1.0):
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self.retries = retries
+        self.backoff = backoff
+        self.retried = 0
+        self._loop = asyncio.new_event_loop()
+        self._session = None
+        self._hosts = defaultdict(lambda: _Host(self.per_host))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._session is not None:
+            self._loop.run_until_complete(self._session.close())
+            self._session = None
+        self._loop.close()
+
+    def check(self, links):
+        """[(key, outcome, status_code or None)] for (key, url) `links`, in completion order."""
+        return self._loop.run_until_complete(self._check_all(interleave_by_host(links)))
+
+    async def _check_all(self, links):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=HEADERS,
+            )
+        pending = iter(links)
+        results = []
+
+        async def worker():
+            for key, url in pending:
+                outcome, status_code = await self._check_url(url)
+                results.append((key, outcome, status_code))
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(links)))))
+        return results
+
+    async def _check_url(self, url):
+        host = self._hosts[urlsplit(url).hostname or '']
+        attempt = 0
+        while True:
+            wait = None
+            try:
+                status_code, retry_after = await self._request(host, url)
+            except asyncio.TimeoutError:
+                outcome, status_code = TIMEOUT, None
+            except aiohttp.ClientConnectionError:
+                return DEAD, 0
+            except (aiohttp.ClientError, ValueError):
+                return ERROR, None
+            else:
+                if status_code in DEAD_STATUS_CODES:
+                    return DEAD, status_code
+                if status_code not in TRANSIENT_CODES:
+                    return LIVE, status_code
+                outcome, wait = TRANSIENT, retry_after
+            if attempt >= self.retries:
+                return outcome, status_code
+            attempt += 1
+            self.retried += 1
+            await asyncio.sleep(wait if wait is not None else self.backoff * 2 ** (attempt - 1))
+
+    async def _request(self, host, url):
+        """(status, Retry-After seconds or None); HEAD first, GET if HEAD is refused."""
+        async with host.slots:
+            now = time.monotonic()
+            start = max(now, host.next_start)
+            host.next_start = start + self.host_delay
+            if start > now:
+                await asyncio.sleep(start - now)
+            async with self._session.head(url, allow_redirects=True) as resp:
+                status, headers = resp.status, resp.headers
+            # Some servers block HEAD — retry with GET
+            if status == 405:
+                async with self._session.get(url, allow_redirects=True) as resp:
+                    status, headers = resp.status, resp.headers
+        return status, _retry_after(headers)
+
+
+def _retry_after(headers):
+    value = headers.get('Retry-After', '')
+    if value.isdigit():
+        return min(int(value), MAX_RETRY_AFTER)
+    return None
@@ -0,0 +1,171 @@
+"""
+Location normalization for job listings.
+
+`location` is free text from dozens of feeds ("Austin, TX", "Remote - US",
+"New York, NY, United States", "Toronto, ON, Canada", "Remote"). The /jobs/
+country filter used to re-parse it on every request as a ~100-term
+endswith/icontains OR chain over the 50 states — never index-friendly. This
+module parses it ONCE, when a row is written (Job.save /
+ScrapedJobListing.save, i.e. at sync time), into the indexed columns
+country_code / region_code / city / is_remote, so `country=us` is a single
+equality.
+
+Design principles:
+- Matches what the old chain matched: "United States"/"USA"/", US" anywhere,
+  or a state code as its own comma segment ("Austin, TX", "Austin, TX 78701").
+  Full state names ("Austin, Texas") are recognized too.
+- Conservative outside the US: a small table of common countries and the
+  Canadian provinces (so "Toronto, ON, CA" is Canada, not California).
+  Unknown stays '' — the listing simply doesn't match a country filter.
+- Dependency-free (re only) so it's cheap to unit test.
+
+Public API:
+    parse_location(location, remote=False) -> (country_code, region_code, city, is_remote)
+    location_fields(location, remote=False) -> {field: value} for the four columns
+    backfill_locations(queryset, remote_field, batch_size=1000) -> rows updated
+"""
+import re
+from functools import lru_cache
+
+
+US_STATES = {
+    'AL': 'alabama', 'AK': 'alaska', 'AZ': 'arizona', 'AR': 'arkansas',
+    'CA': 'california', 'CO': 'colorado', 'CT': 'connecticut', 'DE': 'delaware',
+    'FL': 'florida', 'GA': 'georgia', 'HI': 'hawaii', 'ID': 'idaho',
+    'IL': 'illinois', 'IN': 'indiana', 'IA': 'iowa', 'KS': 'kansas',
+    'KY': 'kentucky', 'LA': 'louisiana', 'ME': 'maine', 'MD': 'maryland',
+    'MA': 'massachusetts', 'MI': 'michigan', 'MN': 'minnesota', 'MS': 'mississippi',
+    'MO': 'missouri', 'MT': 'montana', 'NE': 'nebraska', 'NV': 'nevada',
+    'NH': 'new hampshire', 'NJ': 'new jersey', 'NM': 'new mexico', 'NY': 'new york',
+    'NC': 'north carolina', 'ND': 'north dakota', 'OH': 'ohio', 'OK': 'oklahoma',
+    'OR': 'oregon', 'PA': 'pennsylvania', 'RI': 'rhode island', 'SC': 'south carolina',
+    'SD': 'south dakota', 'TN': 'tennessee', 'TX': 'texas', 'UT': 'utah',
+    'VT': 'vermont', 'VA': 'virginia', 'WA': 'washington', 'WV': 'west virginia',
+    'WI': 'wisconsin', 'WY': 'wyoming', 'DC': 'district of columbia',
+}
+_US_STATE_NAMES = {name: code for code, name in US_STATES.items()}
+
+CA_PROVINCES = {
+    'AB', 'BC', 'MB', 'NB', 'NL', 'NS', 'NT', 'NU', 'ON', 'PE', 'QC', 'SK', 'YT',
+}
+
+# Lower-cased country spellings seen in feeds -> ISO 3166-1 alpha-2.
+COUNTRIES = {
+    'united states': 'US', 'united states of america': 'US', 'usa': 'US', 'us': 'US',
+    'u.s.': 'US', 'u.s.a.': 'US',
+    'canada': 'CA',
+    'united kingdom': 'GB', 'uk': 'GB', 'england': 'GB', 'scotland': 'GB',
+    'ireland': 'IE', 'germany': 'DE', 'deutschland': 'DE', 'france': 'FR',
+    'spain': 'ES', 'portugal': 'PT', 'netherlands': 'NL', 'belgium': 'BE',
+    'switzerland': 'CH', 'austria': 'AT', 'italy': 'IT', 'poland': 'PL',
+    'sweden': 'SE', 'norway': 'NO', 'denmark': 'DK', 'finland': 'FI',
+    'india': 'IN', 'singapore': 'SG', 'japan': 'JP', 'australia': 'AU',
+    'new zealand': 'NZ', 'mexico': 'MX', 'brazil': 'BR', 'israel': 'IL',
+    'philippines': 'PH',
+}
+
+# Segment separators: commas, and the " - " / " | " / "/" feeds use between
+# "Remote" and the country ("Remote - US").
+_SPLIT_RE = re.compile(r'\s*(?:,|;|\||\s-\s|/|\(|\))\s*')
+_ZIP_RE = re.compile(r'^([A-Za-z]{2})\s+\d{5}(?:-\d{4})?$')
+_REMOTE_RE = re.compile(r'\bremote\b|\banywhere\b|work from home|\bwfh\b', re.I)
+_NOT_CITY_RE = re.compile(r'^(remote|anywhere|hybrid|on-?site|multiple locations?|various)$', re.I)
+
+
+@lru_cache(maxsize=4096)
+def parse_location(location, remote=False):
+    """
+    Parse a free-text location into (country_code, region_code, city, is_remote).
+
+    Missing parts are '' (and is_remote False). `remote` lets the caller
+    fold in a structured remote flag the feed carried separately.
+    """
+    text = (location or '').strip()
+    is_remote = bool(remote) or bool(_REMOTE_RE.search(text))
+    if not text:
+        return '', '', '', is_remote
+
+    segments = [seg.strip(' .') for seg in _SPLIT_RE.split(text)]
+    segments = [seg for seg in segments if seg]
+
+    country = ''
+    region = ''
+    city = ''
+    for index, segment in enumerate(segments):
+        lowered = segment.lower()
+        zip_match = _ZIP_RE.match(segment)
+        code = (zip_match.group(1) if zip_match else segment).upper()
+
+        # Two-letter codes after the first segment: province/state, or the
+        # country code. "CA" is California unless a province came first.
+        if index > 0 and len(code) == 2:
+            if code in CA_PROVINCES and not region:
+                region, country = code, 'CA'
+                continue
+            if code == 'CA' and region in CA_PROVINCES:
+                continue
+            if code in US_STATES and not region:
+                region = code
+                continue
+            if code == 'US':
+                country = 'US'
+                continue
+        if lowered in COUNTRIES:
+            country = country or COUNTRIES[lowered]
+            continue
+        if lowered in _US_STATE_NAMES and not region and (index > 0 or len(segments) == 1):
+            region = _US_STATE_NAMES[lowered]
+            continue
+        if not city and not _NOT_CITY_RE.match(segment) and not _REMOTE_RE.fullmatch(segment):
+            city = segment[:100]
+
+    if region in US_STATES:
+        if country in ('', 'US'):
+            country = 'US'
+        else:
+            region = ''
+    elif region and country != 'CA':
+        region = ''
+
+    return country, region, city, is_remote
+
+
+LOCATION_FIELDS = ['country_code', 'region_code', 'city', 'is_remote']
+
+
+def is_remote_status(remote_status):
+    """True for a remote_status value that means fully remote ('remote', 'Remote')."""
+    return (remote_status or '').strip().lower() == 'remote'
+
+
+def location_fields(location, remote=False):
+    """parse_location() as a {field: value} dict for model assignment."""
+    return dict(zip(LOCATION_FIELDS, parse_location(location or '', bool(remote))))
+
+
+def backfill_locations(queryset, remote_field, batch_size=1000):
+    """
+    Re-parse `location` for every row in `queryset` and bulk_update the rows
+    whose normalized columns changed. `remote_field` names the model's
+    remote-status column. Distinct location strings are few, so
+    parse_location's cache makes this mostly a scan. Returns the number of
+    rows updated.
+    """
+    model = queryset.model
+    updated = 0
+    pending = []
+    rows = queryset.only('pk', 'location', remote_field, *LOCATION_FIELDS).order_by('pk')
+    for obj in rows.iterator(chunk_size=batch_size):
+        parsed = location_fields(obj.location, is_remote_status(getattr(obj, remote_field)))
+        if any(getattr(obj, field) != value for field, value in parsed.items()):
+            for field, value in parsed.items():
+                setattr(obj, field, value)
+            pending.append(obj)
+        if len(pending) >= batch_size:
+            model.objects.bulk_update(pending, LOCATION_FIELDS)
+            updated += len(pending)
+            pending = []
+    if pending:
+        model.objects.bulk_update(pending, LOCATION_FIELDS)
+        updated += len(pending)
+    return updated
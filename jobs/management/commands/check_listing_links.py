@@ -4,25 +4,34 @@ Management command to check if external source URLs for scraped listings are sti
 Makes HTTP HEAD requests against source_url for active/published listings.
 If a URL returns 404, 410, or a connection error, the listing is marked as closed.
 
+The checks run concurrently (jobs/linkcheck.py): one pooled HTTP session,
+per-host concurrency limits and request spacing, retries with backoff for
+transient errors. Results are written per chunk of listings with a handful
+of UPDATEs (one per outcome and status code), not a save() per listing, so
+a daily run can cover the whole published board.
+
 Usage:
-    python manage.py check_listing_links                # Check all active listings
+    python manage.py check_listing_links                # Check all listings due a check
     python manage.py check_listing_links --dry-run      # Preview without changes
     python manage.py check_listing_links --batch 50     # Check 50 at a time
     python manage.py check_listing_links --timeout 10   # Custom timeout in seconds
+    python manage.py check_listing_links --per-host 2 --host-delay 1
 """
 
-import requests
+from collections import defaultdict
 from datetime import timedelta
+
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from jobs.models import ScrapedJobListing
 
+from jobs.homepage import LISTING_STATS, refresh_home_stats
+from jobs.linkcheck import DEAD, ERROR, LIVE, TIMEOUT, TRANSIENT, LinkChecker
+from jobs.models import ScrapedJobListing
+from jobs.pagecache import bump_generation
 
-# HTTP status codes that indicate a dead listing
-DEAD_STATUS_CODES = {404, 410, 403}
 
-# Status codes that might be temporary — don't close these
-TRANSIENT_CODES = {429, 500, 502, 503, 504}
+# Listings checked (and written) per round
+CHUNK_SIZE = 1000
 
 
 class Command(BaseCommand):
@@ -37,8 +46,8 @@ class Command(BaseCommand):
         parser.add_argument(
             '--batch',
             type=int,
-            default=100,
-            help='Maximum number of listings to check per run (default: 100)',
+            default=0,
+            help='Maximum number of listings to check per run (default: 0 = all due)',
         )
         parser.add_argument(
             '--timeout',
@@ -52,11 +61,40 @@ class Command(BaseCommand):
             default=1,
             help='Skip listings checked within this many days (default: 1)',
         )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help='Requests in flight across all hosts (default: 50)',
+        )
+        parser.add_argument(
+            '--per-host',
+            type=int,
+            default=4,
+            help='Requests in flight per host (default: 4)',
+        )
+        parser.add_argument(
+            '--host-delay',
+            type=float,
+            default=0.25,
+            help='Minimum seconds between request starts to one host (default: 0.25)',
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=2,
+            help='Retries for transient errors and timeouts (default: 2)',
+        )
+        parser.add_argument(
+            '--backoff',
+            type=float,
+            default=1.0,
+            help='First retry delay in seconds, doubled per retry (default: 1)',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         batch_size = options['batch']
-        timeout = options['timeout']
         recheck_days = options['recheck_days']
 
         now = timezone.now()
@@ -68,9 +106,12 @@ class Command(BaseCommand):
             published_to_board=True,
         ).exclude(
             link_last_checked__gte=recheck_threshold,
-        ).order_by('link_last_checked')[:batch_size]
+        ).order_by('link_last_checked', 'pk').values_list('pk', 'source_url', 'title', 'company_name')
+        if batch_size:
+            listings = listings[:batch_size]
+        listings = list(listings)
 
-        total = listings.count()
+        total = len(listings)
         if total == 0:
             self.stdout.write(self.style.SUCCESS(
                 'No listings need link checking right now.'
@@ -79,74 +120,31 @@ class Command(BaseCommand):
 
         self.stdout.write(f'Checking {total} listing URL(s)...\n')
 
-        dead_count = 0
-        live_count = 0
-        error_count = 0
-
-        headers = {
-            'User-Agent': 'RJRP-LinkChecker/1.0 (job board health check)',
-            'Accept': 'text/html',
-        }
-
-        for listing in listings:
-            url = listing.source_url
-            try:
-                # Use HEAD first, fall back to GET if HEAD is blocked
-                resp = requests.head(
-                    url, timeout=timeout, headers=headers,
-                    allow_redirects=True
-                )
-
-                # Some servers block HEAD — retry with GET
-                if resp.status_code == 405:
-                    resp = requests.get(
-                        url, timeout=timeout, headers=headers,
-                        allow_redirects=True, stream=True
-                    )
-                    resp.close()
-
-                if resp.status_code in DEAD_STATUS_CODES:
-                    dead_count += 1
-                    self._handle_dead(listing, resp.status_code, dry_run, now)
-                elif resp.status_code in TRANSIENT_CODES:
-                    error_count += 1
-                    self.stdout.write(self.style.WARNING(
-                        f'  TRANSIENT ({resp.status_code}): {listing.title} '
-                        f'at {listing.company_name}'
-                    ))
-                    if not dry_run:
-                        listing.link_last_checked = now
-                        listing.save(update_fields=['link_last_checked'])
-                else:
-                    live_count += 1
-                    if not dry_run:
-                        listing.link_last_checked = now
-                        listing.link_status_code = resp.status_code
-                        listing.save(update_fields=[
-                            'link_last_checked', 'link_status_code'
-                        ])
-
-            except requests.exceptions.Timeout:
-                error_count += 1
-                self.stdout.write(self.style.WARNING(
-                    f'  TIMEOUT: {listing.title} at {listing.company_name}'
-                ))
+        counts = defaultdict(int)
+        checker = LinkChecker(
+            timeout=options['timeout'],
+            concurrency=options['concurrency'],
+            per_host=options['per_host'],
+            host_delay=options['host_delay'],
+            retries=options['retries'],
+            backoff=options['backoff'],
+        )
+        with checker:
+            for i in range(0, total, CHUNK_SIZE):
+                chunk = listings[i:i + CHUNK_SIZE]
+                results = checker.check([(pk, url) for pk, url, _title, _company_name in chunk])
+                for _pk, outcome, _status_code in results:
+                    counts[outcome] += 1
+                self._report(results, {pk: (title, company) for pk, _url, title, company in chunk}, dry_run)
                 if not dry_run:
-                    listing.link_last_checked = now
-                    listing.save(update_fields=['link_last_checked'])
+                    self._write(results, now)
 
-            except requests.exceptions.ConnectionError:
-                dead_count += 1
-                self._handle_dead(listing, 0, dry_run, now)
-
-            except requests.exceptions.RequestException as e:
-                error_count += 1
-                self.stdout.write(self.style.WARNING(
-                    f'  ERROR: {listing.title} — {type(e).__name__}'
-                ))
-                if not dry_run:
-                    listing.link_last_checked = now
-                    listing.save(update_fields=['link_last_checked'])
+        dead_count = counts[DEAD]
+        live_count = counts[LIVE]
+        error_count = counts[TRANSIENT] + counts[TIMEOUT] + counts[ERROR]
+        if dead_count and not dry_run:
+            bump_generation()
+            refresh_home_stats(LISTING_STATS)
 
         # Summary
         prefix = '[DRY RUN] ' if dry_run else ''
@@ -154,27 +152,57 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(
             f'{prefix}Link check complete: '
             f'{live_count} live, {dead_count} dead, {error_count} errors '
-            f'(out of {total} checked)'
+            f'(out of {total} checked, {checker.retried} retries)'
         ))
 
-    def _handle_dead(self, listing, status_code, dry_run, now):
-        """Mark a listing as closed due to dead link."""
-        label = f'HTTP {status_code}' if status_code else 'Connection failed'
-        if dry_run:
-            self.stdout.write(self.style.ERROR(
-                f'  DEAD ({label}): {listing.title} at {listing.company_name} '
-                f'— would close'
-            ))
-        else:
-            listing.status = 'closed'
-            listing.date_removed = now
-            listing.published_to_board = False
-            listing.link_last_checked = now
-            listing.link_status_code = status_code
-            listing.save(update_fields=[
-                'status', 'date_removed', 'published_to_board',
-                'link_last_checked', 'link_status_code',
-            ])
-            self.stdout.write(self.style.ERROR(
-                f'  CLOSED ({label}): {listing.title} at {listing.company_name}'
-            ))
+    def _report(self, results, listings, dry_run):
+        """Print the dead and failed checks; `listings` is {pk: (title, company_name)}."""
+        for pk, outcome, status_code in results:
+            title, company_name = listings[pk]
+            if outcome == DEAD:
+                label = f'HTTP {status_code}' if status_code else 'Connection failed'
+                if dry_run:
+                    self.stdout.write(self.style.ERROR(
+                        f'  DEAD ({label}): {title} at {company_name} — would close'
+                    ))
+                else:
+                    self.stdout.write(self.style.ERROR(
+                        f'  CLOSED ({label}): {title} at {company_name}'
+                    ))
+            elif outcome == TRANSIENT:
+                self.stdout.write(self.style.WARNING(
+                    f'  TRANSIENT ({status_code}): {title} at {company_name}'
+                ))
+            elif outcome == TIMEOUT:
+                self.stdout.write(self.style.WARNING(
+                    f'  TIMEOUT: {title} at {company_name}'
+                ))
+            elif outcome == ERROR:
+                self.stdout.write(self.style.WARNING(
+                    f'  ERROR: {title} at {company_name}'
+                ))
+
+    def _write(self, results, now):
+        """
+        Record a chunk of results: one UPDATE per (outcome, status code).
+        Dead links close the listing; transient failures only stamp
+        link_last_checked so the listing waits out --recheck-days.
+        """
+        groups = defaultdict(list)
+        for pk, outcome, status_code in results:
+            if outcome in (LIVE, DEAD):
+                groups[outcome, status_code].append(pk)
+            else:
+                groups[outcome, None].append(pk)
+
+        for (outcome, status_code), pks in groups.items():
+            listings = ScrapedJobListing.objects.filter(pk__in=pks)
+            if outcome == DEAD:
+                listings.update(
+                    status='closed', date_removed=now, published_to_board=False,
+                    link_last_checked=now, link_status_code=status_code,
+                )
+            elif outcome == LIVE:
+                listings.update(link_last_checked=now, link_status_code=status_code)
+            else:
+                listings.update(link_last_checked=now)
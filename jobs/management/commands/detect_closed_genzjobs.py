@@ -0,0 +1,87 @@
+"""
+Management command to close local listings that are no longer active in genzjobs.
+
+Incremental sync_genzjobs runs only see rows that changed, so they can't tell
+that a listing went away. This job takes the set difference instead: every
+local active listing with a genzjobs_id that isn't in the current set of
+active genzjobs ids (streamed keyset-paged, see jobs/genzjobs.py) is
+re-checked and closed: one remote read and one local UPDATE per chunk of
+candidates. Run it on its own schedule (daily), not on every sync.
+
+Usage:
+    python manage.py detect_closed_genzjobs
+    python manage.py detect_closed_genzjobs --dry-run
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.genzjobs import CHUNK_SIZE, active_ids, still_active
+from jobs.homepage import LISTING_STATS, refresh_home_stats
+from jobs.models import GenzjobsListing, ScrapedJobListing
+from jobs.pagecache import bump_generation
+
+
+class Command(BaseCommand):
+    help = 'Close local listings that are no longer active in genzjobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the candidates without closing anything',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.GENZJOBS_ENABLED:
+            self.stderr.write(self.style.ERROR(
+                'GENZJOBS_DATABASE_URL is not configured. Set it in your environment.'
+            ))
+            return
+
+        active_genzjobs_ids = set(active_ids(GenzjobsListing.objects.filter(is_active=True)))
+        self.stdout.write(f"{len(active_genzjobs_ids)} active listings in genzjobs")
+
+        # Local active listings whose genzjobs row isn't active any more
+        local_active = ScrapedJobListing.objects.filter(
+            genzjobs_id__isnull=False,
+            status='active',
+        ).order_by().values_list('pk', 'genzjobs_id')
+        candidates = [
+            (pk, genzjobs_id) for pk, genzjobs_id in local_active.iterator(chunk_size=5000)
+            if genzjobs_id not in active_genzjobs_ids
+        ]
+
+        if not candidates:
+            self.stdout.write(self.style.SUCCESS("No closed listings found"))
+            return
+
+        self.stdout.write(f"Checking {len(candidates)} potentially closed listings...")
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('DRY RUN - no changes will be made'))
+            return
+
+        closed_count = self._close(candidates)
+        if closed_count:
+            bump_generation()
+            refresh_home_stats(LISTING_STATS)
+        self.stdout.write(self.style.SUCCESS(f"Marked {closed_count} listings as closed"))
+
+    def _close(self, candidates):
+        """
+        Close the (pk, genzjobs_id) candidates that are still inactive or
+        gone in genzjobs — re-checked, since a listing may have come back
+        since the id set was read. Returns listings closed.
+        """
+        closed_count = 0
+        now = timezone.now()
+        for i in range(0, len(candidates), CHUNK_SIZE):
+            chunk = candidates[i:i + CHUNK_SIZE]
+            active = still_active(genzjobs_id for _pk, genzjobs_id in chunk)
+            to_close = [pk for pk, genzjobs_id in chunk if genzjobs_id not in active]
+            if to_close:
+                closed_count += ScrapedJobListing.objects.filter(
+                    pk__in=to_close, status='active',
+                ).update(status='closed', date_removed=now)
+        return closed_count
@@ -0,0 +1,90 @@
+"""
+Management command to backfill repost links across the listing corpus.
+
+Walks the listings that have no MinHash row yet (too-short descriptions
+get an empty one, so they are not rescanned) in posting order,
+keyset-paged, and runs jobs/reposts.py's detect_reposts() on each chunk: an
+earlier posting is always indexed before the later ones that may repost it,
+memory is bounded by --batch-size, and an interrupted run resumes where it
+stopped. Listings that get linked are marked for rescore, since their
+repost and evergreen signals changed. sync_genzjobs handles new and edited
+listings after this has run once.
+
+Usage:
+    python manage.py detect_reposts
+    python manage.py detect_reposts --rebuild      # Drop the index and all links first
+    python manage.py detect_reposts --batch-size 2000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from jobs.models import ListingMinHash, ListingMinHashBand, ScrapedJobListing
+from jobs.reposts import detect_reposts
+from jobs.scoring.incremental import mark_for_rescore
+
+
+class Command(BaseCommand):
+    help = 'Index MinHash signatures and link reposted listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Listings per chunk (default: 1000)',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Clear every signature and repost link, then index from scratch',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        marked = 0
+
+        if options['rebuild']:
+            linked_before = ScrapedJobListing.objects.filter(
+                Q(repost_count__gt=0) | Q(previous_listing__isnull=False)
+            )
+            reset_ids = list(linked_before.values_list('pk', flat=True))
+            linked_before.update(repost_count=0, previous_listing=None)
+            marked += mark_for_rescore(reset_ids)
+            ListingMinHashBand.objects.all().delete()
+            ListingMinHash.objects.all().delete()
+            self.stdout.write(f"Cleared the repost index and {len(reset_ids)} link(s)")
+
+        pending = ScrapedJobListing.objects.filter(minhash__isnull=True).order_by('feed_posted_at', 'pk')
+        total = pending.count()
+        self.stdout.write(f"Indexing {total} listing(s) in chunks of {batch_size}...")
+
+        processed = 0
+        linked = 0
+        after = None
+        while True:
+            started = time.monotonic()
+            page = pending
+            if after is not None:
+                page = page.filter(
+                    Q(feed_posted_at__gt=after[0]) | Q(feed_posted_at=after[0], pk__gt=after[1])
+                )
+            chunk = list(page.values_list('pk', 'feed_posted_at')[:batch_size])
+            if not chunk:
+                break
+            links = detect_reposts([pk for pk, _posted in chunk])
+            marked += mark_for_rescore(links)
+            processed += len(chunk)
+            linked += len(links)
+            after = chunk[-1][1], chunk[-1][0]
+            self.stdout.write(
+                f"  {processed}/{total}: {len(links)} repost(s) linked "
+                f"in {time.monotonic() - started:.1f}s"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {processed} listing(s); linked {linked} repost(s); "
+            f"marked {marked} score(s) for rescore."
+        ))
@@ -13,7 +13,9 @@ Usage:
 from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from jobs.homepage import LISTING_STATS, refresh_home_stats
 from jobs.models import ScrapedJobListing
+from jobs.pagecache import bump_generation
 
 
 class Command(BaseCommand):
@@ -116,6 +118,10 @@ class Command(BaseCommand):
                     f'Marked {close_count} listing(s) as closed.'
                 ))
 
+            # Listings left the feed: retire cached anonymous /jobs/ pages
+            bump_generation()
+            refresh_home_stats(LISTING_STATS)
+
         # Summary statistics
         self.stdout.write('')
         total_active = ScrapedJobListing.objects.filter(status='active').count()
@@ -12,15 +12,43 @@ Usage:
     python manage.py extract_salaries --all-statuses     # include unpublished/stale
     python manage.py extract_salaries --limit 500
 
-After a real run, scores pick up the new salary signal at the next daily
-rescore (score_listings --force, the RJRP-daily-rescore cron). Run it
-manually if you want the HAS changes immediately.
+Listings are read in chunks of --batch-size and each chunk's results are
+written with one bulk_update. With --workers N the parsing (pure Python,
+CPU-bound) runs in a pool of N processes while the parent streams chunks
+and writes; the workers never touch the database.
+
+    python manage.py extract_salaries --all-statuses --workers 4
+
+Salary is a HAS input, so each written chunk's listings are marked for
+rescore (jobs/scoring/incremental.py); the next `score_listings
+--incremental` run picks up the new salary signal. Run it manually if you
+want the HAS changes immediately.
 """
 
+import multiprocessing
+from collections import deque
+
 from django.core.management.base import BaseCommand
 
 from jobs.models import ScrapedJobListing
-from jobs.salary_extract import extract_salary_range
+from jobs.salary_extract import extract_salary_ranges
+from jobs.scoring.incremental import mark_for_rescore
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse_chunk(chunk):
+    """Pool task: (listings scanned, [(key, (min, max)), ...])."""
+    return len(chunk), extract_salary_ranges(chunk)
 
 
 class Command(BaseCommand):
@@ -36,6 +64,10 @@ class Command(BaseCommand):
                                  '(default: published active listings only)')
         parser.add_argument('--samples', type=int, default=10,
                             help='How many example extractions to print')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Listings parsed and written per chunk')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Parse in this many processes (default: in-process)')
 
     def handle(self, *args, **options):
         qs = ScrapedJobListing.objects.filter(
@@ -44,32 +76,35 @@ class Command(BaseCommand):
         if not options['all_statuses']:
             qs = qs.filter(published_to_board=True, status__in=['active', 'published'])
 
-        # only(): save() recomputes description/title hashes, so those source
-        # fields must be loaded or every save triggers deferred-field queries.
-        qs = qs.only('id', 'title', 'company_name', 'description',
-                     'salary_min', 'salary_max', 'date_last_seen')
+        rows = qs.order_by('pk').values_list('pk', 'company_name', 'title', 'description')
         if options['limit']:
-            qs = qs[:options['limit']]
+            rows = rows[:options['limit']]
+        chunks = (
+            [((pk, company_name, title), description) for pk, company_name, title, description in chunk]
+            for chunk in _chunks(rows.iterator(chunk_size=options['batch_size']), options['batch_size'])
+        )
 
-        scanned = extracted = 0
+        scanned = extracted = marked = 0
         samples = []
-        for listing in qs.iterator(chunk_size=500):
-            scanned += 1
-            result = extract_salary_range(listing.description)
-            if not result:
-                continue
-            lo, hi = result
-            extracted += 1
-            if len(samples) < options['samples']:
-                samples.append(
-                    f'  {listing.company_name[:28]:30s} {listing.title[:44]:46s} '
-                    f'{lo if lo is not None else "—"} .. {hi if hi is not None else "—"}'
+        for count, found in self._parse(chunks, options['workers']):
+            scanned += count
+            extracted += len(found)
+            for (pk, company_name, title), (lo, hi) in found:
+                if len(samples) < options['samples']:
+                    samples.append(
+                        f'  {company_name[:28]:30s} {title[:44]:46s} '
+                        f'{lo if lo is not None else "—"} .. {hi if hi is not None else "—"}'
+                    )
+            if found and not options['dry_run']:
+                ScrapedJobListing.objects.bulk_update(
+                    [
+                        ScrapedJobListing(pk=pk, salary_min=lo, salary_max=hi)
+                        for (pk, _company_name, _title), (lo, hi) in found
+                    ],
+                    ['salary_min', 'salary_max'],
                 )
-            if not options['dry_run']:
-                listing.salary_min = lo
-                listing.salary_max = hi
-                listing.save(update_fields=['salary_min', 'salary_max'])
-            if scanned % 2000 == 0:
+                marked += mark_for_rescore([pk for (pk, *_), _range in found])
+            if scanned // 2000 > (scanned - count) // 2000:
                 self.stdout.write(f'  ...scanned {scanned}, extracted {extracted}')
 
         mode = 'DRY RUN — no writes' if options['dry_run'] else 'written'
@@ -84,6 +119,26 @@ class Command(BaseCommand):
                 self.stdout.write(s)
         if extracted and not options['dry_run']:
             self.stdout.write(
-                'Salary fields updated. HAS scores pick this up at the next '
-                'daily rescore (or run: python manage.py score_listings --force)'
+                f'Salary fields updated; marked {marked} score(s) for rescore. '
+                'HAS scores pick this up at the next incremental rescore '
+                '(or run: python manage.py score_listings --incremental)'
             )
+
+    def _parse(self, chunks, workers):
+        """
+        Yield _parse_chunk() results in order. With workers > 1 the chunks
+        go to a process pool, at most 2 per worker in flight; they're read
+        from the database here, in this thread, as the pool drains.
+        """
+        if workers <= 1:
+            yield from map(_parse_chunk, chunks)
+            return
+        # Forked before the first query: the workers only parse text.
+        with multiprocessing.Pool(processes=workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_parse_chunk, (chunk,)))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
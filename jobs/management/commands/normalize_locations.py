@@ -0,0 +1,71 @@
+"""
+Management command to re-parse free-text locations into the normalized columns.
+
+country_code/region_code/city/is_remote are set on every save (Job.save,
+ScrapedJobListing.save — so every sync), and migration 0032 backfilled the
+existing rows. Run this after changing the parser in jobs/locations.py, or
+to repair rows written with queryset.update()/bulk paths that skip save().
+
+Usage:
+    python manage.py normalize_locations                  # Jobs and scraped listings
+    python manage.py normalize_locations --model scraped  # Scraped listings only
+    python manage.py normalize_locations --dry-run        # Count rows that would change
+"""
+
+from django.core.management.base import BaseCommand
+
+from jobs.locations import LOCATION_FIELDS, is_remote_status, location_fields, backfill_locations
+from jobs.models import Job, ScrapedJobListing
+
+
+MODELS = {
+    'jobs': Job,
+    'scraped': ScrapedJobListing,
+}
+
+
+class Command(BaseCommand):
+    help = 'Re-parse location into country_code/region_code/city/is_remote'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            choices=['all'] + list(MODELS),
+            default='all',
+            help='Which table to normalize (default: all)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk_update (default: 1000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count rows whose columns would change without writing',
+        )
+
+    def handle(self, *args, **options):
+        names = list(MODELS) if options['model'] == 'all' else [options['model']]
+        for name in names:
+            model = MODELS[name]
+            if options['dry_run']:
+                changed = self._count_changed(model)
+                self.stdout.write(self.style.WARNING(
+                    f'[DRY RUN] {name}: {changed} row(s) would change'
+                ))
+                continue
+            updated = backfill_locations(
+                model.objects.all(), 'remote_status', batch_size=options['batch_size']
+            )
+            self.stdout.write(self.style.SUCCESS(f'{name}: updated {updated} row(s)'))
+
+    def _count_changed(self, model):
+        changed = 0
+        rows = model.objects.only('pk', 'location', 'remote_status', *LOCATION_FIELDS)
+        for obj in rows.iterator(chunk_size=2000):
+            parsed = location_fields(obj.location, is_remote_status(obj.remote_status))
+            if any(getattr(obj, field) != value for field, value in parsed.items()):
+                changed += 1
+        return changed
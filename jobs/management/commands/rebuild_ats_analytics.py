@@ -0,0 +1,40 @@
+"""
+Management command to rebuild the ATS analytics rollup (PipelineDailyRollup).
+
+apply_job and move_application_stage keep the rollup current as they go,
+and deleting applications rebuilds their employer's rows; this recomputes it
+from the applications and stage history with one window query
+(jobs/ats_analytics.py) to repair it, e.g. after rows were removed with raw
+SQL, which sends no delete signals. Migration 0040 did the initial backfill.
+
+Usage:
+    python manage.py rebuild_ats_analytics                    # All employers
+    python manage.py rebuild_ats_analytics --employer acme_hr # One employer
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.ats_analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-employer daily ATS analytics rollup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--employer',
+            type=str,
+            help='Only rebuild the rollup of the employer with this username',
+        )
+
+    def handle(self, *args, **options):
+        employer_ids = None
+        if options['employer']:
+            employer = User.objects.filter(username=options['employer']).first()
+            if employer is None:
+                raise CommandError(f"No user named {options['employer']!r}")
+            employer_ids = [employer.pk]
+
+        rows = rebuild_rollups(employer_ids)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt ATS analytics rollup: {rows} row(s).'))
@@ -0,0 +1,75 @@
+"""
+Management command to re-age the persisted /jobs/ feed rank keys.
+
+feed_relevance on ScrapedJobListing blends the HAS score with a freshness bonus
+that decays over the first 30 days after posting (jobs/feed.py). The HAS half
+is written whenever a score saves; the freshness half goes stale as time
+passes, so this command recomputes it in a single UPDATE for the rows still
+inside the freshness window (plus any that aged out since the last run).
+Cheap enough to run hourly; the daily rescore also runs it.
+
+--rebuild re-derives feed_posted_at and feed_activity from their sources
+first (date_posted_external/date_first_seen and HiringActivityScore), for
+repairing rows written outside the model save paths.
+
+Usage:
+    python manage.py refresh_feed_ranks              # Re-age feed-visible listings
+    python manage.py refresh_feed_ranks --all        # Every listing, not just the feed
+    python manage.py refresh_feed_ranks --rebuild    # Re-derive all rank keys
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from jobs.feed import observed_posted_expression, refresh_feed_ranks
+from jobs.models import HiringActivityScore, ScrapedJobListing
+from jobs.pagecache import bump_generation
+
+
+class Command(BaseCommand):
+    help = 'Re-age the persisted feed relevance keys on scraped listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Refresh every listing, not only published active ones',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Re-derive feed_posted_at/feed_activity before re-aging (implies --all)',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        listings = ScrapedJobListing.objects.all()
+
+        if options['rebuild']:
+            rebuilt = listings.update(
+                feed_posted_at=observed_posted_expression(),
+                feed_activity=Coalesce(
+                    Subquery(
+                        HiringActivityScore.objects.filter(listing=OuterRef('pk'))
+                        .values('total_score')[:1]
+                    ),
+                    0,
+                ),
+                # Sentinel so the re-age pass below rewrites every row.
+                feed_relevance=-1.0,
+            )
+            self.stdout.write(f'Rebuilt rank keys for {rebuilt} listing(s).')
+        elif not options['all']:
+            listings = listings.filter(
+                published_to_board=True,
+                status__in=['active', 'published'],
+            )
+
+        updated = refresh_feed_ranks(listings, now=now)
+        if updated:
+            bump_generation()
+        self.stdout.write(self.style.SUCCESS(
+            f'Re-aged feed relevance for {updated} listing(s).'
+        ))
@@ -0,0 +1,56 @@
+"""
+Management command to rebuild the homepage payload in the shared cache.
+
+home() serves its data from the shared cache (jobs/homepage.py): a request
+only rebuilds it when the payload has gone stale, and then only one process
+at a time. Running this on a schedule, or as a long-lived worker with
+--loop, keeps the payload fresh so no request pays for the rebuild —
+including the ones arriving during the 09:00 UTC rescore. Run it right after
+score_listings to publish the new numbers immediately.
+
+Needs a shared cache the web workers can see: SHARED_CACHE_BACKEND=redis
+when this runs as a separate cron service (as on Render, where each service
+has its own /tmp), or =file only on the web service's own machine. With the
+per-process locmem backend it only warms its own copy.
+
+Usage:
+    python manage.py refresh_home_cache               # Rebuild once
+    python manage.py refresh_home_cache --loop 900    # Rebuild every 15 minutes
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.homepage import HOME_CACHE_TTL, refresh_home_payload
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the homepage payload in the shared cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            type=int,
+            metavar='SECONDS',
+            help=f'Keep running, rebuilding every SECONDS (must be under {HOME_CACHE_TTL})',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['loop']
+        if interval is not None and not 0 < interval < HOME_CACHE_TTL:
+            self.stderr.write(self.style.ERROR(
+                f'--loop must be between 1 and {HOME_CACHE_TTL - 1} seconds.'
+            ))
+            return
+
+        while True:
+            started = time.monotonic()
+            data = refresh_home_payload()
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt homepage payload in {time.monotonic() - started:.1f}s "
+                f"({data['total_jobs']:,} listings)."
+            ))
+            if interval is None:
+                return
+            time.sleep(interval)
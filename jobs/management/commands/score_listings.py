@@ -6,12 +6,20 @@ Usage:
     python manage.py score_listings --dry-run   # Preview without saving
     python manage.py score_listings --company "Acme Corp"  # Score specific company
     python manage.py score_listings --verbose   # Show detailed breakdown
+    python manage.py score_listings --incremental  # Only listings whose score may have moved
+    python manage.py score_listings --force --workers 8  # Full rescore across 8 processes
 """
 
 from django.core.management.base import BaseCommand
 from django.db.models import Q
+from jobs.feed import refresh_feed_ranks
+from jobs.homepage import LISTING_STATS, refresh_home_stats
+from jobs.pagecache import bump_generation
 from jobs.models import ScrapedJobListing
 from jobs.scoring import HASEngine
+from jobs.scoring.batch import BATCH_SIZE
+from jobs.scoring.incremental import dirty_listings, mark_company_changes
+from jobs.scoring.parallel import score_rows, score_sharded
 
 
 class Command(BaseCommand):
@@ -53,6 +61,20 @@ class Command(BaseCommand):
                  'chunks after a timeout without redoing already-current rows. '
                  'Implies re-scoring (no --force needed).',
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only (re)score listings with no score, a due rescore_at (time-based '
+                 'signals moved or sync changed an input), or whose company-level '
+                 'inputs changed since the last run. Replaces the nightly --force.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Score in N processes over pk-range shards (default: 1, in-process). '
+                 'Per-listing output is only shown in-process.',
+        )
         parser.add_argument(
             '--limit',
             type=int,
@@ -68,6 +90,10 @@ class Command(BaseCommand):
         min_score = options['min_score']
         stale_version = options['stale_version']
         limit = options['limit']
+        incremental = options['incremental']
+
+        engine = HASEngine()
+        engine.prepare_caches()
 
         # Build queryset
         queryset = ScrapedJobListing.objects.filter(
@@ -77,7 +103,18 @@ class Command(BaseCommand):
         if company_filter:
             queryset = queryset.filter(company_name__icontains=company_filter)
 
-        if stale_version is not None:
+        if incremental:
+            if dry_run:
+                self.stdout.write(self.style.WARNING(
+                    '[DRY RUN] Company-level changes are not marked; showing listings already due.'
+                ))
+            else:
+                companies, marked = mark_company_changes(engine)
+                self.stdout.write(
+                    f'{companies} company input(s) changed; marked {marked} score(s) for rescore.'
+                )
+            queryset = dirty_listings(queryset)
+        elif stale_version is not None:
             # Resume mode: rows with no score OR an out-of-date score_version.
             queryset = queryset.filter(
                 Q(activity_score__isnull=True)
@@ -87,10 +124,17 @@ class Command(BaseCommand):
             # Only score listings without a score
             queryset = queryset.filter(activity_score__isnull=True)
 
-        if limit is not None:
-            queryset = queryset[:limit]
-
-        total = queryset.count()
+        workers = max(1, options['workers'])
+        pks = None
+        if workers > 1:
+            # Shards are pk ranges over this (ordered) id list; --limit keeps
+            # the lowest pks.
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:limit])
+            total = len(pks)
+        else:
+            if limit is not None:
+                queryset = queryset[:limit]
+            total = queryset.count()
 
         if total == 0:
             self.stdout.write(self.style.SUCCESS(
@@ -105,43 +149,27 @@ class Command(BaseCommand):
         else:
             self.stdout.write(f'Scoring {total} listing(s)...')
 
-        engine = HASEngine()
-        engine.prepare_caches()
-        scored = 0
-        published = 0
-        by_band = {'very_active': 0, 'likely_active': 0, 'uncertain': 0, 'low_signal': 0}
-
-        for listing in queryset.select_related('company').iterator(chunk_size=200):
-            score, breakdown = engine.calculate_score(listing)
-            band = engine.get_score_band(score)
-
-            # Track statistics
-            by_band[band] += 1
-            if score >= min_score:
-                scored += 1
-                if engine.should_publish(score):
-                    published += 1
-
-            # Skip if below minimum score threshold (for display)
-            if score < min_score:
-                continue
-
-            if verbose:
-                self.stdout.write(f'\n{listing.title} ({listing.company_name})')
-                self.stdout.write(f'  Score: {score} ({band})')
-                self.stdout.write('  Breakdown:')
-                for signal_name, signal_data in breakdown.items():
-                    points = signal_data['points']
-                    explanation = signal_data['explanation']
-                    if points != 0 or signal_name == 'base':
-                        prefix = '+' if points > 0 else ''
-                        self.stdout.write(f'    {signal_name}: {prefix}{points} ({explanation})')
-            else:
-                marker = '*' if engine.should_publish(score) else ' '
-                self.stdout.write(f'  {marker} [{score:3d}] {band:14s} - {listing.title[:40]}')
-
-            if not dry_run:
-                engine.score_listing(listing, save=True)
+        if workers > 1:
+            self.stdout.write(f'Using {workers} worker processes.')
+            stats = score_sharded(
+                queryset, pks, engine, workers,
+                save=not dry_run, min_score=min_score,
+                on_shard=lambda done, shards, so_far: self.stdout.write(
+                    f'  Shard {done}/{shards} done ({so_far["scored"]} scored)'
+                ),
+            )
+        else:
+            # Batch scoring: per-company lookups once per batch, signals
+            # computed column-wise, breakdowns only rendered for --verbose and
+            # for saving.
+            rows = queryset.select_related('company').iterator(chunk_size=BATCH_SIZE)
+            stats = score_rows(
+                engine, rows, save=not dry_run, min_score=min_score,
+                on_result=lambda result: self._show(engine, result, verbose),
+            )
+        scored = stats['scored']
+        published = stats['published']
+        by_band = stats['by_band']
 
         # Summary
         self.stdout.write('')
@@ -159,7 +187,31 @@ class Command(BaseCommand):
                 '[DRY RUN] No changes saved. Remove --dry-run to save scores.'
             ))
         else:
+            # save_batch pushed changed scores into feed_activity/feed_relevance;
+            # re-age the freshness bonus for everything else too.
+            reaged = refresh_feed_ranks(ScrapedJobListing.objects.all())
+            bump_generation()
+            refresh_home_stats(LISTING_STATS)
             self.stdout.write('')
             self.stdout.write(self.style.SUCCESS(
                 f'Successfully scored {scored} listing(s).'
             ))
+            self.stdout.write(f'Re-aged feed relevance for {reaged} listing(s).')
+
+    def _show(self, engine, result, verbose):
+        listing, score, band = result.listing, result.total, result.band
+        if verbose:
+            self.stdout.write(f'\n{listing.title} ({listing.company_name})')
+            self.stdout.write(f'  Score: {score} ({band})')
+            self.stdout.write('  Breakdown:')
+            for signal_name, signal_data in result.breakdown.items():
+                if signal_name == '_meta':
+                    continue
+                points = signal_data['points']
+                explanation = signal_data['explanation']
+                if points != 0 or signal_name == 'base':
+                    prefix = '+' if points > 0 else ''
+                    self.stdout.write(f'    {signal_name}: {prefix}{points} ({explanation})')
+        else:
+            marker = '*' if engine.should_publish(score) else ' '
+            self.stdout.write(f'  {marker} [{score:3d}] {band:14s} - {listing.title[:40]}')
@@ -4,8 +4,36 @@ Sync job listings from genzjobs shared database to RJRP local tracker.
 Pulls active listings from genzjobs PostgreSQL, creates/updates local
 ScrapedJobListing records, and optionally writes verification status back.
 
+Each batch is written set-based: one query prefetches the batch's existing
+local rows, company names are resolved against an index built once per run
+(CompanyResolver, jobs/companies.py) with new companies created together,
+and the rows are built in memory and written with a single upsert on
+genzjobs_id. The upsert skips save(), so the batch path hashes the batch's
+new and edited listings with fingerprint_listings() (jobs/fingerprints.py)
+and calls refresh_derived_fields() (location columns, feed rank keys) and
+update_search_vectors() itself. If a batch's write fails, that batch is
+redone row by row so the bad listing is reported and the rest still sync.
+
+Most rows don't change between runs. Each local row stores a fingerprint of
+the genzjobs fields it was built from (source_fingerprint); when it still
+matches, the row isn't loaded or rewritten at all — at most its
+date_last_seen is bumped, in one UPDATE per batch, once it's TOUCH_AFTER old.
+The run reports created / changed / touched / unchanged counts.
+
+New listings, and existing ones whose description changed, are (re)linked
+to earlier near-duplicate postings at the same company (repost_count /
+previous_listing; jobs/reposts.py) as each batch is written.
+
+Runs are incremental: each source scope keeps a high-water mark on the
+genzjobs updatedAt (SyncWatermark), and a run streams only the rows updated
+past it, keyset-paged (jobs/genzjobs.py). That makes a sync every 15 minutes
+cheap. Listings that disappear from genzjobs are closed by the separate
+`detect_closed_genzjobs` job, which needs the full active id set.
+
 Usage:
-    python manage.py sync_genzjobs
+    python manage.py sync_genzjobs                # Rows changed since the last run
+    python manage.py sync_genzjobs --full         # Everything, ignoring the watermark
+    python manage.py sync_genzjobs --full --prefetch 2  # Overlap genzjobs reads with local writes
     python manage.py sync_genzjobs --dry-run
     python manage.py sync_genzjobs --source greenhouse
     python manage.py sync_genzjobs --since 2024-01-01
@@ -15,6 +43,7 @@ Usage:
 
 import hashlib
 import re
+import time
 from datetime import timedelta
 
 from django.conf import settings
@@ -22,10 +51,22 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 import datetime as _dt
 
+from jobs.companies import CompanyResolver
+from jobs.fingerprints import fingerprint_listings
+from jobs.genzjobs import (
+    CHUNK_SIZE, Prefetcher, changed_batches, load_watermark, push_verification,
+    save_watermark, verification_updates, watermark_scope,
+)
+from jobs.homepage import LISTING_STATS, refresh_home_stats
 from jobs.models import (
     Company, GenzjobsListing, ScrapedJobListing, HiringActivityScore,
 )
+from jobs.pagecache import bump_generation
+from jobs.reposts import detect_reposts
 from jobs.salary_extract import extract_salary_range
+from jobs.scoring.config import get_config
+from jobs.scoring.incremental import mark_for_rescore, scoring_signature
+from jobs.search import update_search_vectors
 
 
 # Map genzjobs source names to ScrapedJobListing SOURCE_ATS_CHOICES
@@ -48,6 +89,49 @@ SOURCE_MAP = {
 }
 
 
+# Local columns the sync owns: written from genzjobs on every run. The
+# upsert leaves everything else (scores, publishing, repost links,
+# date_first_seen, ...) as it is on existing rows.
+SYNCED_FIELDS = (
+    'title', 'company_name', 'description', 'location', 'source_ats', 'source_url',
+    'salary_min', 'salary_max', 'salary_currency',
+    'job_type', 'experience_level', 'remote_status', 'job_category',
+    'has_requirements', 'has_benefits', 'has_company_logo', 'has_company_website',
+    'classification_confidence', 'publisher', 'industry_category', 'skills_count',
+    'external_requisition_id', 'date_posted_external', 'status', 'company', 'raw_data',
+    'sync_fingerprint',
+)
+UPSERT_FIELDS = SYNCED_FIELDS + tuple(
+    field for field in ScrapedJobListing.DERIVED_FIELDS if field not in SYNCED_FIELDS
+)
+
+
+# The GenzjobsListing fields _apply_listing() reads (created_at only matters
+# for new rows, so it's left out).
+FINGERPRINT_FIELDS = (
+    'title', 'company', 'description', 'location', 'apply_url', 'source', 'source_id',
+    'source_url', 'salary_min', 'salary_max', 'salary_currency', 'job_type',
+    'experience_level', 'remote', 'category', 'classification_confidence',
+    'requirements', 'benefits', 'company_logo', 'company_website', 'skills',
+    'audience_tags', 'posted_at', 'publisher',
+)
+# Bump when _apply_listing() changes how fields are mapped, so every row is
+# rewritten once with the new mapping.
+FINGERPRINT_VERSION = 1
+
+# An unchanged row's date_last_seen is only rewritten once it is this old.
+# It feeds day-granularity staleness (is_stale, the HAS stale penalty), so
+# bumping it on every run would churn the table for nothing.
+TOUCH_AFTER = timedelta(hours=6)
+
+
+def source_fingerprint(gj, industry_category):
+    """SHA-256 over the genzjobs fields a local listing is built from."""
+    parts = [str(FINGERPRINT_VERSION), repr(industry_category)]
+    parts.extend(repr(getattr(gj, field)) for field in FINGERPRINT_FIELDS)
+    return hashlib.sha256('\x1f'.join(parts).encode()).hexdigest()
+
+
 class Command(BaseCommand):
     help = 'Sync job listings from genzjobs database to local RJRP tracker'
 
@@ -70,7 +154,21 @@ class Command(BaseCommand):
         parser.add_argument(
             '--since',
             type=str,
-            help='Only sync listings updated since this date (YYYY-MM-DD)',
+            help='Only sync listings updated since this date (YYYY-MM-DD); '
+                 'does not read or move the watermark',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore the stored watermark and stream every active listing',
+        )
+        parser.add_argument(
+            '--prefetch',
+            type=int,
+            default=0,
+            metavar='N',
+            help='Pipeline mode: read up to N batches ahead from genzjobs in a '
+                 'background thread while the current batch is written (default: 0, off)',
         )
         parser.add_argument(
             '--batch-size',
@@ -120,44 +218,170 @@ class Command(BaseCommand):
         if options['company']:
             qs = qs.filter(company__icontains=options['company'])
 
+        # Where to start streaming: --since, else this source's watermark
+        # (unless --full). Only unfiltered-by-date, whole-source runs move
+        # the watermark: a --company or --since run doesn't cover everything
+        # before its last row.
+        scope = watermark_scope(options['source'])
+        persist = not options['company'] and not options['since']
         if options['since']:
-            qs = qs.filter(updated_at__gte=options['since'])
+            since = _dt.datetime.strptime(options['since'], '%Y-%m-%d')
+            after = (since.replace(tzinfo=_dt.timezone.utc), '')
+        elif options['full']:
+            after = None
+        else:
+            after = load_watermark(scope)
+        if after is None:
+            self.stdout.write("Full sync (no watermark)")
+        else:
+            self.stdout.write(f"Syncing rows updated since {after[0]:%Y-%m-%d %H:%M:%S} UTC")
 
         limit = options['limit']
 
-        total = qs.count()
-        self.stdout.write(f"Found {total} active listings in genzjobs")
+        pending = qs.filter(updated_at__isnull=False)
+        if after is not None:
+            pending = pending.filter(updated_at__gte=after[0])
+        total = pending.count()
+        self.stdout.write(f"Found {total} active listings to sync")
 
         if limit:
             self.stdout.write(f"Limiting to {limit} listings")
-            qs = qs[:limit]
             total = min(total, limit)
 
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN - no changes will be made'))
             # Show sample
-            for gj in qs[:10]:
-                self.stdout.write(f"  [{gj.source}] {gj.title} at {gj.company}")
+            for batch in changed_batches(qs, after, batch_size=10):
+                for gj in batch:
+                    self.stdout.write(f"  [{gj.source}] {gj.title} at {gj.company}")
+                break
             if total > 10:
                 self.stdout.write(f"  ... and {total - 10} more")
             return
 
         created = 0
-        updated = 0
+        changed = 0
+        touched = 0
+        unchanged = 0
         errors = 0
         synced_ids = []  # Track ScrapedJobListing IDs touched this run
 
-        # Fetch all IDs first, then process in batches to avoid
-        # server-side cursor timeout on cross-database connections
-        all_ids = list(qs.values_list('id', flat=True))
-        total = len(all_ids)
-        self.stdout.write(f"Fetched {total} IDs, processing in batches of {batch_size}...")
+        # Keyset-paged reads (jobs/genzjobs.py): one short query per batch,
+        # no full id list and no server-side cursor on the cross-database
+        # connection.
+        self.stdout.write(f"Processing in batches of {batch_size}...")
+
+        rescored = 0
+        reposts = 0
+        pinned = False  # watermark held before a failed row
+        self._stale_days = get_config()['stale_penalty']['stale_threshold_days']
+        # One in-memory company index for the whole run
+        self._companies = CompanyResolver()
+
+        batches = -(-total // batch_size)
+        remote = self._remote_batches(qs, after, batch_size, limit)
+        prefetch = options['prefetch']
+        if prefetch:
+            # Pipeline mode: a background thread keeps up to `prefetch`
+            # batches (rows + industry map) queued while this thread writes.
+            remote = Prefetcher(remote, prefetch)
+            self.stdout.write(f"Pipeline mode: prefetching up to {prefetch} batch(es)")
+
+        for number, (batch, industry_map, fetch_seconds) in enumerate(remote, start=1):
+            started = time.monotonic()
+            timings = {'source': fetch_seconds}
+
+            result = self._sync_batch(batch, industry_map, timings)
+            created += len(result['created_ids'])
+            changed += len(result['local_ids']) - len(result['created_ids'])
+            touched += result['touched']
+            unchanged += result['unchanged']
+            errors += result['errors']
+            synced_ids.extend(result['created_ids'])
+
+            # Link new listings, and re-index existing ones whose description
+            # changed, against earlier near-duplicates (jobs/reposts.py).
+            # Relinked existing listings are due for rescore.
+            mark = time.monotonic()
+            links = detect_reposts(result['created_ids'] + result['described_ids'])
+            reposts += len(links)
+            rescored += mark_for_rescore(links)
+            timings['reposts'] = time.monotonic() - mark
+
+            # Refresh the full-text search vectors for this batch in one
+            # UPDATE (no-op off Postgres; see jobs/search.py).
+            mark = time.monotonic()
+            update_search_vectors(ScrapedJobListing.objects.filter(pk__in=result['local_ids']))
+
+            # Existing listings whose scoring inputs changed are due for
+            # `score_listings --incremental` (new ones have no score yet).
+            rescored += mark_for_rescore(result['changed_ids'])
+            timings['index'] = time.monotonic() - mark
+
+            # Everything up to the first row that failed is synced; an
+            # interrupted run resumes here. A failed row pins the mark just
+            # before it for the rest of the run so the next run retries it.
+            if persist and not pinned:
+                failed = set(result['failed_ids'])
+                synced = batch
+                if failed:
+                    pinned = True
+                    synced = batch[:next(i for i, gj in enumerate(batch) if gj.id in failed)]
+                if synced:
+                    save_watermark(scope, synced[-1].updated_at, synced[-1].id)
+
+            processed = created + changed + touched + unchanged + errors
+            self.stdout.write(
+                f"  Batch {number}/{batches}: {processed}/{total} in "
+                f"{time.monotonic() - started + fetch_seconds:.1f}s ("
+                + ', '.join(f'{step} {seconds:.2f}s' for step, seconds in timings.items())
+                + ')'
+            )
 
-        industry_lookup_failed = False
+        if prefetch:
+            # Which side is the bottleneck: the writer waiting on genzjobs,
+            # or the prefetch thread waiting for queue space.
+            self.stdout.write(
+                f"Pipeline: waited {remote.waited:.1f}s for genzjobs batches; "
+                f"prefetch thread waited {remote.stalled:.1f}s for queue space"
+            )
 
-        for i in range(0, total, batch_size):
-            batch_ids = all_ids[i:i + batch_size]
-            batch = GenzjobsListing.objects.filter(id__in=batch_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f"Sync complete: {created} created, {changed} changed, {touched} touched, "
+            f"{unchanged} unchanged, {errors} errors"
+        ))
+        if pinned:
+            self.stdout.write(self.style.WARNING(
+                "Watermark held before the first failed listing; the next run retries from there"
+            ))
+        self.stdout.write(f"Marked {rescored} existing score(s) for rescore")
+        self.stdout.write(f"Relinked {reposts} new or edited listing(s) to earlier postings")
+
+        # Optionally score — only newly created listings
+        if score_after and synced_ids:
+            self.stdout.write(f"{len(synced_ids)} new listings to score")
+            self._score_synced(synced_ids)
+
+        # New data: retire cached anonymous /jobs/ pages. Frequent
+        # incremental runs often write nothing; keep the cache then.
+        if created or changed:
+            bump_generation()
+            refresh_home_stats(LISTING_STATS)
+
+    def _remote_batches(self, qs, after, batch_size, limit):
+        """
+        Yield (batch, industry_map, seconds) for the genzjobs rows past
+        `after`: each keyset-paged batch of listings, its industry tags and
+        the time both reads took. Everything read from genzjobs during a sync
+        comes through here, so it can run in the prefetch thread.
+        """
+        industry_lookup_failed = False
+        streamed = 0
+        started = time.monotonic()
+        for batch in changed_batches(qs, after, batch_size):
+            if limit:
+                batch = batch[:limit - streamed]
+            streamed += len(batch)
 
             # Fetch industry_category for this batch via a single join against
             # genzjobs.company_ats. Tolerant of missing columns so this works
@@ -166,42 +390,16 @@ class Command(BaseCommand):
             industry_map = {}
             if not industry_lookup_failed:
                 try:
-                    industry_map = self._fetch_industry_map(batch_ids)
+                    industry_map = self._fetch_industry_map([gj.id for gj in batch])
                 except Exception as e:
                     industry_lookup_failed = True
                     self.stderr.write(self.style.WARNING(
                         f"Industry lookup unavailable ({e}); listings will sync without industry tag"
                     ))
-
-            for gj in batch:
-                try:
-                    was_created, local_id = self._sync_listing(gj, industry_map=industry_map)
-                    if was_created:
-                        created += 1
-                    else:
-                        updated += 1
-                    if was_created:
-                        synced_ids.append(local_id)
-                except Exception as e:
-                    errors += 1
-                    self.stderr.write(self.style.ERROR(
-                        f"Error syncing {gj.id} ({gj.title}): {e}"
-                    ))
-
-            processed = created + updated + errors
-            self.stdout.write(f"  Progress: {processed}/{total}")
-
-        self.stdout.write(self.style.SUCCESS(
-            f"Sync complete: {created} created, {updated} updated, {errors} errors"
-        ))
-
-        # Detect stale/closed listings (reuse already-fetched IDs)
-        self._detect_closed(all_ids)
-
-        # Optionally score — only newly created listings
-        if score_after and synced_ids:
-            self.stdout.write(f"{len(synced_ids)} new listings to score")
-            self._score_synced(synced_ids)
+            yield batch, industry_map, time.monotonic() - started
+            if limit and streamed >= limit:
+                return
+            started = time.monotonic()
 
     def _fetch_industry_map(self, genzjobs_ids):
         """
@@ -222,19 +420,184 @@ class Command(BaseCommand):
             cur.execute(sql, [list(genzjobs_ids)])
             return {row[0]: row[1] for row in cur.fetchall()}
 
-    def _sync_listing(self, gj, industry_map=None):
+    def _sync_batch(self, batch, industry_map, timings):
         """
-        Sync a single genzjobs listing to local ScrapedJobListing.
-        Returns (was_created, local_id) tuple.
+        Sync a batch of GenzjobsListing rows set-based. Rows whose
+        fingerprint still matches are at most touched (one UPDATE); the rest
+        are loaded (one query), their companies resolved together and written
+        with one upsert.
+
+        Returns {'created_ids', 'local_ids', 'changed_ids', 'described_ids',
+        'touched', 'unchanged', 'errors', 'failed_ids'}: local_ids are the
+        rows written, changed_ids existing listings whose HAS inputs changed
+        (including stale ones the touch revives), described_ids existing
+        listings whose description changed, failed_ids the genzjobs ids that
+        could not be synced. Adds 'locals', 'touch', 'companies' and 'write' to
+        `timings`.
         """
+        mark = time.monotonic()
         now = timezone.now()
-
-        # Map source
-        source_ats = SOURCE_MAP.get(
-            (gj.source or '').lower(),
-            'other'
+        seen = {
+            row['genzjobs_id']: row
+            for row in ScrapedJobListing.objects.filter(
+                genzjobs_id__in=[gj.id for gj in batch],
+            ).values('pk', 'genzjobs_id', 'sync_fingerprint', 'status', 'date_last_seen')
+        }
+        fingerprints = {}
+        to_write, touch, revived = [], [], []
+        unchanged = 0
+        for gj in batch:
+            fingerprints[gj.id] = source_fingerprint(gj, (industry_map or {}).get(gj.id))
+            row = seen.get(gj.id)
+            if (
+                row is None
+                or row['sync_fingerprint'] != fingerprints[gj.id]
+                or row['status'] != 'active'
+                or row['date_last_seen'] is None
+            ):
+                to_write.append(gj)
+            elif now - row['date_last_seen'] >= TOUCH_AFTER:
+                touch.append(row['pk'])
+                if (now - row['date_last_seen']).days >= self._stale_days:
+                    revived.append(row['pk'])  # the touch lifts its stale penalty
+            else:
+                unchanged += 1
+        reload_ids = [gj.id for gj in to_write if gj.id in seen]
+        existing = {
+            local.genzjobs_id: local
+            for local in ScrapedJobListing.objects.filter(genzjobs_id__in=reload_ids)
+        } if reload_ids else {}
+        timings['locals'] = time.monotonic() - mark
+
+        mark = time.monotonic()
+        if touch:
+            ScrapedJobListing.objects.filter(pk__in=touch).update(date_last_seen=now)
+        timings['touch'] = time.monotonic() - mark
+        skipped = {'touched': len(touch), 'unchanged': unchanged}
+
+        rows = []  # (gj, local, before-signature or None if new)
+        failed_ids = []
+        described = set()
+        for gj in to_write:
+            local = existing.get(gj.id)
+            before = None
+            if local is None:
+                local = ScrapedJobListing(genzjobs_id=gj.id)
+            else:
+                before = scoring_signature(local, self._stale_days)
+                description = local.description
+            try:
+                self._apply_listing(
+                    local, gj, before is None, industry_map, now,
+                    fingerprint=fingerprints[gj.id],
+                )
+            except Exception as e:
+                failed_ids.append(gj.id)
+                self.stderr.write(self.style.ERROR(
+                    f"Error syncing {gj.id} ({gj.title}): {e}"
+                ))
+                continue
+            if before is not None and local.description != description:
+                described.add(gj.id)
+            rows.append((gj, local, before))
+
+        mark = time.monotonic()
+        company_ids = self._companies.resolve_many(
+            {local.company_name for _gj, local, _before in rows if local.company_name}
         )
+        timings['companies'] = time.monotonic() - mark
+
+        mark = time.monotonic()
+        fingerprint_listings([local for _gj, local, _before in rows])
+        timings['fingerprints'] = time.monotonic() - mark
+
+        mark = time.monotonic()
+        changed = set()
+        for gj, local, before in rows:
+            if local.company_name:
+                local.company_id = company_ids[local.company_name]
+            local.refresh_derived_fields()
+            # Compare before the write: the insert half of the upsert stamps
+            # date_first_seen (auto_now_add) on the in-memory objects.
+            if before is not None and scoring_signature(local, self._stale_days) != before:
+                changed.add(gj.id)
+        try:
+            ScrapedJobListing.objects.bulk_create(
+                [local for _gj, local, _before in rows],
+                update_conflicts=True,
+                unique_fields=['genzjobs_id'],
+                update_fields=UPSERT_FIELDS,
+            )
+        except Exception as e:
+            self.stderr.write(self.style.WARNING(
+                f"Batch write failed ({e}); retrying row by row"
+            ))
+            result = self._sync_rows([gj for gj, _local, _before in rows], industry_map)
+            result['errors'] += len(failed_ids)
+            result['failed_ids'].extend(failed_ids)
+            result['changed_ids'].extend(revived)
+            result.update(skipped)
+            timings['write'] = time.monotonic() - mark
+            return result
+
+        # New rows get their pk back from RETURNING where the backend has it.
+        missing = [local.genzjobs_id for _gj, local, _before in rows if local.pk is None]
+        if missing:
+            pks = dict(
+                ScrapedJobListing.objects.filter(genzjobs_id__in=missing)
+                .values_list('genzjobs_id', 'pk')
+            )
+            for _gj, local, _before in rows:
+                if local.pk is None:
+                    local.pk = pks[local.genzjobs_id]
+        timings['write'] = time.monotonic() - mark
+
+        return {
+            'created_ids': [local.pk for _gj, local, before in rows if before is None],
+            'local_ids': [local.pk for _gj, local, _before in rows],
+            'changed_ids': [
+                local.pk for gj, local, _before in rows if gj.id in changed
+            ] + revived,
+            'described_ids': [local.pk for gj, local, _before in rows if gj.id in described],
+            'errors': len(failed_ids),
+            'failed_ids': failed_ids,
+            **skipped,
+        }
+
+    def _sync_rows(self, batch, industry_map):
+        """Row-by-row fallback for _sync_batch(); same return shape."""
+        result = {
+            'created_ids': [], 'local_ids': [], 'changed_ids': [], 'described_ids': [],
+            'touched': 0, 'unchanged': 0, 'errors': 0, 'failed_ids': [],
+        }
+        for gj in batch:
+            try:
+                was_created, local_id, scoring_changed, described = self._sync_listing(
+                    gj, industry_map=industry_map,
+                )
+            except Exception as e:
+                result['errors'] += 1
+                result['failed_ids'].append(gj.id)
+                self.stderr.write(self.style.ERROR(
+                    f"Error syncing {gj.id} ({gj.title}): {e}"
+                ))
+                continue
+            result['local_ids'].append(local_id)
+            if was_created:
+                result['created_ids'].append(local_id)
+            if scoring_changed:
+                result['changed_ids'].append(local_id)
+            if described:
+                result['described_ids'].append(local_id)
+        return result
 
+    def _sync_listing(self, gj, industry_map=None):
+        """
+        Sync a single genzjobs listing to local ScrapedJobListing.
+        Returns (was_created, local_id, scoring_changed, described) tuple;
+        scoring_changed is True for an existing listing whose HAS inputs
+        changed, described for one whose description changed.
+        """
         # Find or create local tracker
         try:
             local = ScrapedJobListing.objects.get(genzjobs_id=gj.id)
@@ -242,6 +605,30 @@ class Command(BaseCommand):
         except ScrapedJobListing.DoesNotExist:
             local = ScrapedJobListing(genzjobs_id=gj.id)
             was_created = True
+        before = None if was_created else scoring_signature(local, self._stale_days)
+        description = local.description
+
+        self._apply_listing(local, gj, was_created, industry_map, timezone.now())
+
+        # Find or create Company
+        if local.company_name:
+            company, _ = Company.find_or_create(local.company_name, resolver=self._companies)
+            local.company = company
+
+        local.save()
+        scoring_changed = (
+            before is not None and scoring_signature(local, self._stale_days) != before
+        )
+        described = not was_created and local.description != description
+        return was_created, local.pk, scoring_changed, described
+
+    def _apply_listing(self, local, gj, was_created, industry_map, now, fingerprint=None):
+        """Copy a genzjobs listing's fields onto `local` (SYNCED_FIELDS but company)."""
+        # Map source
+        source_ats = SOURCE_MAP.get(
+            (gj.source or '').lower(),
+            'other'
+        )
 
         # Cache display fields
         local.title = (gj.title or '')[:300]
@@ -274,6 +661,9 @@ class Command(BaseCommand):
         local.job_type = (gj.job_type or '')[:50]
         local.experience_level = (gj.experience_level or '')[:50]
         local.remote_status = 'remote' if gj.remote else ''
+        # country_code/region_code/city/is_remote are parsed from location +
+        # remote_status by ScrapedJobListing.refresh_derived_fields()
+        # (jobs/locations.py).
         local.job_category = self._map_category(gj.category)
 
         # Scoring-relevant enrichment fields
@@ -313,11 +703,6 @@ class Command(BaseCommand):
         # Status
         local.status = 'active'
 
-        # Find or create Company
-        if local.company_name:
-            company, _ = Company.find_or_create(local.company_name)
-            local.company = company
-
         # Store genzjobs rich data in raw_data for template use
         raw = {}
         if gj.requirements:
@@ -335,8 +720,9 @@ class Command(BaseCommand):
             raw['audience_tags'] = audience_tags
         local.raw_data = raw
 
-        local.save()
-        return was_created, local.pk
+        local.sync_fingerprint = fingerprint or source_fingerprint(
+            gj, local.industry_category,
+        )
 
     def _parse_pg_array(self, value):
         """Parse a PostgreSQL text[] array into a Python list."""
@@ -392,50 +778,6 @@ class Command(BaseCommand):
                 return value
         return 'other'
 
-    def _detect_closed(self, active_ids):
-        """Mark local listings as closed if they're no longer active in genzjobs."""
-        active_genzjobs_ids = set(active_ids)
-
-        # Process local active listings in batches to avoid huge exclude() query
-        local_active = ScrapedJobListing.objects.filter(
-            genzjobs_id__isnull=False,
-            status='active',
-        ).values_list('pk', 'genzjobs_id')
-
-        # Find candidates not in active set
-        candidates = []
-        for pk, genzjobs_id in local_active.iterator():
-            if genzjobs_id not in active_genzjobs_ids:
-                candidates.append(pk)
-
-        if not candidates:
-            return
-
-        self.stdout.write(f"Checking {len(candidates)} potentially closed listings...")
-
-        # Verify and close in batches
-        closed_count = 0
-        batch_size = 500
-        now = timezone.now()
-        for i in range(0, len(candidates), batch_size):
-            batch_pks = candidates[i:i + batch_size]
-            for local in ScrapedJobListing.objects.filter(pk__in=batch_pks).iterator():
-                try:
-                    gj = GenzjobsListing.objects.get(id=local.genzjobs_id)
-                    if not gj.is_active:
-                        local.status = 'closed'
-                        local.date_removed = now
-                        local.save(update_fields=['status', 'date_removed'])
-                        closed_count += 1
-                except GenzjobsListing.DoesNotExist:
-                    local.status = 'closed'
-                    local.date_removed = now
-                    local.save(update_fields=['status', 'date_removed'])
-                    closed_count += 1
-
-        if closed_count:
-            self.stdout.write(f"Marked {closed_count} listings as closed")
-
     def _score_synced(self, synced_ids):
         """Run HAS scoring on listings touched during this sync run."""
         from jobs.scoring.engine import HASEngine
@@ -447,84 +789,80 @@ class Command(BaseCommand):
         self.stdout.write(f"Scoring {total} synced listings...")
 
         scored = 0
-        # Process in batches to keep memory usage low
+        # Process in batches to keep memory usage low; each batch is scored
+        # column-wise and written with one upsert + one reconciling UPDATE.
         for i in range(0, total, batch_size):
             batch_ids = synced_ids[i:i + batch_size]
             batch_qs = ScrapedJobListing.objects.filter(
                 pk__in=batch_ids,
                 status='active',
-            )
-            for listing in batch_qs.iterator():
-                engine.score_listing(listing, save=True)
-                scored += 1
-                if scored % 100 == 0:
-                    self.stdout.write(f"  Scored {scored}/{total}")
+            ).select_related('company')
+            scored += engine.save_batch(engine.score_batch(batch_qs))
+            self.stdout.write(f"  Scored {scored}/{total}")
 
         self.stdout.write(self.style.SUCCESS(f"Scored {scored} listings"))
 
     def _write_back(self, dry_run):
-        """Write RJRP verification status back to genzjobs database."""
-        # Find all local listings with genzjobs_id that have scores
-        published = ScrapedJobListing.objects.filter(
-            genzjobs_id__isnull=False,
-            published_to_board=True,
-        )
+        """
+        Write RJRP verification status back to genzjobs database.
 
-        unpublished = ScrapedJobListing.objects.filter(
+        Chunked: local rows are keyset-paged on pk (one chunk in memory at a
+        time), then one remote read of the current flags per chunk and one
+        UPDATE ... FROM (VALUES ...) carrying only the rows that differ.
+        """
+        local = ScrapedJobListing.objects.filter(
             genzjobs_id__isnull=False,
-            published_to_board=False,
-        )
+        ).order_by('pk')
 
-        pub_count = published.count()
-        unpub_count = unpublished.count()
+        pub_count = local.filter(published_to_board=True).count()
+        unpub_count = local.filter(published_to_board=False).count()
 
         self.stdout.write(
             f"Write-back: {pub_count} verified, {unpub_count} unverified"
         )
 
-        if dry_run:
-            self.stdout.write(self.style.WARNING('DRY RUN - no changes will be made'))
-            return
-
         written = 0
+        pending = 0
+        missing = 0
         errors = 0
 
-        # Write verified status
-        for local in published.iterator():
+        last_pk = None
+        while True:
+            page = local if last_pk is None else local.filter(pk__gt=last_pk)
+            page = list(page.values_list(
+                'pk', 'genzjobs_id', 'published_to_board', 'claimed_job__posted_by_id',
+            )[:CHUNK_SIZE])
+            if not page:
+                break
+            last_pk = page[-1][0]
+            chunk = [row[1:] for row in page]
             try:
-                gj = GenzjobsListing.objects.get(id=local.genzjobs_id)
-                changed = False
-                if not gj.is_rjrp_verified:
-                    gj.is_rjrp_verified = True
-                    changed = True
-                # Write employer ID if listing is claimed
-                if local.claimed_job and local.claimed_job.posted_by_id:
-                    employer_id_str = str(local.claimed_job.posted_by_id)
-                    if gj.rjrp_employer_id != employer_id_str:
-                        gj.rjrp_employer_id = employer_id_str
-                        changed = True
-                if changed:
-                    gj.save(update_fields=['is_rjrp_verified', 'rjrp_employer_id'])
-                    written += 1
-            except GenzjobsListing.DoesNotExist:
-                errors += 1
+                remote = {
+                    gj_id: (verified, employer_id)
+                    for gj_id, verified, employer_id in GenzjobsListing.objects.filter(
+                        id__in=[row[0] for row in chunk],
+                    ).values_list('id', 'is_rjrp_verified', 'rjrp_employer_id')
+                }
+                updates, gone = verification_updates(chunk, remote)
+                missing += len(gone)
+                pending += len(updates)
+                if not dry_run:
+                    written += push_verification(updates)
             except Exception as e:
                 errors += 1
-                self.stderr.write(self.style.ERROR(f"Write-back error {local.genzjobs_id}: {e}"))
+                self.stderr.write(self.style.ERROR(
+                    f"Write-back error in chunk at {chunk[0][0]}: {e}"
+                ))
+            if len(page) < CHUNK_SIZE:
+                break
 
-        # Clear verification for unpublished
-        for local in unpublished.iterator():
-            try:
-                gj = GenzjobsListing.objects.get(id=local.genzjobs_id)
-                if gj.is_rjrp_verified:
-                    gj.is_rjrp_verified = False
-                    gj.save(update_fields=['is_rjrp_verified'])
-                    written += 1
-            except GenzjobsListing.DoesNotExist:
-                pass
-            except Exception as e:
-                errors += 1
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f"DRY RUN - {pending} listing(s) would be updated, no changes made"
+            ))
+            return
 
         self.stdout.write(self.style.SUCCESS(
-            f"Write-back complete: {written} updated, {errors} errors"
+            f"Write-back complete: {written} updated, {missing} missing in genzjobs, "
+            f"{errors} failed chunk(s)"
         ))
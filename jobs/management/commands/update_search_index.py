@@ -0,0 +1,89 @@
+"""
+Management command to (re)build the full-text search vectors on scraped listings.
+
+sync_genzjobs keeps search_vector current for every listing it touches; this
+command backfills rows written by other paths (admin edits, imports) and
+rebuilds everything after a change to the indexed fields or weights in
+jobs/search.py. Postgres only — SQLite has no tsvector.
+
+--candidates rebuilds the candidate search columns of every UserProfile
+instead (jobs/candidates.py): contact_verified, and the tsvector on Postgres.
+The profile and verification signals keep them current; this repairs rows
+written with signals bypassed (bulk imports, raw SQL).
+
+Usage:
+    python manage.py update_search_index              # Rows with no vector yet
+    python manage.py update_search_index --all        # Rebuild every row
+    python manage.py update_search_index --batch-size 1000
+    python manage.py update_search_index --candidates # Rebuild candidate profiles
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from jobs.candidates import refresh_candidates
+from jobs.models import ScrapedJobListing, UserProfile
+from jobs.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Build full-text search vectors for scraped job listings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild every listing, not only those missing a vector',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Listings per UPDATE (default: 2000)',
+        )
+        parser.add_argument(
+            '--candidates',
+            action='store_true',
+            help='Rebuild the candidate search columns of every user profile',
+        )
+
+    def handle(self, *args, **options):
+        if options['candidates']:
+            self._index_candidates(options['batch_size'])
+            return
+
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                'Full-text search vectors are Postgres-only; nothing to do.'
+            ))
+            return
+
+        listings = ScrapedJobListing.objects.all()
+        if not options['all']:
+            listings = listings.filter(search_vector__isnull=True)
+        pks = list(listings.order_by('pk').values_list('pk', flat=True))
+
+        batch_size = options['batch_size']
+        total = len(pks)
+        self.stdout.write(f'{total} listing(s) to index, in batches of {batch_size}...')
+
+        written = 0
+        for i in range(0, total, batch_size):
+            written += update_search_vectors(
+                ScrapedJobListing.objects.filter(pk__in=pks[i:i + batch_size])
+            )
+            self.stdout.write(f'  Progress: {written}/{total}')
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {written} listing(s).'))
+
+    def _index_candidates(self, batch_size):
+        pks = list(UserProfile.objects.order_by('pk').values_list('pk', flat=True))
+        total = len(pks)
+        self.stdout.write(f'{total} profile(s) to index, in batches of {batch_size}...')
+
+        written = 0
+        for i in range(0, total, batch_size):
+            written += refresh_candidates(UserProfile.objects.filter(pk__in=pks[i:i + batch_size]))
+            self.stdout.write(f'  Progress: {written}/{total}')
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {written} candidate profile(s).'))
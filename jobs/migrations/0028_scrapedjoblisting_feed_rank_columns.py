@@ -0,0 +1,99 @@
+"""
+Persist the /jobs/ feed sort keys on jobs_scrapedjoblisting.
+
+The observed tier of the unified feed was ordered by expressions evaluated per
+request: Coalesce(date_posted_external, date_first_seen) for "newest", a join
+to jobs_hiringactivityscore for "activity", and a blend of both plus an
+epoch-seconds age calculation for "relevant". None of those can be served by
+an index, so every page request computed the key for all ~21-22k published
+listings and sorted them just to return 25.
+
+feed_posted_at / feed_activity / feed_relevance hold those keys as plain
+columns (indexed in 0029). They're maintained by ScrapedJobListing.save(),
+HiringActivityScore.save() (the daily rescore) and the periodic
+`refresh_feed_ranks` command, which re-ages the freshness bonus.
+
+The backfill below is two set-based UPDATEs — no per-row Python. Its
+expressions are frozen copies of jobs/feed.py's as of this migration (the
+relevance blend: 0.5 * HAS + up to 30 freshness points over 30 days), so it
+doesn't change if that module does.
+"""
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import FloatField, Func, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.utils import timezone
+
+
+class EpochSeconds(Func):
+    """Seconds since the Unix epoch for a datetime expression, as a float."""
+    output_field = FloatField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return self.as_sqlite(compiler, connection, **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template='EXTRACT(EPOCH FROM %(expressions)s)::double precision',
+            **extra_context,
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template="((julianday(%(expressions)s) - 2440587.5) * 86400.0)",
+            **extra_context,
+        )
+
+
+def backfill_feed_ranks(apps, schema_editor):
+    ScrapedJobListing = apps.get_model('jobs', 'ScrapedJobListing')
+    HiringActivityScore = apps.get_model('jobs', 'HiringActivityScore')
+
+    ScrapedJobListing.objects.update(
+        feed_posted_at=Coalesce('date_posted_external', 'date_first_seen'),
+        feed_activity=Coalesce(
+            Subquery(
+                HiringActivityScore.objects.filter(listing=OuterRef('pk')).values('total_score')[:1]
+            ),
+            0,
+        ),
+    )
+    # Second statement: SET sees the old feed_posted_at / feed_activity.
+    age_days = (Value(timezone.now().timestamp()) - EpochSeconds('feed_posted_at')) / Value(86400.0)
+    ScrapedJobListing.objects.update(feed_relevance=(
+        Value(0.5) * Cast('feed_activity', FloatField())
+        + Greatest(Value(0.0), Value(30.0) - age_days, output_field=FloatField())
+    ))
+
+
+def noop(apps, schema_editor):
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0027_backfill_missing_userprofiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedjoblisting',
+            name='feed_activity',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scrapedjoblisting',
+            name='feed_posted_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='scrapedjoblisting',
+            name='feed_relevance',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(backfill_feed_ranks, noop),
+    ]
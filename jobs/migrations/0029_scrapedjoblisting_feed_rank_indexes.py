@@ -0,0 +1,58 @@
+"""
+Partial indexes backing the /jobs/ feed sort modes.
+
+The feed's observed tier is always filtered to published_to_board = true AND
+status IN ('active', 'published') and ordered by one rank column DESC with id
+DESC as the keyset tiebreak (jobs/feed.py). A partial index over exactly that
+predicate lets Postgres walk the index in feed order and stop after LIMIT 26,
+for the first page and for every keyset page after it (the cursor becomes an
+index range condition). A (published_to_board, status) prefix would not work:
+the IN list on status breaks the index ordering.
+
+Notes:
+- atomic = False + CREATE INDEX CONCURRENTLY: avoids locking the live table
+  during deploy (same reasoning as 0024-0026).
+- Guarded on connection.vendor: no-op on SQLite dev/test.
+- Not declared in model Meta (consistent with 0024/0026) — pure performance
+  indexes managed here via RunPython.
+"""
+
+from django.db import migrations
+
+
+FEED_PREDICATE = "published_to_board AND status IN ('active', 'published')"
+
+INDEXES = {
+    "jobs_sjl_feed_relevance_idx": "feed_relevance DESC, id DESC",
+    "jobs_sjl_feed_activity_idx": "feed_activity DESC, id DESC",
+    "jobs_sjl_feed_posted_idx": "feed_posted_at DESC, id DESC",
+}
+
+
+def create_feed_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, columns in INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f"ON jobs_scrapedjoblisting ({columns}) WHERE {FEED_PREDICATE}"
+        )
+
+
+def drop_feed_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0028_scrapedjoblisting_feed_rank_columns"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_feed_indexes, drop_feed_indexes),
+    ]
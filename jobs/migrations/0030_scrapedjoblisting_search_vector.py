@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:50
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0029_scrapedjoblisting_feed_rank_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedjoblisting',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+    ]
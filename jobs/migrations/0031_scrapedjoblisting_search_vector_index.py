@@ -0,0 +1,78 @@
+"""
+GIN index on jobs_scrapedjoblisting.search_vector, and the initial backfill.
+
+Restores description search on /jobs/ without the seq scan that got it
+removed (see 0024: `description ILIKE` took ~20.8s; a trigram GIN on the raw
+description grew past 120 MB and took 20+ min to build). A tsvector is far
+more compact than trigrams — one lexeme per distinct stemmed word, and only
+the first 20k characters of each description (jobs/search.py) — so the index
+stays small and the match is a single GIN lookup whatever the query.
+
+The backfill writes vectors in pk batches so each UPDATE commits on its own
+(atomic = False) instead of holding row locks on all ~67k listings for the
+length of the deploy. Rows that arrive later are covered by sync_genzjobs and
+`manage.py update_search_index`. The vector expression is a frozen copy of
+jobs/search.py's listing_search_vector() as of this migration.
+
+Notes:
+- atomic = False + CREATE INDEX CONCURRENTLY: avoids locking the live table
+  during deploy (same reasoning as 0024-0026).
+- Guarded on connection.vendor: no-op on SQLite dev/test.
+- Not declared in model Meta (consistent with 0024/0026) — pure performance
+  index managed here via RunPython.
+"""
+
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.functions import Left
+
+
+INDEX_NAME = "jobs_sjl_search_vector_gin"
+BACKFILL_BATCH = 2000
+
+
+def listing_search_vector():
+    return (
+        SearchVector("title", weight="A", config="english")
+        + SearchVector("company_name", weight="B", config="english")
+        + SearchVector("location", weight="C", config="english")
+        + SearchVector(Left("description", 20000), weight="D", config="english")
+    )
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    ScrapedJobListing = apps.get_model("jobs", "ScrapedJobListing")
+    pks = list(
+        ScrapedJobListing.objects.filter(search_vector__isnull=True)
+        .order_by("pk").values_list("pk", flat=True)
+    )
+    for i in range(0, len(pks), BACKFILL_BATCH):
+        ScrapedJobListing.objects.filter(pk__in=pks[i:i + BACKFILL_BATCH]).update(
+            search_vector=listing_search_vector()
+        )
+
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+        f"ON jobs_scrapedjoblisting USING gin (search_vector)"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0030_scrapedjoblisting_search_vector"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,205 @@
+"""
+Normalized location columns on Job and ScrapedJobListing, backfilled.
+
+The default /jobs/ filter (country=us) was a ~102-term OR chain of
+endswith/icontains over `location` for the 50 states + DC, evaluated per
+request for both the feed and the cached facet counts. None of it could use
+an index. country_code/region_code/city/is_remote are now parsed once per
+row write (jobs/locations.py) and country_code is btree-indexed, so the
+filter is `country_code = 'US'`.
+
+The backfill runs here rather than as a post-deploy step because the new
+view code filters on country_code immediately; unparsed rows would drop out
+of the default feed until it ran. It only writes rows whose parse differs
+from the defaults, via bulk_update in batches of 1000.
+
+The parser below is a frozen copy of jobs/locations.py's parse_location() as
+of this migration, so the backfill doesn't change if that module does.
+"""
+
+import re
+from functools import lru_cache
+
+from django.db import migrations, models
+
+
+US_STATES = {
+    'AL': 'alabama', 'AK': 'alaska', 'AZ': 'arizona', 'AR': 'arkansas',
+    'CA': 'california', 'CO': 'colorado', 'CT': 'connecticut', 'DE': 'delaware',
+    'FL': 'florida', 'GA': 'georgia', 'HI': 'hawaii', 'ID': 'idaho',
+    'IL': 'illinois', 'IN': 'indiana', 'IA': 'iowa', 'KS': 'kansas',
+    'KY': 'kentucky', 'LA': 'louisiana', 'ME': 'maine', 'MD': 'maryland',
+    'MA': 'massachusetts', 'MI': 'michigan', 'MN': 'minnesota', 'MS': 'mississippi',
+    'MO': 'missouri', 'MT': 'montana', 'NE': 'nebraska', 'NV': 'nevada',
+    'NH': 'new hampshire', 'NJ': 'new jersey', 'NM': 'new mexico', 'NY': 'new york',
+    'NC': 'north carolina', 'ND': 'north dakota', 'OH': 'ohio', 'OK': 'oklahoma',
+    'OR': 'oregon', 'PA': 'pennsylvania', 'RI': 'rhode island', 'SC': 'south carolina',
+    'SD': 'south dakota', 'TN': 'tennessee', 'TX': 'texas', 'UT': 'utah',
+    'VT': 'vermont', 'VA': 'virginia', 'WA': 'washington', 'WV': 'west virginia',
+    'WI': 'wisconsin', 'WY': 'wyoming', 'DC': 'district of columbia',
+}
+_US_STATE_NAMES = {name: code for code, name in US_STATES.items()}
+
+CA_PROVINCES = {
+    'AB', 'BC', 'MB', 'NB', 'NL', 'NS', 'NT', 'NU', 'ON', 'PE', 'QC', 'SK', 'YT',
+}
+
+# Lower-cased country spellings seen in feeds -> ISO 3166-1 alpha-2.
+COUNTRIES = {
+    'united states': 'US', 'united states of america': 'US', 'usa': 'US', 'us': 'US',
+    'u.s.': 'US', 'u.s.a.': 'US',
+    'canada': 'CA',
+    'united kingdom': 'GB', 'uk': 'GB', 'england': 'GB', 'scotland': 'GB',
+    'ireland': 'IE', 'germany': 'DE', 'deutschland': 'DE', 'france': 'FR',
+    'spain': 'ES', 'portugal': 'PT', 'netherlands': 'NL', 'belgium': 'BE',
+    'switzerland': 'CH', 'austria': 'AT', 'italy': 'IT', 'poland': 'PL',
+    'sweden': 'SE', 'norway': 'NO', 'denmark': 'DK', 'finland': 'FI',
+    'india': 'IN', 'singapore': 'SG', 'japan': 'JP', 'australia': 'AU',
+    'new zealand': 'NZ', 'mexico': 'MX', 'brazil': 'BR', 'israel': 'IL',
+    'philippines': 'PH',
+}
+
+# Segment separators: commas, and the " - " / " | " / "/" feeds use between
+# "Remote" and the country ("Remote - US").
+_SPLIT_RE = re.compile(r'\s*(?:,|;|\||\s-\s|/|\(|\))\s*')
+_ZIP_RE = re.compile(r'^([A-Za-z]{2})\s+\d{5}(?:-\d{4})?$')
+_REMOTE_RE = re.compile(r'\bremote\b|\banywhere\b|work from home|\bwfh\b', re.I)
+_NOT_CITY_RE = re.compile(r'^(remote|anywhere|hybrid|on-?site|multiple locations?|various)$', re.I)
+
+
+@lru_cache(maxsize=4096)
+def parse_location(location, remote=False):
+    """
+    Parse a free-text location into (country_code, region_code, city, is_remote).
+
+    Missing parts are '' (and is_remote False). `remote` lets the caller
+    fold in a structured remote flag the feed carried separately.
+    """
+    text = (location or '').strip()
+    is_remote = bool(remote) or bool(_REMOTE_RE.search(text))
+    if not text:
+        return '', '', '', is_remote
+
+    segments = [seg.strip(' .') for seg in _SPLIT_RE.split(text)]
+    segments = [seg for seg in segments if seg]
+
+    country = ''
+    region = ''
+    city = ''
+    for index, segment in enumerate(segments):
+        lowered = segment.lower()
+        zip_match = _ZIP_RE.match(segment)
+        code = (zip_match.group(1) if zip_match else segment).upper()
+
+        # Two-letter codes after the first segment: province/state, or the
+        # country code. "CA" is California unless a province came first.
+        if index > 0 and len(code) == 2:
+            if code in CA_PROVINCES and not region:
+                region, country = code, 'CA'
+                continue
+            if code == 'CA' and region in CA_PROVINCES:
+                continue
+            if code in US_STATES and not region:
+                region = code
+                continue
+            if code == 'US':
+                country = 'US'
+                continue
+        if lowered in COUNTRIES:
+            country = country or COUNTRIES[lowered]
+            continue
+        if lowered in _US_STATE_NAMES and not region and (index > 0 or len(segments) == 1):
+            region = _US_STATE_NAMES[lowered]
+            continue
+        if not city and not _NOT_CITY_RE.match(segment) and not _REMOTE_RE.fullmatch(segment):
+            city = segment[:100]
+
+    if region in US_STATES:
+        if country in ('', 'US'):
+            country = 'US'
+        else:
+            region = ''
+    elif region and country != 'CA':
+        region = ''
+
+    return country, region, city, is_remote
+
+
+LOCATION_FIELDS = ['country_code', 'region_code', 'city', 'is_remote']
+
+
+def backfill_locations(model, batch_size=1000):
+    pending = []
+    rows = model.objects.only('pk', 'location', 'remote_status', *LOCATION_FIELDS).order_by('pk')
+    for obj in rows.iterator(chunk_size=batch_size):
+        remote = (obj.remote_status or '').strip().lower() == 'remote'
+        parsed = dict(zip(LOCATION_FIELDS, parse_location(obj.location or '', remote)))
+        if any(getattr(obj, field) != value for field, value in parsed.items()):
+            for field, value in parsed.items():
+                setattr(obj, field, value)
+            pending.append(obj)
+        if len(pending) >= batch_size:
+            model.objects.bulk_update(pending, LOCATION_FIELDS)
+            pending = []
+    if pending:
+        model.objects.bulk_update(pending, LOCATION_FIELDS)
+
+
+def backfill(apps, schema_editor):
+    backfill_locations(apps.get_model('jobs', 'Job'))
+    backfill_locations(apps.get_model('jobs', 'ScrapedJobListing'))
+
+
+def noop(apps, schema_editor):
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0031_scrapedjoblisting_search_vector_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='city',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='country_code',
+            field=models.CharField(blank=True, db_index=True, max_length=2),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='is_remote',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='region_code',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='scrapedjoblisting',
+            name='city',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='scrapedjoblisting',
+            name='country_code',
+            field=models.CharField(blank=True, db_index=True, max_length=2),
+        ),
+        migrations.AddField(
+            model_name='scrapedjoblisting',
+            name='is_remote',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='scrapedjoblisting',
+            name='region_code',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.RunPython(backfill, noop),
+    ]
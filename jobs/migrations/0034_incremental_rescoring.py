@@ -0,0 +1,52 @@
+"""
+Change tracking for incremental HAS rescoring.
+
+HiringActivityScore.rescore_at records when each score next needs
+recomputing, and CompanySignalState holds the company-level inputs each
+score was last computed from (see jobs/scoring/incremental.py).
+
+Existing scores carry no prediction yet, so they're all marked due now: the
+first `score_listings --incremental` run is a full rescore and writes real
+rescore_at values from then on. One set-based UPDATE.
+"""
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_all_due(apps, schema_editor):
+    HiringActivityScore = apps.get_model('jobs', 'HiringActivityScore')
+    HiringActivityScore.objects.update(rescore_at=timezone.now())
+
+
+def noop(apps, schema_editor):
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0033_cachegeneration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanySignalState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=300, unique=True)),
+                ('signature', models.CharField(max_length=200)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Company Signal State',
+                'verbose_name_plural': 'Company Signal States',
+            },
+        ),
+        migrations.AddField(
+            model_name='hiringactivityscore',
+            name='rescore_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(mark_all_due, noop),
+    ]
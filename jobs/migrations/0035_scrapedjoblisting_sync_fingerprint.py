@@ -0,0 +1,24 @@
+"""
+Source fingerprint for sync_genzjobs change detection.
+
+Rows start with an empty fingerprint, which never matches, so the first sync
+after this migration rewrites every listing once and stores real hashes;
+later runs skip the unchanged ones.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0034_incremental_rescoring'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedjoblisting',
+            name='sync_fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,32 @@
+"""
+Per-source high-water marks for incremental sync_genzjobs runs.
+
+No rows yet: a scope without a watermark syncs from the beginning once and
+stores its first mark (see jobs/genzjobs.py).
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0035_scrapedjoblisting_sync_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=100, unique=True)),
+                ('high_water_at', models.DateTimeField(blank=True, null=True)),
+                ('high_water_id', models.CharField(blank=True, max_length=50)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Sync Watermark',
+                'verbose_name_plural': 'Sync Watermarks',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+"""
+Alias table for the indexed company resolver (jobs/companies.py).
+
+Each company name that fuzzy-matches an existing Company is stored here, so
+later syncs resolve it by exact lookup instead of matching again. Starts
+empty and fills as syncs run.
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0036_syncwatermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='jobs.company')),
+            ],
+            options={
+                'verbose_name': 'Company Alias',
+                'verbose_name_plural': 'Company Aliases',
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+"""
+MinHash signatures and LSH band keys for repost detection (jobs/reposts.py).
+
+Kept out of ScrapedJobListing so the hot listing table doesn't carry 512
+bytes of signature per row. Empty until `manage.py detect_reposts` backfills
+the corpus; sync_genzjobs indexes new listings from then on.
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0037_companyalias'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingMinHash',
+            fields=[
+                ('listing', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='minhash', serialize=False, to='jobs.scrapedjoblisting')),
+                ('signature', models.BinaryField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Listing MinHash',
+                'verbose_name_plural': 'Listing MinHashes',
+            },
+        ),
+        migrations.CreateModel(
+            name='ListingMinHashBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band_key', models.BigIntegerField(db_index=True)),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='minhash_bands', to='jobs.scrapedjoblisting')),
+            ],
+            options={
+                'verbose_name': 'Listing MinHash Band',
+                'verbose_name_plural': 'Listing MinHash Bands',
+            },
+        ),
+    ]
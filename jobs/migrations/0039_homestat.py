@@ -0,0 +1,32 @@
+"""
+Precomputed homepage aggregates (HomeStat), one row per block of home().
+
+No rows yet: the first homepage build computes and stores any missing block,
+after which sync_genzjobs, score_listings, expire_stale_listings and the
+closure jobs rewrite the blocks they affect (see jobs/homepage.py).
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0038_listingminhash_listingminhashband'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HomeStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('part', models.CharField(max_length=30, unique=True)),
+                ('data', models.JSONField(default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Home Stat',
+                'verbose_name_plural': 'Home Stats',
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+"""
+Per-employer daily ATS rollup (PipelineDailyRollup) for the analytics dashboard.
+
+Backfilled here from existing applications and stage history
+(jobs/ats_analytics.py rebuild_rollups(), against the historical models);
+from then on apply_job and move_application_stage keep it current.
+"""
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_rollups(apps, schema_editor):
+    from jobs.ats_analytics import rebuild_rollups
+    rebuild_rollups(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0039_homestat'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('entered', models.PositiveIntegerField(default=0)),
+                ('reached', models.PositiveIntegerField(default=0)),
+                ('exited', models.PositiveIntegerField(default=0)),
+                ('seconds_in_stage', models.BigIntegerField(default=0)),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pipeline_rollups', to=settings.AUTH_USER_MODEL)),
+                ('stage', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='jobs.hiringstage')),
+            ],
+            options={
+                'verbose_name': 'Pipeline Daily Rollup',
+                'verbose_name_plural': 'Pipeline Daily Rollups',
+                'unique_together': {('employer', 'date', 'stage')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
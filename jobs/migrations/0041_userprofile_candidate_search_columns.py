@@ -0,0 +1,44 @@
+"""
+Candidate search columns on UserProfile: contact_verified and search_vector.
+
+contact_verified is backfilled here in one UPDATE (phone OR email verified,
+the same test as UserProfile.is_verified()); from then on jobs/candidates.py
+keeps it current from the profile and verification signals. search_vector is
+backfilled with its GIN index in 0042 (Postgres only).
+"""
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef
+
+
+def backfill_contact_verified(apps, schema_editor):
+    UserProfile = apps.get_model('jobs', 'UserProfile')
+    PhoneVerification = apps.get_model('jobs', 'PhoneVerification')
+    EmailVerification = apps.get_model('jobs', 'EmailVerification')
+    UserProfile.objects.update(contact_verified=ExpressionWrapper(
+        Exists(PhoneVerification.objects.filter(user_id=OuterRef('user_id'), is_verified=True))
+        | Exists(EmailVerification.objects.filter(user_id=OuterRef('user_id'), is_verified=True)),
+        output_field=BooleanField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0040_pipelinedailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='contact_verified',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_contact_verified, migrations.RunPython.noop),
+    ]
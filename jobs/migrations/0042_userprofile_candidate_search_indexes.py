@@ -0,0 +1,88 @@
+"""
+Candidate search indexes on jobs_userprofile, and the search_vector backfill.
+
+- jobs_up_search_vector_gin: GIN over the candidate tsvector
+  (jobs/candidates.py), so a search is one index lookup instead of five
+  ILIKEs over every job seeker.
+- jobs_up_candidate_pool_idx: partial index over exactly the candidate pool
+  (searchable, verified job seekers), which every candidate search filters
+  to before anything else.
+
+Notes:
+- atomic = False + CREATE INDEX CONCURRENTLY: avoids locking the live table
+  during deploy (same reasoning as 0024-0026, 0031).
+- Vectors are written in pk batches, each UPDATE committing on its own,
+  with a frozen copy of jobs/candidates.py's candidate_search_vector() as of
+  this migration.
+- Guarded on connection.vendor: no-op on SQLite dev/test.
+- Not declared in model Meta (consistent with 0024/0026/0031) — pure
+  performance indexes managed here via RunPython.
+"""
+
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+BACKFILL_BATCH = 2000
+
+INDEXES = {
+    "jobs_up_search_vector_gin": "USING gin (search_vector)",
+    "jobs_up_candidate_pool_idx": (
+        "(id) WHERE user_type = 'job_seeker' AND profile_searchable AND contact_verified"
+    ),
+}
+
+
+def candidate_search_vector(User):
+    user = User.objects.filter(pk=OuterRef("user_id"))
+    return (
+        SearchVector(
+            Subquery(user.values("first_name")), Subquery(user.values("last_name")),
+            weight="A", config="english",
+        )
+        + SearchVector("desired_title", weight="A", config="english")
+        + SearchVector("skills", weight="B", config="english")
+        + SearchVector("bio", weight="C", config="english")
+    )
+
+
+def create_candidate_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    User = apps.get_model("auth", "User")
+    UserProfile = apps.get_model("jobs", "UserProfile")
+    pks = list(
+        UserProfile.objects.filter(search_vector__isnull=True)
+        .order_by("pk").values_list("pk", flat=True)
+    )
+    for i in range(0, len(pks), BACKFILL_BATCH):
+        UserProfile.objects.filter(pk__in=pks[i:i + BACKFILL_BATCH]).update(
+            search_vector=candidate_search_vector(User)
+        )
+
+    for name, definition in INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f"ON jobs_userprofile {definition}"
+        )
+
+
+def drop_candidate_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("jobs", "0041_userprofile_candidate_search_columns"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_candidate_indexes, drop_candidate_indexes),
+    ]
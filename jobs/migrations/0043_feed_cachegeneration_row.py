@@ -0,0 +1,25 @@
+"""
+Create the "feed" CacheGeneration row.
+
+jobs/pagecache.py reads it on every anonymous /jobs/ hit; with the row
+guaranteed here that read is a plain indexed SELECT instead of a
+get_or_create.
+"""
+
+from django.db import migrations
+
+
+def create_feed_generation(apps, schema_editor):
+    CacheGeneration = apps.get_model('jobs', 'CacheGeneration')
+    CacheGeneration.objects.get_or_create(name='feed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0042_userprofile_candidate_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_feed_generation, migrations.RunPython.noop),
+    ]
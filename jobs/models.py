@@ -2,8 +2,13 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import FileExtensionValidator
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
+from django.utils.functional import cached_property
 import os
 
+from jobs.fingerprints import fingerprint_listings, remember_inputs
+
 class Job(models.Model):
     # Job type choices
     JOB_TYPE_CHOICES = [
@@ -53,6 +58,12 @@ class Job(models.Model):
     expires_at = models.DateTimeField(null=True, blank=True, help_text='When this job listing expires')
     last_refreshed = models.DateTimeField(null=True, blank=True, help_text='When the employer last confirmed this job is still active')
 
+    # Normalized from `location` on save (jobs/locations.py)
+    country_code = models.CharField(max_length=2, blank=True, db_index=True)
+    region_code = models.CharField(max_length=10, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    is_remote = models.BooleanField(default=False)
+
     def __str__(self):
         return f"{self.title} at {self.company}"
 
@@ -66,6 +77,9 @@ class Job(models.Model):
             from django.utils import timezone
             from datetime import timedelta
             self.expires_at = timezone.now() + timedelta(days=self.DEFAULT_EXPIRATION_DAYS)
+        from jobs.locations import is_remote_status, location_fields
+        for field, value in location_fields(self.location, is_remote_status(self.remote_status)).items():
+            setattr(self, field, value)
         super().save(*args, **kwargs)
 
     def is_expired(self):
@@ -134,6 +148,12 @@ class UserProfile(models.Model):
         help_text='Allow employers to find your profile in candidate search'
     )
     bio = models.TextField(blank=True, help_text='Brief summary about yourself')
+    # is_verified() denormalized, so candidate search filters in SQL; and the
+    # full-text document over name/title/skills/bio (GIN-indexed on Postgres,
+    # 0042). Both rewritten by jobs/candidates.py on profile and verification
+    # saves.
+    contact_verified = models.BooleanField(default=False, editable=False)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
 
     # Employer fields
     company_name = models.CharField(max_length=200, blank=True)
@@ -476,6 +496,39 @@ class ApplicationStageHistory(models.Model):
         return f"{self.application} -> {self.stage.name if self.stage else 'Unknown'}"
 
 
+class PipelineDailyRollup(models.Model):
+    """
+    Per-employer, per-day ATS counters behind the analytics dashboard
+    (jobs/ats_analytics.py). A row with no stage counts the applications
+    received that day; a stage row counts entries into the stage, first
+    entries (the funnel) and exits with the time spent in it. Incremented
+    by apply_job and move_application_stage, rebuilt for the employer when
+    applications are deleted (and by rebuild_ats_analytics).
+    """
+    employer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='pipeline_rollups')
+    date = models.DateField()
+    stage = models.ForeignKey(
+        HiringStage,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='daily_rollups'
+    )
+    applications = models.PositiveIntegerField(default=0)
+    entered = models.PositiveIntegerField(default=0)
+    reached = models.PositiveIntegerField(default=0)  # Applications in the stage for the first time
+    exited = models.PositiveIntegerField(default=0)
+    seconds_in_stage = models.BigIntegerField(default=0)  # Summed over the exits
+
+    class Meta:
+        unique_together = ['employer', 'date', 'stage']
+        verbose_name = 'Pipeline Daily Rollup'
+        verbose_name_plural = 'Pipeline Daily Rollups'
+
+    def __str__(self):
+        return f"{self.employer.username} {self.date} {self.stage.name if self.stage else 'applications'}"
+
+
 class ApplicationNote(models.Model):
     """Internal notes on applications (visible only to employer team)"""
     application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='notes')
@@ -1032,32 +1085,38 @@ class Company(models.Model):
 
     def save(self, *args, **kwargs):
         # Normalize company name for matching
-        self.normalized_name = self.name.lower().strip()
+        from jobs.companies import normalize_company_name
+        self.normalized_name = normalize_company_name(self.name)
         super().save(*args, **kwargs)
 
     @classmethod
-    def find_or_create(cls, company_name, threshold=0.85):
+    def find_or_create(cls, company_name, threshold=0.85, resolver=None):
         """
-        Find existing company by fuzzy match or create new one.
-        Returns (company, created) tuple.
+        Find existing company by exact/alias/fuzzy match or create new one.
+        Returns (company, created) tuple. Pass a CompanyResolver
+        (jobs/companies.py) to reuse its index across calls.
         """
-        from difflib import SequenceMatcher
-        normalized = company_name.lower().strip()
+        from jobs.companies import CompanyResolver
+        resolver = resolver or CompanyResolver(threshold)
+        company_id = resolver.resolve_many([company_name])[company_name]
+        return cls.objects.get(pk=company_id), company_id in resolver.last_created
 
-        # Exact match first
-        try:
-            return cls.objects.get(normalized_name=normalized), False
-        except cls.DoesNotExist:
-            pass
 
-        # Fuzzy match against existing companies
-        for company in cls.objects.all():
-            ratio = SequenceMatcher(None, normalized, company.normalized_name).ratio()
-            if ratio >= threshold:
-                return company, False
+class CompanyAlias(models.Model):
+    """
+    A normalized company name that fuzzy-matched an existing Company, so later
+    resolutions of the same name are an exact lookup (jobs/companies.py).
+    """
+    alias = models.CharField(max_length=255, unique=True)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='aliases')
+    created_at = models.DateTimeField(auto_now_add=True)
 
-        # Create new
-        return cls.objects.create(name=company_name), True
+    class Meta:
+        verbose_name = 'Company Alias'
+        verbose_name_plural = 'Company Aliases'
+
+    def __str__(self):
+        return f"{self.alias} -> {self.company_id}"
 
 
 class ScrapedJobListing(models.Model):
@@ -1134,6 +1193,13 @@ class ScrapedJobListing(models.Model):
     description = models.TextField()
     location = models.CharField(max_length=200, blank=True)
 
+    # Normalized from `location` on save (jobs/locations.py) so the country
+    # filter is an indexed equality instead of a per-request OR chain
+    country_code = models.CharField(max_length=2, blank=True, db_index=True)
+    region_code = models.CharField(max_length=10, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    is_remote = models.BooleanField(default=False)
+
     # Structured fields
     job_type = models.CharField(max_length=50, blank=True)
     experience_level = models.CharField(max_length=50, blank=True)
@@ -1194,6 +1260,25 @@ class ScrapedJobListing(models.Model):
     published_to_board = models.BooleanField(default=False)
     published_at = models.DateTimeField(null=True, blank=True)
 
+    # Persisted /jobs/ feed rank keys (see jobs/feed.py). Denormalized so the
+    # feed can ORDER BY an index instead of blending scores per request:
+    # feed_posted_at = date_posted_external or date_first_seen, feed_activity
+    # mirrors activity_score.total_score, feed_relevance = 0.5 * activity +
+    # a freshness bonus re-aged by `manage.py refresh_feed_ranks`.
+    feed_posted_at = models.DateTimeField(default=timezone.now)
+    feed_activity = models.PositiveSmallIntegerField(default=0)
+    feed_relevance = models.FloatField(default=0.0)
+
+    # Hash of the genzjobs source fields this row was last synced from
+    # (sync_genzjobs.source_fingerprint). A matching hash means the sync
+    # skips the row except for a periodic date_last_seen touch.
+    sync_fingerprint = models.CharField(max_length=64, blank=True)
+
+    # Full-text search document over title/company/location/description
+    # (jobs/search.py). Written set-based by sync_genzjobs and
+    # `manage.py update_search_index`; GIN-indexed on Postgres (0031).
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
     # Link to verified job if employer claims
     claimed_job = models.OneToOneField(
         Job,
@@ -1221,25 +1306,56 @@ class ScrapedJobListing(models.Model):
         from django.urls import reverse
         return reverse('observed_listing_detail', args=[self.pk])
 
+    # Columns refresh_derived_fields() computes from the others.
+    DERIVED_FIELDS = (
+        'date_last_seen', 'description_hash', 'title_hash',
+        'country_code', 'region_code', 'city', 'is_remote',
+        'feed_posted_at', 'feed_relevance',
+    )
+
+    # title/company_name/description as last loaded or hashed (see
+    # jobs/fingerprints.py); None on a new instance.
+    _fingerprinted_inputs = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        remember_inputs(instance)
+        return instance
+
     def save(self, *args, **kwargs):
-        import hashlib
-        import re
+        update_fields = kwargs.get('update_fields')
+        self.refresh_derived_fields(None if update_fields is None else set(update_fields))
+        super().save(*args, **kwargs)
+
+    def refresh_derived_fields(self, fields=None):
+        """
+        Recompute the derived columns among `fields` (all of them when None),
+        so a save(update_fields=[...]) of status columns is a plain UPDATE.
+        The fingerprint is only rehashed when its inputs changed. save()
+        calls this; bulk writers (sync_genzjobs) must call it themselves.
+        """
+        def wanted(*columns):
+            return fields is None or not fields.isdisjoint(columns)
 
         # Set date_last_seen on first save if not set
-        if not self.date_last_seen:
+        if wanted('date_last_seen') and not self.date_last_seen:
             from django.utils import timezone
             self.date_last_seen = timezone.now()
 
-        # Strip HTML before hashing for consistent fingerprinting
-        plain_desc = re.sub(r'<[^>]+>', '', self.description) if self.description else ''
-        normalized_desc = ' '.join(plain_desc.lower().split())
-        self.description_hash = hashlib.sha256(normalized_desc.encode()).hexdigest()
+        if wanted('description_hash', 'title_hash'):
+            fingerprint_listings([self])
 
-        normalized_title = ' '.join(self.title.lower().split())
-        title_company = f"{normalized_title}|{self.company_name.lower()}"
-        self.title_hash = hashlib.sha256(title_company.encode()).hexdigest()
+        if wanted('country_code', 'region_code', 'city', 'is_remote'):
+            from jobs.locations import is_remote_status, location_fields
+            for field, value in location_fields(self.location, is_remote_status(self.remote_status)).items():
+                setattr(self, field, value)
 
-        super().save(*args, **kwargs)
+        # Keep the persisted feed rank keys in step with the posting date
+        if wanted('feed_posted_at', 'feed_relevance'):
+            from jobs.feed import relevance_score
+            self.feed_posted_at = self.date_posted_external or self.date_first_seen or self.feed_posted_at
+            self.feed_relevance = relevance_score(self.feed_activity, self.feed_posted_at)
 
     def days_since_first_seen(self):
         """Days since this listing was first observed"""
@@ -1320,6 +1436,12 @@ class HiringActivityScore(models.Model):
     # Timestamps
     calculated_at = models.DateTimeField(auto_now=True)
 
+    # When this score next needs recomputing: the earliest moment a time-based
+    # signal (freshness, evergreen, stale, ...) moves, or "now" once an input
+    # changed. `score_listings --incremental` rescores rows due by this time;
+    # null means no time-based change ahead. See jobs/scoring/incremental.py.
+    rescore_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
     # Publishing status (denormalized for query performance)
     published_to_board = models.BooleanField(default=False)
 
@@ -1331,6 +1453,17 @@ class HiringActivityScore(models.Model):
     def __str__(self):
         return f"{self.listing.title}: {self.total_score} ({self.score_band})"
 
+    @cached_property
+    def explained_breakdown(self):
+        """
+        score_breakdown with explanation strings. Batch-scored rows store
+        points only; the strings are formatted here, when the score is read,
+        from the stored inputs (jobs/scoring/explain.py) — no engine, no
+        queries.
+        """
+        from jobs.scoring.explain import explain
+        return explain(self.listing, self.score_breakdown or {})
+
     def save(self, *args, **kwargs):
         from jobs.scoring.config import get_config
         config = get_config()
@@ -1348,13 +1481,18 @@ class HiringActivityScore(models.Model):
 
         super().save(*args, **kwargs)
 
-        # Sync to parent listing
-        if self.listing.published_to_board != self.published_to_board:
+        # Sync to parent listing (publish flag + feed rank keys)
+        listing = self.listing
+        if (listing.published_to_board != self.published_to_board
+                or listing.feed_activity != self.total_score):
             from django.utils import timezone
-            self.listing.published_to_board = self.published_to_board
-            if self.published_to_board and not self.listing.published_at:
-                self.listing.published_at = timezone.now()
-            self.listing.save(update_fields=['published_to_board', 'published_at'])
+            listing.published_to_board = self.published_to_board
+            if self.published_to_board and not listing.published_at:
+                listing.published_at = timezone.now()
+            listing.feed_activity = self.total_score
+            listing.save(update_fields=[
+                'published_to_board', 'published_at', 'feed_activity', 'feed_relevance',
+            ])
 
     def get_pip_display(self):
         """Return pip indicator string (e.g., ●●●●○)"""
@@ -1431,6 +1569,68 @@ class CompanyHiringProfile(models.Model):
         return f"{self.company.name} Hiring Profile"
 
 
+class CompanySignalState(models.Model):
+    """
+    Last-scored value of the company-level HAS inputs, one row per company
+    key ('name:<normalized company_name>' for velocity/diversity/reputation,
+    'company:<id>' for industry/boilerplate/recent closures). Incremental
+    rescoring diffs the current inputs against these rows and marks only the
+    affected companies' listings for rescore.
+    """
+    key = models.CharField(max_length=300, unique=True)
+    signature = models.CharField(max_length=200)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Company Signal State'
+        verbose_name_plural = 'Company Signal States'
+
+    def __str__(self):
+        return f"{self.key}: {self.signature}"
+
+
+class ListingMinHash(models.Model):
+    """
+    MinHash signature of a listing's description, for repost detection
+    (jobs/reposts.py). Empty for a description too short to sign.
+    """
+    listing = models.OneToOneField(
+        ScrapedJobListing,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='minhash',
+    )
+    signature = models.BinaryField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Listing MinHash'
+        verbose_name_plural = 'Listing MinHashes'
+
+    def __str__(self):
+        return f"MinHash for listing {self.listing_id}"
+
+
+class ListingMinHashBand(models.Model):
+    """
+    One LSH band key of a listing's MinHash signature, salted with its
+    company. Listings sharing a key are repost candidates (jobs/reposts.py).
+    """
+    band_key = models.BigIntegerField(db_index=True)
+    listing = models.ForeignKey(
+        ScrapedJobListing,
+        on_delete=models.CASCADE,
+        related_name='minhash_bands',
+    )
+
+    class Meta:
+        verbose_name = 'Listing MinHash Band'
+        verbose_name_plural = 'Listing MinHash Bands'
+
+    def __str__(self):
+        return f"{self.band_key} -> {self.listing_id}"
+
+
 class ListingFeedback(models.Model):
     """
     User feedback on scraped listings for quality improvement.
@@ -1548,6 +1748,25 @@ class GenzjobsListing(models.Model):
         return f"{self.title} at {self.company} ({self.source})"
 
 
+class SyncWatermark(models.Model):
+    """
+    High-water mark of an incremental sync_genzjobs run: the (updated_at, id)
+    keyset position of the last genzjobs row synced for a source scope
+    ('*' for all sources). The next run streams only rows past it.
+    """
+    scope = models.CharField(max_length=100, unique=True)
+    high_water_at = models.DateTimeField(null=True, blank=True)
+    high_water_id = models.CharField(max_length=50, blank=True)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Sync Watermark'
+        verbose_name_plural = 'Sync Watermarks'
+
+    def __str__(self):
+        return f"{self.scope}: {self.high_water_at} / {self.high_water_id}"
+
+
 # =============================================================================
 # DAILY GHOST JOB ANALYSIS PIPELINE
 # =============================================================================
@@ -1718,3 +1937,54 @@ class SocialContentDraft(models.Model):
 
     def __str__(self):
         return f"{self.date} {self.platform} ({self.status})"
+
+
+class CacheGeneration(models.Model):
+    """
+    Version number for cached pages built from listing data.
+
+    Bumped by the commands that change what the public feed shows
+    (sync_genzjobs, score_listings, refresh_feed_ranks, expire_stale_listings)
+    and when a verified Job is saved or deleted. Cache keys embed the current
+    generation, so a bump retires every page cached under the old one without
+    having to find and delete them (see jobs/pagecache.py).
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.PositiveIntegerField(default=0)
+    bumped_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Cache Generation'
+        verbose_name_plural = 'Cache Generations'
+
+    def __str__(self):
+        return f"{self.name} #{self.value}"
+
+    @property
+    def token(self):
+        """Cache-key component: the number plus when it was set.
+
+        bumped_at disambiguates a counter that restarted (row recreated after
+        a restore, or a test database rolled back) from the one a stale page
+        was cached under.
+        """
+        return f"{self.value}.{self.bumped_at.strftime('%Y%m%d%H%M%S%f')}"
+
+
+class HomeStat(models.Model):
+    """
+    One precomputed block of homepage aggregates (jobs/homepage.py): totals
+    and freshness counts, company movement, the employer ranking, the
+    rejected ticker. Rewritten by the commands that change
+    the underlying data, so home() reads these rows instead of aggregating.
+    """
+    part = models.CharField(max_length=30, unique=True)
+    data = models.JSONField(default=dict)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Home Stat'
+        verbose_name_plural = 'Home Stats'
+
+    def __str__(self):
+        return f"{self.part} @ {self.computed_at}"
@@ -0,0 +1,122 @@
+"""
+Whole-response cache for anonymous page views, with per-request holes.
+
+Most /jobs/ traffic is anonymous crawlers and first-time visitors on the
+default filter set. For them the page is identical apart from two pieces of
+per-request markup: the site header (navbar + flash messages) and the CSRF
+token in the chat widget. Those are rendered as placeholders
+(`<!--page-cache:NAME-->`, see base.html and `page_cache_holes`) in the body
+that gets cached, and filled in on every response — an edge-side include
+done in-process. Everything else (the feed queries, facets, chips and the
+template render) runs once per cache key.
+
+Keys embed the "feed" CacheGeneration, bumped by sync/rescore/expiry and by
+verified Job writes, so new data retires every cached page at once; the TTL
+only bounds how long an unchanged page lives.
+
+Only anonymous GETs whose parameters are all in the view's known set are
+cached — anything else (utm_* tags, junk params) would let a crawler mint
+unbounded keys. The key is built from the host and the view's *normalized*
+filters (the view passes them in), not the raw querystring, so `?search=
+Nurse` and `?search=nurse!!` share one entry; the view must render the page
+from those normalized values alone (its links, title and canonical tags).
+
+Usage (inside a view):
+    page_key = anonymous_page_key(request, 'job_list', JOB_LIST_PARAMS, filters.urlencode())
+    cached = serve_cached_page(request, page_key)
+    if cached is not None:
+        return cached
+    ...
+    response = render(request, template, {..., 'page_cache_holes': bool(page_key)})
+    return store_cached_page(request, page_key, response)
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+
+
+PAGE_CACHE_TTL = 600
+
+FEED_GENERATION = 'feed'
+
+_HOLE = '<!--page-cache:{}-->'
+
+
+def current_generation(name=FEED_GENERATION):
+    """
+    Cache-key token for generation `name`: one indexed single-row read, no
+    write (migration 0043 creates the 'feed' row; bump_generation() any other).
+    """
+    from jobs.models import CacheGeneration
+
+    row = CacheGeneration.objects.filter(name=name).values_list('value', 'bumped_at').first()
+    if row is None:
+        return '0'
+    value, bumped_at = row
+    return CacheGeneration(name=name, value=value, bumped_at=bumped_at).token
+
+
+def bump_generation(name=FEED_GENERATION):
+    """Retire every page cached under the current generation of `name`."""
+    from django.db.models import F
+    from jobs.models import CacheGeneration
+
+    generation, created = CacheGeneration.objects.get_or_create(name=name)
+    if not created:
+        generation.value = F('value') + 1
+        generation.save(update_fields=['value', 'bumped_at'])
+
+
+def anonymous_page_key(request, view_name, allowed_params, variant):
+    """
+    Cache key for this request, or None if it must not be served from cache.
+
+    The key is the view name, the feed generation, the host (pages render
+    absolute URLs) and `variant`: the view's normalized filters, in a
+    canonical form such as a urlencoded QueryDict.
+    """
+    if request.method != 'GET' or request.user.is_authenticated:
+        return None
+    if any(param not in allowed_params for param in request.GET):
+        return None
+    digest = hashlib.md5(repr((request.get_host(), variant)).encode()).hexdigest()
+    return f'page:{view_name}:{current_generation()}:{digest}'
+
+
+def _fill_holes(request, content):
+    if _HOLE.format('site_header') in content:
+        content = content.replace(
+            _HOLE.format('site_header'),
+            render_to_string('jobs/partials/site_header.html', request=request),
+        )
+    if _HOLE.format('csrf_token') in content:
+        content = content.replace(_HOLE.format('csrf_token'), get_token(request))
+    return content
+
+
+def serve_cached_page(request, page_key):
+    """The cached response for `page_key` with its holes filled, or None."""
+    if page_key is None:
+        return None
+    cached = cache.get(page_key)
+    if cached is None:
+        return None
+    content, content_type = cached
+    return HttpResponse(_fill_holes(request, content), content_type=content_type)
+
+
+def store_cached_page(request, page_key, response, ttl=PAGE_CACHE_TTL):
+    """
+    Cache the rendered (holed) body of `response` under `page_key`, then fill
+    the holes for this request. Returns the response to send.
+    """
+    if page_key is None or response.status_code != 200:
+        return response
+    content = response.content.decode(response.charset)
+    cache.set(page_key, (content, response['Content-Type']), ttl)
+    response.content = _fill_holes(request, content)
+    return response
@@ -0,0 +1,200 @@
+"""
+Repost detection: link listings to earlier near-duplicates at the same company.
+
+ScrapedJobListing.repost_count / previous_listing feed the HAS repost and
+evergreen signals, the homepage ghost-job panel and the daily report. The
+exact description_hash can't fill them — a repost with a changed date line
+or reordered bullet hashes differently — so this module compares
+descriptions by estimated Jaccard similarity of their word shingles:
+
+- minhash(): NUM_PERM-slot MinHash signature over SHINGLE_WORDS-word
+  shingles of the normalized plain-text description (None when there are
+  fewer than MIN_SHINGLES — "Apply on our site" stubs would match anything);
+- band_keys(): BANDS keys of ROWS slots each, salted with the normalized
+  company name, so the LSH index only ever pairs listings of one company;
+  two descriptions with similarity s share a band with probability
+  1 - (1 - s**ROWS) ** BANDS (~0.8 at s=0.8, ~0.02 at s=0.5);
+- detect_reposts(): stores signatures (ListingMinHash) and band keys
+  (ListingMinHashBand) for the given listings, looks up candidates by band
+  key — a few indexed rows instead of a scan of the company's listings —
+  and links each listing to its most recent near-duplicate (estimated
+  similarity >= SIMILARITY) posted at least MIN_REPOST_GAP earlier, active
+  or closed. The gap keeps same-day multi-location copies from counting as
+  reposts. A listing too short to sign gets an empty signature and no band
+  keys, so it is marked as indexed but never a candidate.
+
+sync_genzjobs runs detect_reposts() on each batch's new listings and on
+existing ones whose description changed — re-indexing replaces their
+signature and band keys, and drops a link that no longer holds;
+`manage.py detect_reposts` backfills the corpus in bounded chunks.
+"""
+
+import hashlib
+import random
+import re
+import struct
+from collections import defaultdict
+from datetime import timedelta
+
+from jobs.companies import normalize_company_name
+
+
+SHINGLE_WORDS = 4
+MIN_SHINGLES = 8
+NUM_PERM = 64
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+SIMILARITY = 0.8
+MIN_REPOST_GAP = timedelta(days=1)
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240301)  # fixed: signatures are persisted
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+_SIGNATURE = struct.Struct(f'<{NUM_PERM}Q')
+_CHUNK = 500
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
+
+
+def minhash(description):
+    """MinHash signature (tuple of NUM_PERM ints) of a description, or None if too short."""
+    plain = re.sub(r'<[^>]+>', ' ', description or '')
+    words = plain.lower().split()
+    shingles = {
+        _hash64(' '.join(words[i:i + SHINGLE_WORDS]))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    return tuple(
+        min((a * shingle + b) % _PRIME for shingle in shingles)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def similarity(left, right):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(left, right)) / NUM_PERM
+
+
+def band_keys(company_key, signature):
+    """Signed 64-bit LSH keys, one per band, scoped to `company_key`."""
+    keys = []
+    for band in range(BANDS):
+        values = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(
+            f'{company_key}|{band}|{",".join(map(str, values))}'.encode(), digest_size=8,
+        ).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def pack(signature):
+    return _SIGNATURE.pack(*signature)
+
+
+def unpack(data):
+    return _SIGNATURE.unpack(bytes(data))
+
+
+def detect_reposts(listing_ids):
+    """
+    Index the listings' signatures and link each to its prior near-duplicate.
+
+    Listings are handled in posting order, so one can match an earlier one
+    from the same call. Re-indexing a listing replaces its signature and
+    band keys. Returns {listing_id: (previous_listing_id, repost_count)}
+    for the listings whose link changed ((None, 0) when one was dropped).
+    """
+    from jobs.models import ListingMinHash, ListingMinHashBand, ScrapedJobListing
+
+    rows = list(
+        ScrapedJobListing.objects.filter(pk__in=list(listing_ids))
+        .order_by('feed_posted_at', 'pk')
+        .values_list(
+            'pk', 'company_name', 'description', 'feed_posted_at',
+            'previous_listing_id', 'repost_count',
+        )
+    )
+    signatures, keys = {}, {}
+    for pk, company_name, description, _posted, _previous, _count in rows:
+        signature = minhash(description)
+        if signature is not None:
+            signatures[pk] = signature
+            keys[pk] = band_keys(normalize_company_name(company_name), signature)
+
+    # Candidates already in the index: one query per chunk of band keys.
+    listings_by_key = defaultdict(set)
+    wanted = sorted({key for listing_keys in keys.values() for key in listing_keys})
+    for i in range(0, len(wanted), _CHUNK):
+        for key, listing_id in ListingMinHashBand.objects.filter(
+            band_key__in=wanted[i:i + _CHUNK],
+        ).values_list('band_key', 'listing_id'):
+            listings_by_key[key].add(listing_id)
+    stored = sorted(set().union(*listings_by_key.values()) - set(signatures)) if listings_by_key else []
+    known = {}  # listing id -> (signature, posted, repost_count)
+    for i in range(0, len(stored), _CHUNK):
+        for listing_id, data, posted, count in ListingMinHash.objects.filter(
+            listing_id__in=stored[i:i + _CHUNK],
+        ).values_list('listing_id', 'signature', 'listing__feed_posted_at', 'listing__repost_count'):
+            known[listing_id] = (unpack(data), posted, count)
+
+    links = {}
+    for pk, _company_name, _description, posted, previous, count in rows:
+        if pk not in signatures:
+            # Too short to compare (now): drop any link from an earlier text.
+            if previous is not None:
+                links[pk] = (None, 0)
+            continue
+        signature = signatures[pk]
+        best = None
+        candidates = set().union(*(listings_by_key.get(key, ()) for key in keys[pk]))
+        for candidate in candidates:
+            if candidate == pk or candidate not in known:
+                continue
+            other, other_posted, _other_count = known[candidate]
+            if other_posted > posted - MIN_REPOST_GAP or similarity(signature, other) < SIMILARITY:
+                continue
+            if best is None or other_posted > known[best][1]:
+                best = candidate
+        link = (best, known[best][2] + 1) if best is not None else (None, 0)
+        if link != (previous, count):
+            links[pk] = link
+        # Later listings in this call may repost this one.
+        known[pk] = (signature, posted, link[1])
+        for key in keys[pk]:
+            listings_by_key[key].add(pk)
+
+    # Every listing gets a row, so `minhash__isnull=True` (the backfill's
+    # pending set) skips short ones next time; theirs is empty.
+    ListingMinHash.objects.bulk_create(
+        [
+            ListingMinHash(listing_id=pk, signature=pack(signatures[pk]) if pk in signatures else b'')
+            for pk, *_fields in rows
+        ],
+        update_conflicts=True,
+        unique_fields=['listing'],
+        update_fields=['signature', 'computed_at'],
+    )
+    ListingMinHashBand.objects.filter(listing_id__in=[pk for pk, *_fields in rows]).delete()
+    ListingMinHashBand.objects.bulk_create(
+        [
+            ListingMinHashBand(listing_id=pk, band_key=key)
+            for pk, listing_keys in keys.items() for key in listing_keys
+        ],
+        batch_size=2000,
+    )
+    if links:
+        ScrapedJobListing.objects.bulk_update(
+            [
+                ScrapedJobListing(pk=pk, previous_listing_id=previous, repost_count=count)
+                for pk, (previous, count) in links.items()
+            ],
+            ['previous_listing', 'repost_count'],
+            batch_size=_CHUNK,
+        )
+    return links
@@ -14,10 +14,19 @@ Design principles:
 - All results are ANNUALIZED USD (hourly x2080, weekly x52, monthly x12).
 - Dependency-free (re / html / decimal only) so it's cheap to unit test.
 
+Scanning is anchored on '$': text with no dollar sign (literal or as an
+HTML entity) is rejected before any unescaping, and the range/single
+patterns are only tried at '$' positions, in one walk that judges ranges as
+it meets them and keeps singles for afterwards. Period, exclusion and
+context checks only ever look at the short window around a match.
+
 Public API:
     extract_salary_range(text) -> (min, max) | None
         min/max are Decimals; one side may be None ("from $X" / "up to $X"),
         never both.
+    extract_salary_ranges(rows) -> [(key, (min, max)), ...]
+        the same over (key, text) pairs, keeping the hits; the unit of work
+        of `extract_salaries --workers`.
 """
 import html
 import re
@@ -66,6 +75,11 @@ _CONTEXT_RE = re.compile(
 
 _SENTENCE_END_RE = re.compile(r'[.;!?\n]')
 
+_UP_TO_RE = re.compile(r'up\s*to\s*$', re.I)
+
+# '$' as an entity (&#36; &#x24; &dollar;), possibly double-escaped (&amp;#36;)
+_DOLLAR_ENTITY_RE = re.compile(r'&(?:amp;)?(?:#0*36|#[xX]0*24|dollar)')
+
 # Sanity bounds on the final ANNUAL figure
 _MIN_ANNUAL = Decimal(15000)
 _MAX_ANNUAL = Decimal(1200000)
@@ -130,6 +144,62 @@ def _plain_text(text):
     return _TAG_RE.sub(' ', unescaped)
 
 
+def _has_dollar(text):
+    """False when `text` can't contain a '$' once unescaped: no salary."""
+    if '$' in text:
+        return True
+    if '36' not in text and '24' not in text and 'dollar' not in text:
+        return False
+    return _DOLLAR_ENTITY_RE.search(text) is not None
+
+
+def _anchors(clean):
+    """Positions of '$' in `clean`: the only places an amount can start."""
+    pos = clean.find('$')
+    while pos != -1:
+        yield pos
+        pos = clean.find('$', pos + 1)
+
+
+def _accept_range(clean, m):
+    """(min, max) annual for a _RANGE_RE match, or None if it's rejected."""
+    ctx = _context(clean, m.start(), m.end())
+    if _EXCLUDE_RE.search(ctx) or _NON_USD_RE.search(ctx):
+        return None
+    lo = _to_number(m.group(1), m.group(2))
+    hi = _to_number(m.group(3), m.group(4))
+    # "$185-240K": K on the high side only distributes to both
+    if m.group(4) and not m.group(2) and lo < 1000 and hi >= 1000:
+        lo *= 1000
+    lo_a = _annualize(lo, ctx)
+    hi_a = _annualize(hi, ctx)
+    if lo_a is None or hi_a is None:
+        return None
+    if lo_a > hi_a:
+        return None
+    if not (_MIN_ANNUAL <= lo_a and hi_a <= _MAX_ANNUAL):
+        return None
+    if lo_a > 0 and hi_a / lo_a > _MAX_RATIO:
+        return None
+    return (lo_a, hi_a)
+
+
+def _accept_single(clean, m):
+    """(min, None) / (None, max) for a _SINGLE_RE match, or None."""
+    ctx = _context(clean, m.start(), m.end())
+    if not _CONTEXT_RE.search(ctx):
+        return None
+    if _EXCLUDE_RE.search(ctx) or _NON_USD_RE.search(ctx):
+        return None
+    value = _to_number(m.group(1), m.group(2))
+    annual = _annualize(value, ctx)
+    if annual is None or not (_MIN_ANNUAL <= annual <= _MAX_ANNUAL):
+        return None
+    if _UP_TO_RE.search(clean, max(0, m.start() - 30), m.start()):
+        return (None, annual)
+    return (annual, None)
+
+
 def extract_salary_range(text, max_scan=80000):
     """
     Extract an annualized USD salary from free text.
@@ -137,51 +207,46 @@ def extract_salary_range(text, max_scan=80000):
     Returns (min, max) as Decimals — one side may be None for "from $X" /
     "up to $X" singles — or None when nothing trustworthy is found.
     """
-    if not text:
+    if not text or not _has_dollar(text):
         return None
     clean = _plain_text(text)[:max_scan]
 
-    # ---- Pass 1: explicit ranges ------------------------------------
-    range_spans = []
-    for m in _RANGE_RE.finditer(clean):
-        range_spans.append((m.start(), m.end()))
-        ctx = _context(clean, m.start(), m.end())
-        if _EXCLUDE_RE.search(ctx) or _NON_USD_RE.search(ctx):
-            continue
-        lo = _to_number(m.group(1), m.group(2))
-        hi = _to_number(m.group(3), m.group(4))
-        # "$185-240K": K on the high side only distributes to both
-        if m.group(4) and not m.group(2) and lo < 1000 and hi >= 1000:
-            lo *= 1000
-        lo_a = _annualize(lo, ctx)
-        hi_a = _annualize(hi, ctx)
-        if lo_a is None or hi_a is None:
-            continue
-        if lo_a > hi_a:
-            continue
-        if not (_MIN_ANNUAL <= lo_a and hi_a <= _MAX_ANNUAL):
+    # ---- Pass 1: explicit ranges, judged as the walk finds them ------
+    singles = []
+    range_end = 0
+    for pos in _anchors(clean):
+        # A single inside an (already rejected) range must not resurrect it.
+        if pos < range_end:
             continue
-        if lo_a > 0 and hi_a / lo_a > _MAX_RATIO:
+        m = _RANGE_RE.match(clean, pos)
+        if m is None:
+            singles.append(pos)
             continue
-        return (lo_a, hi_a)
+        range_end = m.end()
+        result = _accept_range(clean, m)
+        if result:
+            return result
 
     # ---- Pass 2: single amounts with strong pay context --------------
-    for m in _SINGLE_RE.finditer(clean):
-        # A single inside an (already rejected) range must not resurrect it.
-        if any(s <= m.start() < e for s, e in range_spans):
+    for pos in singles:
+        m = _SINGLE_RE.match(clean, pos)
+        if m is None:
             continue
-        ctx = _context(clean, m.start(), m.end())
-        if not _CONTEXT_RE.search(ctx):
-            continue
-        if _EXCLUDE_RE.search(ctx) or _NON_USD_RE.search(ctx):
-            continue
-        value = _to_number(m.group(1), m.group(2))
-        annual = _annualize(value, ctx)
-        if annual is None or not (_MIN_ANNUAL <= annual <= _MAX_ANNUAL):
-            continue
-        before = clean[max(0, m.start() - 30): m.start()]
-        if re.search(r'up\s*to\s*$', before, re.I):
-            return (None, annual)
-        return (annual, None)
+        result = _accept_single(clean, m)
+        if result:
+            return result
 
     return None
+
+
+def extract_salary_ranges(rows, max_scan=80000):
+    """
+    extract_salary_range() over (key, text) pairs. Returns [(key, (min,
+    max))] for the rows a salary was found in, in input order.
+    """
+    found = []
+    for key, text in rows:
+        result = extract_salary_range(text, max_scan)
+        if result:
+            found.append((key, result))
+    return found
@@ -0,0 +1,719 @@
+"""
+Batch (columnar) Hiring Activity Scoring.
+
+HASEngine.calculate_score() scores one listing at a time: two queries per
+listing (the company's hiring profile, and whether the company closed a role
+in the last 30 days) plus fourteen signal calls that each format an
+explanation string. Over the daily ~67k-row `score_listings --force` that is
+~135k queries and as many throwaway strings.
+
+score_batch() scores a list of listings together:
+- the per-company lookups run once per batch (two queries);
+- listings are grouped by industry profile (each profile has its own merged
+  config), the columns the signals read are pulled out once, and each signal
+  is computed as a column over the group — the same arithmetic as
+  jobs/scoring/signals.py, without the explanations;
+- no explanation strings are built at all on the save path: save_batch()
+  persists BatchScore.stored_breakdown — the signal points, `_meta` and the
+  few per-company inputs (velocity count, diversity, featured, closing,
+  industry, boilerplate ratio) the explanations need. jobs/scoring/explain.py
+  formats the strings from those when a score is read
+  (HiringActivityScore.explained_breakdown: the listing detail page, preview
+  and tooltips) without running the signals.
+- BatchScore.breakdown, the full calculate_score() breakdown, is still
+  available for --verbose output: it runs the per-listing signal functions
+  against the batch's preloaded context (so still no queries).
+
+Totals are identical to calculate_score() under the same clock: the signals
+are added in calculate_score()'s order, so float rounding matches too. The
+parity is pinned by HASBatchScoringTest — any change to a signal in
+signals.py needs the matching change to its column here.
+
+The columns are plain lists rather than NumPy arrays: numpy isn't a
+dependency of this project, and Python's round() (round-half-even on the
+exact binary value) isn't what np.round computes, which would break parity.
+
+save_batch() persists a batch in two statements — an upsert of the
+HiringActivityScore rows and one UPDATE reconciling the listings — where
+HiringActivityScore.save() takes two or three round-trips per listing.
+
+Usage:
+    engine = HASEngine()
+    for batch in iter_batches(queryset.select_related('company').iterator(), BATCH_SIZE):
+        results = engine.score_batch(batch)
+        for result in results:
+            result.total, result.band      # computed for the whole batch
+            result.stored_breakdown        # what save_batch() persists
+        engine.save_batch(results)
+"""
+
+import datetime
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from django.utils import timezone
+
+from .signals import _normalize_company_name
+
+
+BATCH_SIZE = 1000
+
+# calculate_score()'s summation order. Float addition isn't associative, so the
+# batch total must add the signals in exactly this order.
+SIGNAL_ORDER = (
+    'freshness',
+    'specificity',
+    'company_velocity',
+    'ats_behavior',
+    'company_reputation',
+    'industry_adjustment',
+    'data_completeness',
+    'classification_confidence',
+    'publisher_trustworthiness',
+    'template_farm_penalty',
+    'repost_penalty',
+    'evergreen_penalty',
+    'boilerplate_penalty',
+    'stale_penalty',
+)
+
+# Same window as signals.calculate_ats_behavior.
+CLOSING_LOOKBACK_DAYS = 30
+
+
+def iter_batches(iterable, size=BATCH_SIZE):
+    """Yield lists of up to `size` items from `iterable`."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class BatchContext:
+    """Per-batch lookups shared by the column pass and the lazy breakdowns."""
+
+    def __init__(self, engine, listings, now):
+        from jobs.models import CompanyHiringProfile, ScrapedJobListing
+
+        self.now = now
+        self.velocity_map = engine._velocity_map
+        self.diversity_map = engine._diversity_map
+        self.featured_set = engine._featured_set
+
+        company_ids = {listing.company_id for listing in listings if listing.company_id is not None}
+        # select_related: the industry signal reads profile.company.
+        self.profiles = {
+            profile.company_id: profile
+            for profile in CompanyHiringProfile.objects.filter(
+                company_id__in=company_ids
+            ).select_related('company')
+        }
+        self.closing_companies = set(
+            ScrapedJobListing.objects.filter(
+                company_id__in=company_ids,
+                status='closed',
+                date_removed__gte=now - timedelta(days=CLOSING_LOOKBACK_DAYS),
+            ).values_list('company_id', flat=True).distinct()
+        )
+
+    def profile_for(self, listing):
+        if listing.company_id is None:
+            return None
+        return self.profiles.get(listing.company_id)
+
+
+class BatchScore:
+    """One listing's result from score_batch(). `breakdown` is built on first access."""
+
+    __slots__ = (
+        'listing', 'total', 'band', 'points', 'profile_key', 'profile_version',
+        'rescore_at', '_engine', '_config', '_context', '_breakdown',
+    )
+
+    def __init__(self, engine, listing, total, points, config, profile_key,
+                 profile_version, context, rescore_at=None):
+        self.listing = listing
+        self.total = total
+        self.band = engine.get_score_band(total)
+        self.points = points
+        self.profile_key = profile_key
+        self.profile_version = profile_version
+        self.rescore_at = rescore_at
+        self._engine = engine
+        self._config = config
+        self._context = context
+        self._breakdown = None
+
+    @property
+    def stored_breakdown(self):
+        """
+        The breakdown save_batch() persists: signal points and `_meta`, plus
+        under `_meta['inputs']` the per-company facts jobs/scoring/explain.py
+        needs to render the explanations later. Runs no signal code.
+        """
+        context = self._context
+        listing = self.listing
+        name = _normalize_company_name(listing.company_name)
+        diversity = context.diversity_map.get(name) if context.diversity_map is not None else None
+        company = listing.company if listing.company_id is not None else None
+        profile = context.profile_for(listing)
+        breakdown = {'base': {'points': self._config['base_score']}}
+        for signal in SIGNAL_ORDER:
+            breakdown[signal] = {'points': self.points[signal]}
+        breakdown['_meta'] = {
+            'profile': self.profile_key,
+            'profile_version': self.profile_version,
+            'inputs': {
+                'velocity': context.velocity_map.get(name, 0),
+                'diversity': list(diversity) if diversity else None,
+                'featured': name in context.featured_set,
+                'closing': listing.company_id in context.closing_companies,
+                'industry': company.industry.lower() if company and company.industry else '',
+                'boilerplate': profile.boilerplate_ratio if profile else None,
+            },
+        }
+        return breakdown
+
+    @property
+    def breakdown(self):
+        """The calculate_score() breakdown dict (signal points + explanations, `_meta`)."""
+        if self._breakdown is None:
+            _total, self._breakdown = self._engine._calculate(
+                self.listing, self._config, self.profile_key, self.profile_version,
+                self._context.profile_for(self.listing),
+                closing_companies=self._context.closing_companies,
+            )
+        return self._breakdown
+
+
+def score_batch(engine, listings, now=None):
+    """
+    Score `listings` (ScrapedJobListing instances, company select_related)
+    together. Returns a BatchScore per listing, in input order.
+    """
+    listings = list(listings)
+    if not listings:
+        return []
+    now = now or timezone.now()
+    if engine._velocity_map is None:
+        engine.prepare_caches()
+    context = BatchContext(engine, listings, now)
+
+    groups = defaultdict(list)
+    configs = {}
+    for index, listing in enumerate(listings):
+        config, profile_key, profile_version = engine._get_config_for_listing(listing)
+        groups[profile_key].append(index)
+        configs[profile_key] = (config, profile_version)
+
+    results = [None] * len(listings)
+    for profile_key, indices in groups.items():
+        config, profile_version = configs[profile_key]
+        group = [listings[index] for index in indices]
+        cols = _columns(group, context)
+        cols['reputable'] = engine._reputable_set(config)
+        points = {name: _SIGNALS[name](cols, config, context) for name in SIGNAL_ORDER}
+        totals = _totals(points, config, len(group))
+        rescore_at = _rescore_at(cols, config)
+        for row, index in enumerate(indices):
+            results[index] = BatchScore(
+                engine, listings[index], totals[row],
+                {name: points[name][row] for name in SIGNAL_ORDER},
+                config, profile_key, profile_version, context,
+                rescore_at=rescore_at[row],
+            )
+    return results
+
+
+def save_batch(engine, results, now=None):
+    """
+    Persist BatchScores: upsert their HiringActivityScore rows, then sync the
+    listings' publish flag and feed rank keys in one set-based UPDATE.
+
+    Produces the same rows as HiringActivityScore.save() per result: band and
+    published_to_board from the engine's config, published_at stamped on first
+    publish (never cleared), feed_activity/feed_relevance rewritten where the
+    score moved. Listing rows that are already in sync aren't written.
+    Returns the number of scores written.
+    """
+    from django.db.models import Case, F, OuterRef, Q, Subquery, Value, When
+    from jobs.feed import relevance_expression
+    from jobs.models import HiringActivityScore, ScrapedJobListing
+
+    if not results:
+        return 0
+    now = now or timezone.now()
+    threshold = engine.config['publish_threshold']
+
+    HiringActivityScore.objects.bulk_create(
+        [
+            HiringActivityScore(
+                listing_id=result.listing.pk,
+                total_score=result.total,
+                score_band=result.band,
+                score_breakdown=result.stored_breakdown,
+                score_version=engine.VERSION,
+                weight_profile=result.profile_key,
+                weight_profile_version=result.profile_version,
+                published_to_board=result.total >= threshold,
+                rescore_at=result.rescore_at,
+            )
+            for result in results
+        ],
+        update_conflicts=True,
+        unique_fields=['listing'],
+        update_fields=[
+            'total_score', 'score_band', 'score_breakdown', 'score_version',
+            'weight_profile', 'weight_profile_version', 'published_to_board',
+            'rescore_at', 'calculated_at',
+        ],
+    )
+
+    score = HiringActivityScore.objects.filter(listing=OuterRef('pk'))
+    new_total = Subquery(score.values('total_score')[:1])
+    new_published = Subquery(score.values('published_to_board')[:1])
+    ScrapedJobListing.objects.filter(
+        pk__in=[result.listing.pk for result in results],
+    ).filter(
+        ~Q(published_to_board=new_published) | ~Q(feed_activity=new_total),
+    ).update(
+        published_to_board=new_published,
+        published_at=Case(
+            When(new_published, published_at__isnull=True, then=Value(now)),
+            default=F('published_at'),
+        ),
+        feed_activity=new_total,
+        feed_relevance=relevance_expression(now, activity=new_total),
+    )
+    return len(results)
+
+
+def _totals(points, config, size):
+    totals = [config['base_score']] * size
+    for name in SIGNAL_ORDER:
+        totals = [total + p for total, p in zip(totals, points[name])]
+    low, high = config['min_score'], config['max_score']
+    return [round(max(low, min(high, total))) for total in totals]
+
+
+# --- Columns ------------------------------------------------------------------
+
+def _columns(listings, context):
+    """The listing attributes the signals read, one list per attribute."""
+    now = context.now
+    # ScrapedJobListing.days_since_posted(): posting dates before 2025 are junk.
+    floor = datetime.datetime(2025, 1, 1)
+    if timezone.is_aware(now):
+        floor = timezone.make_aware(floor)
+
+    def posted_at(listing):
+        ext = listing.date_posted_external
+        if ext is None or ext < floor:
+            return listing.date_first_seen
+        return ext
+
+    def industry(listing):
+        company = listing.company if listing.company_id is not None else None
+        return company.industry.lower() if company and company.industry else ''
+
+    profiles = [context.profile_for(listing) for listing in listings]
+    posted = [posted_at(l) for l in listings]
+    return {
+        'name': [_normalize_company_name(l.company_name) for l in listings],
+        'company_id': [l.company_id for l in listings],
+        'posted_at': posted,
+        'first_seen': [l.date_first_seen for l in listings],
+        'last_seen': [l.date_last_seen for l in listings],
+        'posted_days': [(now - p).days for p in posted],
+        'first_seen_days': [(now - l.date_first_seen).days for l in listings],
+        'last_seen_days': [
+            (now - l.date_last_seen).days if l.date_last_seen else None for l in listings
+        ],
+        'has_salary': [bool(l.salary_min or l.salary_max) for l in listings],
+        'location_length': [len(l.location) if l.location else 0 for l in listings],
+        'description_length': [len(l.description) if l.description else 0 for l in listings],
+        'skills_count': [getattr(l, 'skills_count', 0) or 0 for l in listings],
+        'repost_count': [l.repost_count for l in listings],
+        'industry': [industry(l) for l in listings],
+        'boilerplate_ratio': [p.boilerplate_ratio if p else None for p in profiles],
+        'has_requirements': [getattr(l, 'has_requirements', False) for l in listings],
+        'has_benefits': [getattr(l, 'has_benefits', False) for l in listings],
+        'has_logo': [getattr(l, 'has_company_logo', False) for l in listings],
+        'has_website': [getattr(l, 'has_company_website', False) for l in listings],
+        'confidence': [getattr(l, 'classification_confidence', None) for l in listings],
+        'source': [(getattr(l, 'source_ats', '') or '').lower() for l in listings],
+        'publisher': [(getattr(l, 'publisher', '') or '').lower() for l in listings],
+    }
+
+
+def _age_decay(cols, config):
+    """signals._age_decay_factor as a column."""
+    decay_days = config.get('freshness', {}).get('decay_days', 60)
+    if decay_days <= 0:
+        return [1.0] * len(cols['name'])
+    out = []
+    for days in cols['first_seen_days']:
+        if days <= 0:
+            out.append(1.0)
+        elif days >= decay_days:
+            out.append(0.0)
+        else:
+            out.append(1 - (days / decay_days))
+    return out
+
+
+def _diversity_scale(cols, config, context):
+    """The multiplier half of signals._diversity_factor as a column."""
+    cfg = config.get('template_farm', {})
+    diversity_map = context.diversity_map
+    if diversity_map is None:
+        return [1.0] * len(cols['name'])
+    min_listings = cfg.get('min_listings', 5)
+    factor = cfg.get('velocity_scale_factor', 1.5)
+    out = []
+    for name in cols['name']:
+        entry = diversity_map.get(name)
+        if not entry or entry[1] < min_listings:
+            out.append(1.0)
+            continue
+        distinct, total = entry
+        ratio = distinct / total if total else 1.0
+        out.append(min(1.0, ratio * factor))
+    return out
+
+
+def _rescore_at(cols, config):
+    """
+    When each row's score next changes with nothing but the clock moving: the
+    earliest day boundary at which a time-based signal's points move. The
+    signals count whole days, so a signal at day d next moves at
+    start + (d + 1) days. Erring early only costs a redundant rescore, so
+    boundaries that might not move the points (e.g. under the reputable
+    freshness floor) are included. None if no time-based signal can move.
+    """
+    day = timedelta(days=1)
+    fresh = config['freshness']
+    decay_start = fresh.get('decay_start_day', 0)
+    decay_days = fresh['decay_days']
+    evergreen_days = config['evergreen_penalty']['threshold_days']
+    stale_days = config['stale_penalty']['stale_threshold_days']
+    age_scaled = (
+        config['company_velocity'].get('age_scaled', False)
+        or config['company_reputation'].get('age_scaled', False)
+    )
+    age_decay_days = config.get('freshness', {}).get('decay_days', 60)
+
+    out = []
+    for row in range(len(cols['name'])):
+        candidates = []
+
+        posted_days = cols['posted_days'][row]
+        if decay_start < decay_days:
+            if posted_days <= decay_start:
+                candidates.append(cols['posted_at'][row] + (decay_start + 1) * day)
+            elif posted_days < decay_days:
+                candidates.append(cols['posted_at'][row] + (posted_days + 1) * day)
+
+        first_seen, first_days = cols['first_seen'][row], cols['first_seen_days'][row]
+        if first_days < evergreen_days:
+            candidates.append(first_seen + evergreen_days * day)
+        if cols['industry'][row]:
+            # industry_adjustment: "fast" flips after 14 days, "slow" after 30.
+            if first_days <= 14:
+                candidates.append(first_seen + 15 * day)
+            elif first_days <= 30:
+                candidates.append(first_seen + 31 * day)
+        if age_scaled and first_days < age_decay_days:
+            candidates.append(first_seen + (max(first_days, 0) + 1) * day)
+
+        last_days = cols['last_seen_days'][row]
+        if last_days is not None:
+            if last_days < stale_days:
+                candidates.append(cols['last_seen'][row] + stale_days * day)
+            elif last_days - stale_days < 10:  # the penalty caps at 10 days' excess
+                candidates.append(cols['last_seen'][row] + (last_days + 1) * day)
+
+        out.append(min(candidates) if candidates else None)
+    return out
+
+
+# --- Signals (points only; see signals.py for the rules and explanations) -----
+
+def _freshness(cols, config, context):
+    cfg = config['freshness']
+    max_points = cfg['max_points']
+    decay_days = cfg['decay_days']
+    decay_start = cfg.get('decay_start_day', 0)
+    floor = cfg.get('reputable_floor', 0)
+    reputable = cols['reputable']
+    out = []
+    for days, name in zip(cols['posted_days'], cols['name']):
+        if days <= decay_start:
+            points = max_points
+        elif days >= decay_days:
+            points = 0
+        else:
+            points = round(max_points * (1 - ((days - decay_start) / (decay_days - decay_start))), 1)
+        if floor and reputable is not None and name in reputable and points < floor:
+            points = floor
+        out.append(points)
+    return out
+
+
+def _specificity(cols, config, context):
+    cfg = config['specificity']
+    min_length = cfg['min_description_length']
+    quality = cfg['description_quality']
+    tools_points = cfg.get('tools_stack', 0)
+    min_tools = cfg.get('min_tools_count', 5)
+    out = []
+    for has_salary, location_length, description_length, skills_count in zip(
+        cols['has_salary'], cols['location_length'],
+        cols['description_length'], cols['skills_count'],
+    ):
+        points = 0
+        if has_salary:
+            points += cfg['has_salary']
+        if location_length > 5:
+            points += cfg['has_location']
+        if description_length >= min_length:
+            points += quality
+        elif description_length > 0:
+            points += round(quality * (description_length / min_length), 1)
+        if tools_points and skills_count >= min_tools:
+            points += tools_points
+        out.append(round(min(points, cfg['max_points']), 1))
+    return out
+
+
+def _company_velocity(cols, config, context):
+    cfg = config['company_velocity']
+    max_points = cfg['max_points']
+    tiers = cfg.get('tiers', [])
+    velocity_map = context.velocity_map
+    scales = _diversity_scale(cols, config, context)
+    decays = _age_decay(cols, config) if cfg.get('age_scaled', False) else None
+    out = []
+    for row, name in enumerate(cols['name']):
+        count = velocity_map.get(name, 0) if name else 0
+        if count <= 0:
+            out.append(0)
+            continue
+        points = 0
+        for threshold, pts in tiers:
+            if count >= threshold:
+                points = pts
+                break
+        points = min(points, max_points)
+        if decays is not None:
+            out.append(round(points * decays[row] * scales[row], 1))
+        else:
+            out.append(round(points * scales[row], 1))
+    return out
+
+
+def _ats_behavior(cols, config, context):
+    cfg = config['ats_behavior']
+    closing = context.closing_companies
+    out = []
+    for repost_count, company_id in zip(cols['repost_count'], cols['company_id']):
+        points = 0
+        if repost_count > 0:
+            points += cfg['description_updated']
+        if company_id is not None and company_id in closing:
+            points += cfg['similar_role_closed']
+        out.append(round(min(points, cfg['max_points']), 1))
+    return out
+
+
+def _company_reputation(cols, config, context):
+    cfg = config['company_reputation']
+    featured = context.featured_set
+    overrides = cfg.get('overrides', {})
+    decays = _age_decay(cols, config) if cfg.get('age_scaled', False) else None
+    out = []
+    for row, name in enumerate(cols['name']):
+        base_points = 0
+        if not name:
+            pass
+        elif name in featured:
+            base_points = cfg.get('featured_employer_bonus', 8)
+        else:
+            tier = overrides.get(name)
+            if tier == 1:
+                base_points = cfg.get('tier_1_bonus', 8)
+            elif tier == 2:
+                base_points = cfg.get('tier_2_bonus', 4)
+        if base_points <= 0:
+            out.append(0)
+        elif decays is not None:
+            out.append(round(base_points * decays[row], 1))
+        else:
+            out.append(base_points)
+    return out
+
+
+def _industry_adjustment(cols, config, context):
+    cfg = config['industry_adjustment']
+    out = []
+    for industry, days in zip(cols['industry'], cols['first_seen_days']):
+        if not industry:
+            out.append(0)
+        elif any(ind in industry for ind in cfg['slow_industries']):
+            out.append(cfg['slow_bonus'] if days > 30 else round(cfg['slow_bonus'] / 2, 1))
+        elif any(ind in industry for ind in cfg['fast_industries']):
+            out.append(cfg['fast_penalty'] if days > 14 else 0)
+        else:
+            out.append(0)
+    return out
+
+
+def _data_completeness(cols, config, context):
+    cfg = config.get('data_completeness', {})
+    if not cfg:
+        return [0] * len(cols['name'])
+    min_skills = cfg.get('min_skills_count', 3)
+    out = []
+    for has_requirements, has_benefits, has_logo, has_website, skills_count in zip(
+        cols['has_requirements'], cols['has_benefits'], cols['has_logo'],
+        cols['has_website'], cols['skills_count'],
+    ):
+        points = 0
+        if has_requirements:
+            points += cfg.get('has_requirements', 2)
+        if has_benefits:
+            points += cfg.get('has_benefits', 2)
+        if has_logo:
+            points += cfg.get('has_logo', 1)
+        if has_website:
+            points += cfg.get('has_website', 1)
+        if skills_count >= min_skills:
+            points += cfg.get('has_skills', 2)
+        out.append(round(min(points, cfg.get('max_points', 8)), 1))
+    return out
+
+
+def _classification_confidence(cols, config, context):
+    cfg = config.get('classification_confidence', {})
+    if not cfg:
+        return [0] * len(cols['name'])
+    high = cfg.get('high_threshold', 0.8)
+    low = cfg.get('low_threshold', 0.3)
+    out = []
+    for confidence in cols['confidence']:
+        if confidence is None:
+            out.append(0)
+        elif confidence >= high:
+            out.append(cfg.get('max_points', 3))
+        elif confidence <= low:
+            out.append(cfg.get('min_points', -3))
+        else:
+            out.append(0)
+    return out
+
+
+def _publisher_trustworthiness(cols, config, context):
+    cfg = config.get('publisher_trustworthiness', {})
+    if not cfg:
+        return [0] * len(cols['name'])
+    direct_ats = cfg.get('direct_ats_sources', [])
+    known = cfg.get('known_publishers', [])
+    out = []
+    for source, publisher in zip(cols['source'], cols['publisher']):
+        if source in direct_ats:
+            out.append(cfg.get('direct_ats_bonus', 5))
+        elif publisher in known or source in known:
+            out.append(cfg.get('known_publisher_bonus', 2))
+        else:
+            out.append(0)
+    return out
+
+
+def _template_farm_penalty(cols, config, context):
+    cfg = config.get('template_farm', {})
+    diversity_map = context.diversity_map
+    if diversity_map is None:
+        return [0] * len(cols['name'])
+    min_listings = cfg.get('min_listings', 5)
+    threshold = cfg.get('explicit_penalty_threshold', 0.2)
+    out = []
+    for name in cols['name']:
+        entry = diversity_map.get(name)
+        if not entry or entry[1] < min_listings:
+            out.append(0)
+            continue
+        distinct, total = entry
+        ratio = distinct / total if total else 1.0
+        out.append(0 if ratio >= threshold else cfg.get('explicit_penalty', -5))
+    return out
+
+
+def _repost_penalty(cols, config, context):
+    cfg = config['repost_penalty']
+    multiplier = cfg.get('penalty_multiplier', 1.0)
+    per_repost = cfg['points_per_repost'] * multiplier
+    floor = cfg['min_points'] * multiplier
+    return [
+        round(max(count * per_repost, floor), 1) if count else 0
+        for count in cols['repost_count']
+    ]
+
+
+def _evergreen_penalty(cols, config, context):
+    cfg = config['evergreen_penalty']
+    threshold = cfg['threshold_days']
+    out = []
+    for days, repost_count in zip(cols['first_seen_days'], cols['repost_count']):
+        if days < threshold:
+            out.append(0)
+            continue
+        penalty = cfg['min_points'] * 0.5
+        if repost_count == 0:
+            penalty *= cfg['no_change_multiplier']
+        out.append(round(max(penalty, cfg['min_points']), 1))
+    return out
+
+
+def _boilerplate_penalty(cols, config, context):
+    cfg = config['boilerplate_penalty']
+    threshold = cfg['high_ratio_threshold']
+    out = []
+    for ratio in cols['boilerplate_ratio']:
+        if ratio is None or ratio < threshold:
+            out.append(0)
+        else:
+            out.append(round(((ratio - threshold) / (1.0 - threshold)) * cfg['min_points'], 1))
+    return out
+
+
+def _stale_penalty(cols, config, context):
+    cfg = config['stale_penalty']
+    threshold = cfg['stale_threshold_days']
+    out = []
+    for days in cols['last_seen_days']:
+        if days is None or days < threshold:
+            out.append(0)
+        else:
+            out.append(round(max(-min(days - threshold, 10), cfg['min_points']), 1))
+    return out
+
+
+_SIGNALS = {
+    'freshness': _freshness,
+    'specificity': _specificity,
+    'company_velocity': _company_velocity,
+    'ats_behavior': _ats_behavior,
+    'company_reputation': _company_reputation,
+    'industry_adjustment': _industry_adjustment,
+    'data_completeness': _data_completeness,
+    'classification_confidence': _classification_confidence,
+    'publisher_trustworthiness': _publisher_trustworthiness,
+    'template_farm_penalty': _template_farm_penalty,
+    'repost_penalty': _repost_penalty,
+    'evergreen_penalty': _evergreen_penalty,
+    'boilerplate_penalty': _boilerplate_penalty,
+    'stale_penalty': _stale_penalty,
+}
@@ -124,6 +124,21 @@ class HASEngine:
         except Exception:
             self._featured_set = set()
 
+    def cache_snapshot(self):
+        """The prepare_caches() maps as a plain dict, for worker processes."""
+        return {
+            'velocity_map': self._velocity_map,
+            'diversity_map': self._diversity_map,
+            'featured_set': self._featured_set,
+        }
+
+    def load_cache_snapshot(self, snapshot):
+        """Adopt maps from cache_snapshot() instead of running prepare_caches()."""
+        self._velocity_map = snapshot['velocity_map']
+        self._diversity_map = snapshot['diversity_map']
+        self._featured_set = snapshot['featured_set']
+        self._reputable_set_cache = None
+
     def _reputable_set(self, config):
         """
         Union of normalized reputable company names: FeaturedEmployer entries
@@ -170,6 +185,16 @@ class HASEngine:
             except CompanyHiringProfile.DoesNotExist:
                 profile = None
 
+        return self._calculate(listing, config, profile_key, profile_version, profile)
+
+    def _calculate(self, listing, config, profile_key, profile_version, profile,
+                   closing_companies=None):
+        """
+        calculate_score() once the config and company profile are resolved.
+        Also renders BatchScore.breakdown (jobs/scoring/batch.py), which
+        passes a `closing_companies` set so no query runs. Never called on the
+        batch save path.
+        """
         breakdown = {}
 
         # Start with base score
@@ -206,7 +231,9 @@ class HASEngine:
         breakdown['company_velocity'] = {'points': points, 'explanation': explanation}
 
         # ATS Behavior
-        points, explanation = signals.calculate_ats_behavior(listing, config)
+        points, explanation = signals.calculate_ats_behavior(
+            listing, config, closing_companies=closing_companies
+        )
         total += points
         breakdown['ats_behavior'] = {'points': points, 'explanation': explanation}
 
@@ -313,6 +340,32 @@ class HASEngine:
         """
         return score >= self.config['publish_threshold']
 
+    def score_batch(self, listings, now=None):
+        """
+        Score many listings at once (columnar; see jobs/scoring/batch.py).
+
+        Args:
+            listings: ScrapedJobListing instances, company select_related
+            now: optional clock shared by the whole batch (default: now)
+
+        Returns:
+            list of BatchScore (total, band, points; explanations only on demand),
+            in input order. Totals match calculate_score().
+        """
+        from .batch import score_batch
+        return score_batch(self, listings, now=now)
+
+    def save_batch(self, results, now=None):
+        """
+        Persist score_batch() results: bulk upsert of HiringActivityScore plus
+        one set-based UPDATE syncing the listings (see batch.save_batch).
+
+        Returns:
+            int: number of scores written
+        """
+        from .batch import save_batch
+        return save_batch(self, results, now=now)
+
     def score_listing(self, listing, save=True):
         """
         Calculate score for a listing and optionally save to HiringActivityScore.
@@ -321,13 +374,35 @@ class HASEngine:
             listing: ScrapedJobListing instance
             save: bool, whether to save the score to database
 
+        Returns:
+            HiringActivityScore instance (saved or unsaved)
+        """
+        score, breakdown = self.calculate_score(listing)
+        return self.build_score_record(listing, score, breakdown, save=save)
+
+    def build_score_record(self, listing, score, breakdown, save=True, rescore_at=None):
+        """
+        Write a computed score onto the listing's HiringActivityScore (new or
+        existing), optionally saving it.
+
+        Args:
+            listing: ScrapedJobListing instance
+            score: int total from calculate_score / BatchScore.total
+            breakdown: the matching breakdown dict (with `_meta`)
+            save: bool, whether to save the score to database
+            rescore_at: BatchScore.rescore_at. The single-listing path has no
+                prediction, so it defaults to now: the next incremental run
+                rescores the row in batch and records one.
+
         Returns:
             HiringActivityScore instance (saved or unsaved)
         """
         from jobs.models import HiringActivityScore
 
-        score, breakdown = self.calculate_score(listing)
+        from django.utils import timezone
+
         band = self.get_score_band(score)
+        rescore_at = rescore_at or timezone.now()
         meta = breakdown.get('_meta', {})
         profile_key = meta.get('profile', DEFAULT_PROFILE_KEY)
         profile_version = meta.get('profile_version', 1)
@@ -341,6 +416,7 @@ class HASEngine:
             has_obj.score_version = self.VERSION
             has_obj.weight_profile = profile_key
             has_obj.weight_profile_version = profile_version
+            has_obj.rescore_at = rescore_at
         except HiringActivityScore.DoesNotExist:
             has_obj = HiringActivityScore(
                 listing=listing,
@@ -350,6 +426,7 @@ class HASEngine:
                 score_version=self.VERSION,
                 weight_profile=profile_key,
                 weight_profile_version=profile_version,
+                rescore_at=rescore_at,
             )
 
         if save:
@@ -359,7 +436,7 @@ class HASEngine:
 
     def bulk_score(self, listings, batch_size=100):
         """
-        Score multiple listings efficiently.
+        Score multiple listings efficiently (batch scoring and bulk saves).
 
         Args:
             listings: QuerySet or list of ScrapedJobListing instances
@@ -368,17 +445,15 @@ class HASEngine:
         Yields:
             tuple: (processed_count, total_count, current_listing)
         """
-        from jobs.models import HiringActivityScore
+        from .batch import iter_batches
 
         total = listings.count() if hasattr(listings, 'count') else len(listings)
         processed = 0
 
-        for listing in listings:
-            self.score_listing(listing, save=True)
-            processed += 1
-
-            if processed % batch_size == 0:
-                yield processed, total, listing
+        for batch in iter_batches(listings, batch_size):
+            self.save_batch(self.score_batch(batch))
+            processed += len(batch)
+            yield processed, total, batch[-1]
 
         # Final yield
         yield processed, total, None
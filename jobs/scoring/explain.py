@@ -0,0 +1,323 @@
+"""
+Explanation strings for stored HAS breakdowns.
+
+save_batch() (jobs/scoring/batch.py) persists signal points only, plus under
+`_meta['inputs']` the per-company facts the explanations depend on (velocity
+count, diversity, featured, closing, industry, boilerplate ratio). explain()
+turns such a breakdown back into calculate_score()'s shape when a score is
+read — the listing detail tooltip, the preview, has_tooltip — by formatting
+each stored point value's explanation from those inputs and the listing's own
+columns. It runs no signal code, builds no HASEngine and makes no queries, so
+a page of tooltips costs string formatting only.
+
+The texts are signals.py's, branch for branch. Like the columns in batch.py,
+any change to a signal's explanation there needs the matching change here;
+HASBatchScoringTest pins the two together.
+"""
+
+from django.utils import timezone
+
+from .config import _deep_merge, get_config
+from .profiles import DEFAULT_PROFILE_KEY, PROFILES
+from .signals import _normalize_company_name
+
+
+def explain(listing, breakdown):
+    """
+    `breakdown` with an explanation string beside each signal's points.
+
+    Breakdowns that already carry explanations (calculate_score()) are
+    returned as they are.
+    """
+    meta = breakdown.get('_meta') or {}
+    inputs = meta.get('inputs')
+    if inputs is None:
+        return breakdown
+
+    config = _profile_config(meta.get('profile'))
+    explained = {}
+    for signal, data in breakdown.items():
+        if signal == '_meta':
+            explained[signal] = {key: value for key, value in meta.items() if key != 'inputs'}
+            continue
+        explainer = _EXPLAINERS.get(signal)
+        explained[signal] = {
+            'points': data['points'],
+            'explanation': explainer(listing, config, inputs, data['points']) if explainer else '',
+        }
+    return explained
+
+
+def _profile_config(profile_key):
+    """The merged config the score was computed under (HASEngine._get_config_for_listing)."""
+    config = get_config()
+    overrides = PROFILES.get(profile_key)
+    if profile_key != DEFAULT_PROFILE_KEY and overrides:
+        _deep_merge(config, overrides)
+    return config
+
+
+def _age_decay(listing, config):
+    decay_days = config.get('freshness', {}).get('decay_days', 60)
+    if decay_days <= 0:
+        return 1.0
+    days_open = listing.days_since_first_seen()
+    if days_open <= 0:
+        return 1.0
+    if days_open >= decay_days:
+        return 0.0
+    return 1 - (days_open / decay_days)
+
+
+def _diversity(config, inputs):
+    """(scale, ratio) as signals._diversity_factor, or (1.0, None)."""
+    cfg = config.get('template_farm', {})
+    if not inputs['diversity']:
+        return 1.0, None
+    distinct, total = inputs['diversity']
+    if total < cfg.get('min_listings', 5):
+        return 1.0, None
+    ratio = distinct / total if total else 1.0
+    return min(1.0, ratio * cfg.get('velocity_scale_factor', 1.5)), ratio
+
+
+def _reputable(listing, config, inputs):
+    name = _normalize_company_name(listing.company_name)
+    overrides = config.get('company_reputation', {}).get('overrides', {})
+    return bool(name) and (inputs['featured'] or name in {(k or '').lower().strip() for k in overrides})
+
+
+# --- One explainer per signal (signals.calculate_*) ----------------------------
+
+def _base(listing, config, inputs, points):
+    return 'Base score'
+
+
+def _freshness(listing, config, inputs, points):
+    cfg = config['freshness']
+    max_points = cfg['max_points']
+    decay_days = cfg['decay_days']
+    decay_start = cfg.get('decay_start_day', 0)
+    days_open = listing.days_since_posted()
+
+    if days_open <= decay_start:
+        raw = max_points
+        explanation = f"Just posted ({days_open}d, flat to {decay_start}d)" if decay_start else "Just posted"
+    elif days_open >= decay_days:
+        raw = 0
+        explanation = f"Posted {days_open} days ago (fully decayed at {decay_days}d)"
+    else:
+        raw = round(max_points * (1 - ((days_open - decay_start) / (decay_days - decay_start))), 1)
+        explanation = f"Posted {days_open} days ago"
+
+    floor = cfg.get('reputable_floor', 0)
+    if floor and raw < floor and _reputable(listing, config, inputs):
+        return f"{explanation}; reputable floor {floor} (still live, brand-viable)"
+    return explanation
+
+
+def _specificity(listing, config, inputs, points):
+    cfg = config['specificity']
+    details = []
+    if listing.salary_min or listing.salary_max:
+        details.append("has salary")
+    if listing.location and len(listing.location) > 5:
+        details.append("has location")
+    desc_len = len(listing.description) if listing.description else 0
+    if desc_len >= cfg['min_description_length']:
+        details.append(f"quality description ({desc_len} chars)")
+    elif desc_len > 0:
+        details.append(f"partial description ({desc_len} chars)")
+    if cfg.get('tools_stack', 0):
+        skills_count = getattr(listing, 'skills_count', 0) or 0
+        if skills_count >= cfg.get('min_tools_count', 5):
+            details.append(f"named stack ({skills_count} tools)")
+    return ", ".join(details) if details else "minimal info"
+
+
+def _company_velocity(listing, config, inputs, points):
+    cfg = config['company_velocity']
+    lookback = cfg.get('lookback_days', 30)
+    if not _normalize_company_name(listing.company_name):
+        return "No company name"
+    count = inputs['velocity']
+    if count <= 0:
+        return f"No new listings in {lookback}d"
+
+    diversity_scale, ratio = _diversity(config, inputs)
+    if cfg.get('age_scaled', False):
+        decay = _age_decay(listing, config)
+        age = listing.days_since_first_seen()
+        if ratio is not None and diversity_scale < 1.0:
+            return (
+                f"{count} new in {lookback}d (×{decay:.2f} age {age}d, "
+                f"×{diversity_scale:.2f} diversity {ratio:.0%})"
+            )
+        return f"{count} new listings in {lookback}d (×{decay:.2f} age {age}d)"
+    if ratio is not None and diversity_scale < 1.0:
+        return f"{count} new in {lookback}d (×{diversity_scale:.2f} diversity {ratio:.0%})"
+    return f"{count} new listings in {lookback}d"
+
+
+def _ats_behavior(listing, config, inputs, points):
+    details = []
+    if listing.repost_count > 0:
+        details.append("description updated")
+    if listing.company_id is not None and inputs['closing']:
+        details.append("company closing roles")
+    return ", ".join(details) if details else "no ATS signals"
+
+
+def _company_reputation(listing, config, inputs, points):
+    cfg = config['company_reputation']
+    name = _normalize_company_name(listing.company_name)
+    if not name:
+        return "No company name"
+
+    base_pts = 0
+    label = None
+    if inputs['featured']:
+        base_pts = cfg.get('featured_employer_bonus', 8)
+        label = "Featured employer"
+    else:
+        tier = cfg.get('overrides', {}).get(name)
+        if tier == 1:
+            base_pts = cfg.get('tier_1_bonus', 8)
+            label = "Tier 1 reputable"
+        elif tier == 2:
+            base_pts = cfg.get('tier_2_bonus', 4)
+            label = "Tier 2 reputable"
+    if base_pts <= 0:
+        return "Standard company"
+
+    if cfg.get('age_scaled', False):
+        decay = _age_decay(listing, config)
+        return f"{label} ({listing.company_name}) ×{decay:.2f} age {listing.days_since_first_seen()}d"
+    return f"{label} ({listing.company_name})"
+
+
+def _industry_adjustment(listing, config, inputs, points):
+    cfg = config['industry_adjustment']
+    industry = inputs.get('industry')
+    if not industry:
+        return "Unknown industry"
+    if any(ind in industry for ind in cfg['slow_industries']):
+        return f"Slow-hiring industry ({industry})"
+    if any(ind in industry for ind in cfg['fast_industries']):
+        if listing.days_since_first_seen() > 14:
+            return f"Fast-hiring industry, old listing ({industry})"
+        return f"Fast-hiring industry ({industry})"
+    return f"Standard industry ({industry})"
+
+
+def _data_completeness(listing, config, inputs, points):
+    cfg = config.get('data_completeness', {})
+    if not cfg:
+        return "No data_completeness config"
+    details = []
+    if getattr(listing, 'has_requirements', False):
+        details.append("requirements")
+    if getattr(listing, 'has_benefits', False):
+        details.append("benefits")
+    if getattr(listing, 'has_company_logo', False):
+        details.append("logo")
+    if getattr(listing, 'has_company_website', False):
+        details.append("website")
+    skills_count = getattr(listing, 'skills_count', 0) or 0
+    if skills_count >= cfg.get('min_skills_count', 3):
+        details.append(f"{skills_count} skills")
+    return ", ".join(details) if details else "minimal data"
+
+
+def _classification_confidence(listing, config, inputs, points):
+    cfg = config.get('classification_confidence', {})
+    if not cfg:
+        return "No classification_confidence config"
+    confidence = getattr(listing, 'classification_confidence', None)
+    if confidence is None:
+        return "No classification data"
+    if confidence >= cfg.get('high_threshold', 0.8):
+        return f"High confidence ({confidence:.0%})"
+    if confidence <= cfg.get('low_threshold', 0.3):
+        return f"Low confidence ({confidence:.0%})"
+    return f"Moderate confidence ({confidence:.0%})"
+
+
+def _publisher_trustworthiness(listing, config, inputs, points):
+    cfg = config.get('publisher_trustworthiness', {})
+    if not cfg:
+        return "No publisher_trustworthiness config"
+    source = getattr(listing, 'source_ats', '') or ''
+    publisher = getattr(listing, 'publisher', '') or ''
+    if source.lower() in cfg.get('direct_ats_sources', []):
+        return f"Direct ATS ({source})"
+    if publisher.lower() in cfg.get('known_publishers', []) or source.lower() in cfg.get('known_publishers', []):
+        return f"Known publisher ({publisher or source})"
+    return f"Unknown publisher ({publisher or source})"
+
+
+def _template_farm_penalty(listing, config, inputs, points):
+    cfg = config.get('template_farm', {})
+    if not inputs['diversity']:
+        return "No diversity data"
+    distinct, total = inputs['diversity']
+    if total < cfg.get('min_listings', 5):
+        return f"Too few listings ({total}) to evaluate"
+    ratio = distinct / total if total else 1.0
+    if ratio >= cfg.get('explicit_penalty_threshold', 0.2):
+        return f"Diversity OK ({ratio:.0%})"
+    return f"Template farm: {distinct} unique of {total} listings ({ratio:.0%})"
+
+
+def _repost_penalty(listing, config, inputs, points):
+    if listing.repost_count == 0:
+        return "No reposts"
+    multiplier = config['repost_penalty'].get('penalty_multiplier', 1.0)
+    if multiplier != 1.0:
+        return f"{listing.repost_count} repost(s) ×{multiplier} multiplier"
+    return f"{listing.repost_count} repost(s)"
+
+
+def _evergreen_penalty(listing, config, inputs, points):
+    threshold = config['evergreen_penalty']['threshold_days']
+    days_open = listing.days_since_first_seen()
+    if days_open < threshold:
+        return f"Open {days_open} days (under {threshold}d threshold)"
+    return f"Evergreen listing ({days_open} days, {listing.repost_count} updates)"
+
+
+def _boilerplate_penalty(listing, config, inputs, points):
+    ratio = inputs.get('boilerplate')
+    if ratio is None:
+        return "No company profile"
+    if ratio < config['boilerplate_penalty']['high_ratio_threshold']:
+        return f"Boilerplate ratio: {ratio:.0%}"
+    return f"High boilerplate ({ratio:.0%})"
+
+
+def _stale_penalty(listing, config, inputs, points):
+    if not listing.date_last_seen:
+        return "No last-seen date"
+    days_since_seen = (timezone.now() - listing.date_last_seen).days
+    if days_since_seen < config['stale_penalty']['stale_threshold_days']:
+        return f"Last seen {days_since_seen} days ago"
+    return f"Stale ({days_since_seen} days since last seen)"
+
+
+_EXPLAINERS = {
+    'base': _base,
+    'freshness': _freshness,
+    'specificity': _specificity,
+    'company_velocity': _company_velocity,
+    'ats_behavior': _ats_behavior,
+    'company_reputation': _company_reputation,
+    'industry_adjustment': _industry_adjustment,
+    'data_completeness': _data_completeness,
+    'classification_confidence': _classification_confidence,
+    'publisher_trustworthiness': _publisher_trustworthiness,
+    'template_farm_penalty': _template_farm_penalty,
+    'repost_penalty': _repost_penalty,
+    'evergreen_penalty': _evergreen_penalty,
+    'boilerplate_penalty': _boilerplate_penalty,
+    'stale_penalty': _stale_penalty,
+}
@@ -0,0 +1,190 @@
+"""
+Change tracking for incremental HAS rescoring.
+
+The nightly `score_listings --force` recomputes every active listing although
+most inputs haven't moved since yesterday. A score only changes when:
+
+1. the listing's own scoring inputs change — sync_genzjobs compares
+   scoring_signature() before and after it writes a row and marks the changed
+   ones (mark_for_rescore);
+2. the clock crosses a day boundary that moves a time-based signal
+   (freshness decay, evergreen/industry thresholds, stale penalty) — predicted
+   analytically at scoring time and stored as HiringActivityScore.rescore_at
+   (see batch._rescore_at);
+3. a company-level input moves — the velocity tier, diversity scale,
+   template-farm penalty or reputable flag of a company name, or the
+   industry/boilerplate ratio/recent-closure flag of a Company.
+   mark_company_changes() diffs these against CompanySignalState and marks the
+   listings of every company whose inputs changed.
+
+`score_listings --incremental` runs (3), then rescores active listings that
+have no score or whose rescore_at is due (dirty_listings()).
+
+Company signatures use the base config's velocity/template-farm/reputation
+sections; the industry profiles don't override those. If one ever does, add
+its config to company_name_signatures().
+"""
+
+from django.db.models import Q
+from django.db.models.functions import Lower, Trim
+from django.utils import timezone
+
+from .batch import CLOSING_LOOKBACK_DAYS
+
+
+# ScrapedJobListing fields the HAS signals read (see signals.py), apart from
+# date_last_seen, which every sync rewrites and which only matters once the
+# listing has gone stale (see scoring_signature).
+SCORING_FIELDS = (
+    'company_name', 'company_id', 'location', 'salary_min', 'salary_max',
+    'skills_count', 'repost_count', 'has_requirements', 'has_benefits',
+    'has_company_logo', 'has_company_website', 'classification_confidence',
+    'publisher', 'source_ats', 'industry_category', 'date_posted_external',
+    'date_first_seen',
+)
+
+_MARK_CHUNK = 500
+
+
+def scoring_signature(listing, stale_days):
+    """
+    The listing's scoring inputs as a comparable tuple. Description counts by
+    length (all that specificity reads); date_last_seen only as "stale or
+    not" — re-seeing a fresh listing changes nothing, re-seeing a stale one
+    lifts its stale penalty.
+    """
+    stale = listing.date_last_seen is not None and listing.is_stale(days=stale_days)
+    return (
+        tuple(getattr(listing, field) for field in SCORING_FIELDS)
+        + (len(listing.description or ''), stale)
+    )
+
+
+def mark_for_rescore(listing_ids, now=None):
+    """Make the scores of `listing_ids` due now. Returns rows marked."""
+    from jobs.models import HiringActivityScore
+
+    now = now or timezone.now()
+    listing_ids = list(listing_ids)
+    marked = 0
+    for i in range(0, len(listing_ids), _MARK_CHUNK):
+        marked += HiringActivityScore.objects.filter(
+            listing_id__in=listing_ids[i:i + _MARK_CHUNK],
+        ).exclude(rescore_at__lte=now).update(rescore_at=now)
+    return marked
+
+
+def dirty_listings(queryset, now=None):
+    """Restrict a ScrapedJobListing queryset to rows whose score is missing or due."""
+    now = now or timezone.now()
+    return queryset.filter(
+        Q(activity_score__isnull=True) | Q(activity_score__rescore_at__lte=now)
+    )
+
+
+def company_name_signatures(engine):
+    """
+    {'name:<normalized name>': signature} for every company name with
+    velocity, diversity or reputation input. Call after engine.prepare_caches().
+    """
+    config = engine.config
+    velocity_cfg = config['company_velocity']
+    farm_cfg = config.get('template_farm', {})
+    velocity_map = engine._velocity_map or {}
+    diversity_map = engine._diversity_map or {}
+    reputable = engine._reputable_set(config)
+
+    signatures = {}
+    for name in set(velocity_map) | set(diversity_map) | reputable:
+        count = velocity_map.get(name, 0)
+        tier_points = 0
+        for threshold, points in velocity_cfg.get('tiers', []):
+            if count >= threshold:
+                tier_points = points
+                break
+        scale, penalized = 1.0, False
+        entry = diversity_map.get(name)
+        if entry and entry[1] >= farm_cfg.get('min_listings', 5):
+            distinct, total = entry
+            ratio = distinct / total if total else 1.0
+            scale = min(1.0, ratio * farm_cfg.get('velocity_scale_factor', 1.5))
+            penalized = ratio < farm_cfg.get('explicit_penalty_threshold', 0.2)
+        signatures[f'name:{name}'] = (
+            f'v{tier_points}|d{scale!r}|f{int(penalized)}|r{int(name in reputable)}'
+        )
+    return signatures
+
+
+def company_signatures(now=None):
+    """{'company:<id>': signature} — industry, boilerplate ratio, recent closure."""
+    from datetime import timedelta
+    from jobs.models import Company, ScrapedJobListing
+
+    now = now or timezone.now()
+    closing = set(
+        ScrapedJobListing.objects.filter(
+            company__isnull=False,
+            status='closed',
+            date_removed__gte=now - timedelta(days=CLOSING_LOOKBACK_DAYS),
+        ).values_list('company_id', flat=True).distinct()
+    )
+    rows = Company.objects.values_list('pk', 'industry', 'hiring_profile__boilerplate_ratio')
+    return {
+        f'company:{pk}': f'i{(industry or "").lower()}|b{ratio!r}|c{int(pk in closing)}'
+        for pk, industry, ratio in rows.iterator(chunk_size=2000)
+    }
+
+
+def mark_company_changes(engine, now=None):
+    """
+    Diff the current company-level inputs against CompanySignalState, mark
+    the listings of every changed company for rescore and store the new
+    state. Returns (companies_changed, scores_marked). The first run, with no
+    stored state, marks every listing that has a company input.
+    """
+    from jobs.models import CompanySignalState, HiringActivityScore, ScrapedJobListing
+
+    now = now or timezone.now()
+    if engine._velocity_map is None:
+        engine.prepare_caches()
+    current = company_name_signatures(engine)
+    current.update(company_signatures(now))
+    stored = dict(CompanySignalState.objects.values_list('key', 'signature'))
+
+    changed = [key for key, signature in current.items() if stored.get(key) != signature]
+    dropped = [key for key in stored if key not in current]
+
+    names, company_ids = [], []
+    for key in changed + dropped:
+        kind, _sep, value = key.partition(':')
+        if kind == 'name':
+            names.append(value)
+        else:
+            company_ids.append(int(value))
+
+    due = HiringActivityScore.objects.exclude(rescore_at__lte=now)
+    marked = 0
+    for i in range(0, len(names), _MARK_CHUNK):
+        listing_ids = (
+            ScrapedJobListing.objects
+            .annotate(_norm=Lower(Trim('company_name')))
+            .filter(_norm__in=names[i:i + _MARK_CHUNK])
+            .values('pk')
+        )
+        marked += due.filter(listing__in=listing_ids).update(rescore_at=now)
+    for i in range(0, len(company_ids), _MARK_CHUNK):
+        marked += due.filter(
+            listing__company_id__in=company_ids[i:i + _MARK_CHUNK],
+        ).update(rescore_at=now)
+
+    if changed:
+        CompanySignalState.objects.bulk_create(
+            [CompanySignalState(key=key, signature=current[key]) for key in changed],
+            update_conflicts=True,
+            unique_fields=['key'],
+            update_fields=['signature', 'updated_at'],
+            batch_size=1000,
+        )
+    for i in range(0, len(dropped), _MARK_CHUNK):
+        CompanySignalState.objects.filter(key__in=dropped[i:i + _MARK_CHUNK]).delete()
+    return len(changed) + len(dropped), marked
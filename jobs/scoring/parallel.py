@@ -0,0 +1,134 @@
+"""
+Multi-process HAS scoring over pk-range shards.
+
+Batch scoring (batch.py) removed the per-row queries; what's left of a full
+rescore is Python signal math, which one process runs on one core. With
+`score_listings --workers N` the listings are split into contiguous pk ranges
+(several per worker, so a slow range doesn't leave the others idle) and fed
+to a pool of N processes as a work queue:
+
+- the company maps from prepare_caches() are built once in the parent and
+  handed to each worker as a snapshot (copy-on-write under fork, pickled
+  under spawn) — the aggregate over every listing doesn't run N times;
+- each worker opens its own DB connection (the parent closes its connections
+  before the pool starts, so none is shared across a fork) and writes with
+  save_batch();
+- each shard returns its band/publish counts, summed in the parent.
+
+Usage:
+    stats = score_rows(engine, rows, save=True)                   # in-process
+    stats = score_sharded(queryset, pks, engine, workers=4)       # N processes
+"""
+
+import multiprocessing
+
+from django.db import connections
+
+from .batch import BATCH_SIZE, iter_batches
+
+
+# Shards per worker: enough that uneven ranges even out across the pool.
+SHARDS_PER_WORKER = 4
+
+_worker_engine = None
+
+
+def empty_stats():
+    return {
+        'scored': 0,
+        'published': 0,
+        'by_band': {'very_active': 0, 'likely_active': 0, 'uncertain': 0, 'low_signal': 0},
+    }
+
+
+def merge_stats(total, part):
+    total['scored'] += part['scored']
+    total['published'] += part['published']
+    for band, count in part['by_band'].items():
+        total['by_band'][band] = total['by_band'].get(band, 0) + count
+    return total
+
+
+def score_rows(engine, rows, save=True, min_score=0, on_result=None):
+    """
+    Score ScrapedJobListings from `rows` (company select_related) in batches.
+
+    Results at or above `min_score` are passed to `on_result` (for display)
+    and, with `save`, written per batch via engine.save_batch(). Returns the
+    stats dict (see empty_stats).
+    """
+    stats = empty_stats()
+    for batch in iter_batches(rows, BATCH_SIZE):
+        to_save = []
+        for result in engine.score_batch(batch):
+            stats['by_band'][result.band] += 1
+            if result.total < min_score:
+                continue
+            stats['scored'] += 1
+            if engine.should_publish(result.total):
+                stats['published'] += 1
+            if on_result is not None:
+                on_result(result)
+            to_save.append(result)
+        if save:
+            # One upsert + one reconciling UPDATE per batch.
+            engine.save_batch(to_save)
+    return stats
+
+
+def plan_shards(pks, count):
+    """Split sorted `pks` into at most `count` contiguous (first, last) ranges."""
+    if not pks:
+        return []
+    size = -(-len(pks) // count)
+    return [(pks[i], pks[min(i + size, len(pks)) - 1]) for i in range(0, len(pks), size)]
+
+
+def _init_worker(snapshot):
+    from .engine import HASEngine
+
+    global _worker_engine
+    _worker_engine = HASEngine()
+    _worker_engine.load_cache_snapshot(snapshot)
+
+
+def _score_shard(task):
+    from jobs.models import ScrapedJobListing
+
+    query, first, last, save, min_score = task
+    queryset = ScrapedJobListing.objects.all()
+    queryset.query = query
+    rows = (
+        queryset.filter(pk__gte=first, pk__lte=last)
+        .select_related('company').order_by('pk')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    try:
+        return score_rows(_worker_engine, rows, save=save, min_score=min_score)
+    finally:
+        connections.close_all()
+
+
+def score_sharded(queryset, pks, engine, workers, save=True, min_score=0, on_shard=None):
+    """
+    Score the listings of `queryset` whose pk is in sorted `pks`, across
+    `workers` processes. `queryset` must be unsliced (shards filter it by pk
+    range). `on_shard(done, total, stats)` is called as each shard finishes.
+    Returns the merged stats.
+    """
+    shards = plan_shards(pks, workers * SHARDS_PER_WORKER)
+    tasks = [(queryset.query, first, last, save, min_score) for first, last in shards]
+    stats = empty_stats()
+
+    # Children must not inherit (and later close) the parent's connections.
+    connections.close_all()
+    with multiprocessing.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(engine.cache_snapshot(),),
+    ) as pool:
+        for done, part in enumerate(pool.imap_unordered(_score_shard, tasks), start=1):
+            merge_stats(stats, part)
+            if on_shard is not None:
+                on_shard(done, len(tasks), stats)
+    return stats
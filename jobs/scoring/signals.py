@@ -226,11 +226,16 @@ def calculate_company_velocity(listing, config, velocity_map=None, diversity_map
     return scaled, f"{count} new listings in {lookback}d"
 
 
-def calculate_ats_behavior(listing, config):
+def calculate_ats_behavior(listing, config, closing_companies=None):
     """
     Calculate ATS behavior score based on listing changes.
     Awards points for description updates and similar role closures.
 
+    Args:
+        closing_companies: optional set of company ids with a listing closed in
+            the last 30 days, for batch scoring. If None, queries inline
+            (single-listing path).
+
     Returns:
         tuple: (points, explanation)
     """
@@ -248,10 +253,13 @@ def calculate_ats_behavior(listing, config):
     # Similar role closures would require checking other listings
     # Simplified: check if company has closed listings recently
     if listing.company:
-        closed_recently = listing.company.scraped_listings.filter(
-            status='closed',
-            date_removed__gte=timezone.now() - timedelta(days=30)
-        ).exists()
+        if closing_companies is not None:
+            closed_recently = listing.company_id in closing_companies
+        else:
+            closed_recently = listing.company.scraped_listings.filter(
+                status='closed',
+                date_removed__gte=timezone.now() - timedelta(days=30)
+            ).exists()
 
         if closed_recently:
             points += cfg['similar_role_closed']
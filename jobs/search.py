@@ -0,0 +1,139 @@
+"""
+Listing search shared by the /jobs/ feed, the homepage and the directory sidebar.
+
+Observed listings are matched against a maintained tsvector column
+(ScrapedJobListing.search_vector, GIN-indexed in 0031) covering title, company,
+location and description, and ranked with ts_rank. This replaces the
+title/company/location ILIKE chain in job_list, which had to drop description
+entirely: `description ILIKE '%term%'` seq-scanned ~67k rows (~20.8s) and was
+what tripped the 60s gunicorn timeout when a bot fired broad /jobs/?search=
+queries. A GIN lookup costs the same whatever the query, and the raw input is
+normalized and capped (MAX_QUERY_LENGTH / MAX_TERMS) before it reaches SQL.
+
+The vector is written set-based by update_search_vectors() — sync_genzjobs
+calls it per batch, and `manage.py update_search_index` backfills/repairs.
+
+SQLite (dev/test) has no tsvector: matching falls back to icontains across the
+same four columns and rank is unavailable.
+
+Usage:
+    search = ListingSearch(request.GET.get('search', ''))
+    if search:
+        observed_qs = search.filter_observed(observed_qs)
+        verified_qs = search.filter_verified(verified_qs)
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast, Left
+
+
+SEARCH_CONFIG = 'english'
+
+# Input caps. Long or many-term queries are what a scraping bot sends; real
+# searches ("senior react remote") are a few words.
+MAX_QUERY_LENGTH = 100
+MAX_TERMS = 8
+
+# Only the head of each description is indexed: it's where title/stack/
+# location detail lives, and it bounds the cost of building each vector.
+DESCRIPTION_INDEX_CHARS = 20000
+
+# Strip everything except word characters and the few symbols that appear in
+# real queries (c++, c#, .net, node.js, full-time).
+_STRIP_RE = re.compile(r'[^\w\s+#.\-]')
+
+
+def normalize_query(raw):
+    """Collapse whitespace, drop punctuation and cap length/term count."""
+    if not raw:
+        return ''
+    text = _STRIP_RE.sub(' ', raw[:MAX_QUERY_LENGTH * 2])
+    terms = text.split()[:MAX_TERMS]
+    return ' '.join(terms)[:MAX_QUERY_LENGTH].strip()
+
+
+def listing_search_vector():
+    """Weighted tsvector expression for a ScrapedJobListing row."""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('company_name', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('location', weight='C', config=SEARCH_CONFIG)
+        + SearchVector(Left('description', DESCRIPTION_INDEX_CHARS), weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """
+    Recompute search_vector for every row in `queryset` in one UPDATE.
+
+    Returns rows written; a no-op (0) off Postgres.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return 0
+    return queryset.update(search_vector=listing_search_vector())
+
+
+class ListingSearch:
+    """A normalized search query and the filters/ranking built from it."""
+
+    def __init__(self, raw):
+        self.raw = raw or ''
+        self.text = normalize_query(self.raw)
+
+    def __bool__(self):
+        return bool(self.text)
+
+    def _query(self):
+        # websearch syntax never raises on user input (unbalanced quotes, a
+        # lone "-", etc.), unlike to_tsquery.
+        return SearchQuery(self.text, search_type='websearch', config=SEARCH_CONFIG)
+
+    @staticmethod
+    def _uses_tsvector(queryset):
+        return connections[queryset.db].vendor == 'postgresql'
+
+    def filter_observed(self, queryset):
+        """Restrict a ScrapedJobListing queryset to rows matching the query."""
+        if not self:
+            return queryset
+        if self._uses_tsvector(queryset):
+            return queryset.filter(search_vector=self._query())
+        return queryset.filter(
+            Q(title__icontains=self.text) |
+            Q(company_name__icontains=self.text) |
+            Q(location__icontains=self.text) |
+            Q(description__icontains=self.text)
+        )
+
+    def filter_verified(self, queryset):
+        """
+        Restrict a Job queryset to rows matching the query.
+
+        Verified postings are a tiny table, so a plain ILIKE across the four
+        columns is free and keeps substring matches ("engineer" in
+        "Engineering Manager") that stemming wouldn't.
+        """
+        if not self:
+            return queryset
+        return queryset.filter(
+            Q(title__icontains=self.text) |
+            Q(company__icontains=self.text) |
+            Q(description__icontains=self.text) |
+            Q(location__icontains=self.text)
+        )
+
+    def observed_rank(self, queryset):
+        """
+        ts_rank expression for ordering observed matches, or None off Postgres.
+
+        ts_rank returns float4; the feed keysets on this value and compares
+        the cursor's float8 with `=` / `<`, so it is cast to double precision
+        in SQL (a widened float4 round-trips exactly through the cursor).
+        """
+        if not self or not self._uses_tsvector(queryset):
+            return None
+        return Cast(SearchRank(F('search_vector'), self._query()), FloatField())
@@ -0,0 +1,201 @@
+"""
+Single-flight, stale-while-revalidate reads over the shared Django cache.
+
+A plain `cache.get()` / rebuild / `cache.set()` has two failure modes under
+gunicorn: with a per-process backend every worker rebuilds on its own
+schedule, and when a key expires every concurrent request runs the expensive
+queries at once (a stampede — for the homepage, a dozen COUNT/aggregate
+queries per request, landing on top of the 09:00 UTC rescore). This module:
+
+- stores each value in an envelope with its own "fresh until" time, and keeps
+  it in the cache for `stale_ttl` longer than that;
+- lets exactly one process rebuild an expired value (a lock holding a
+  per-acquire token; see "Locks" below);
+- serves the stale value to everyone else while the rebuild runs;
+- on a cold miss, has the losers wait briefly for the winner's result rather
+  than rebuild too.
+
+The cache is settings.CACHES['shared'] (SHARED_CACHE_BACKEND env var: file or
+redis in production) so every worker shares one copy. The file backend is
+per machine; `refresh_home_cache` and the commands' refreshes only reach the
+web service from a separate cron service (Render) with SHARED_CACHE_BACKEND
+=redis. Rate limiting stays on the per-process 'default' cache.
+
+Locks: on Redis, a `<key>:lock` entry set with cache.add (SET NX, expiring
+after LOCK_TIMEOUT). FileBasedCache.add() checks then writes, so there the
+lock is a file created with O_CREAT | O_EXCL in the cache's LOCATION
+directory (SHARED_CACHE_DIR); one older than LOCK_TIMEOUT was abandoned by a
+killed process and may be taken over. Either way the lock holds a random
+token and release_lock() only removes it while it still holds the caller's,
+so a rebuild that overran LOCK_TIMEOUT can't release its successor's lock.
+
+Usage:
+    data = get_or_refresh('home_page_data', build_home_payload, ttl=1800)
+    refresh('home_page_data', build_home_payload, ttl=1800)  # force, e.g. cron
+"""
+
+import logging
+import os
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+logger = logging.getLogger(__name__)
+
+SHARED_CACHE_ALIAS = 'shared'
+
+# How long a rebuild may hold the lock before another process may take over
+# (longer than any sane rebuild, shorter than the 60s gunicorn timeout so a
+# killed worker's lock can't block rebuilds for long).
+LOCK_TIMEOUT = 55
+
+# On a cold miss, how long a request waits for another process's rebuild.
+COLD_WAIT = 10
+_POLL_INTERVAL = 0.2
+
+
+def _cache():
+    return caches[SHARED_CACHE_ALIAS]
+
+
+def _lock_path(cache, key):
+    directory = settings.CACHES[SHARED_CACHE_ALIAS]['LOCATION']
+    return os.path.join(directory, f'{cache.make_key(key).replace(":", "_")}.lock')
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _take_file(path):
+    """
+    Atomically move the lock file at `path` aside; returns (moved path, its
+    token), or (None, None) if there was none. rename() picks out exactly one
+    file, so the token read afterwards is that file's, not a successor's.
+    """
+    moved = f'{path}.{uuid.uuid4().hex}'
+    try:
+        os.rename(path, moved)
+    except FileNotFoundError:
+        return None, None
+    return moved, _read(moved)
+
+
+def _put_back(moved, path):
+    """Undo _take_file(), unless a new lock was created in the meantime."""
+    try:
+        os.link(moved, path)
+    except FileExistsError:
+        pass
+    os.remove(moved)
+
+
+def _acquire_file_lock(path, token, timeout):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for _attempt in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) <= timeout:
+                    return False
+            except FileNotFoundError:
+                continue  # released meanwhile
+            stale = _read(path)
+            moved, held = _take_file(path)
+            if moved is None:
+                continue
+            if held != stale:
+                _put_back(moved, path)  # taken over by someone else first
+                return False
+            os.remove(moved)  # abandoned by a killed process
+            continue
+        with os.fdopen(fd, 'w') as f:
+            f.write(token)
+        return True
+    return False
+
+
+def acquire_lock(key, timeout=LOCK_TIMEOUT):
+    """
+    Try to take the rebuild lock for `key`. Returns the token to pass to
+    release_lock() if this process now holds it, else None.
+    """
+    cache = _cache()
+    token = uuid.uuid4().hex
+    if isinstance(cache, FileBasedCache):
+        acquired = _acquire_file_lock(_lock_path(cache, key), token, timeout)
+    else:
+        acquired = cache.add(f'{key}:lock', token, timeout)
+    return token if acquired else None
+
+
+def release_lock(key, token):
+    """Release the lock for `key` if it is still the one `token` acquired."""
+    cache = _cache()
+    if isinstance(cache, FileBasedCache):
+        path = _lock_path(cache, key)
+        moved, held = _take_file(path)
+        if moved is None:
+            return
+        if held == token:
+            os.remove(moved)
+        else:
+            _put_back(moved, path)  # expired and taken over; not ours
+        return
+    # get-then-delete leaves a window of one round trip in which the lock
+    # could expire and be re-taken; far narrower than a whole overrun.
+    if cache.get(f'{key}:lock') == token:
+        cache.delete(f'{key}:lock')
+
+
+def refresh(key, build, ttl, stale_ttl=None):
+    """Rebuild `key` now and store it; returns the new value."""
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+    started = time.monotonic()
+    value = build()
+    _cache().set(key, {'value': value, 'fresh_until': time.time() + ttl}, ttl + stale_ttl)
+    logger.info('Rebuilt cache key %s in %.2fs', key, time.monotonic() - started)
+    return value
+
+
+def get_or_refresh(key, build, ttl, stale_ttl=None, wait=COLD_WAIT):
+    """
+    Cached value for `key`, rebuilt by `build()` at most once at a time.
+
+    Fresh value: returned as-is. Expired but within `stale_ttl`: returned
+    as-is unless this process wins the lock, in which case it rebuilds.
+    Missing: the lock winner builds; others wait up to `wait` seconds for it,
+    then build themselves rather than fail the request.
+    """
+    cache = _cache()
+    entry = cache.get(key)
+    if entry is not None and entry['fresh_until'] > time.time():
+        return entry['value']
+
+    token = acquire_lock(key)
+    if token:
+        try:
+            return refresh(key, build, ttl, stale_ttl)
+        finally:
+            release_lock(key, token)
+
+    if entry is not None:
+        return entry['value']
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value']
+    logger.warning('Timed out waiting for cache rebuild of %s; building inline', key)
+    return refresh(key, build, ttl, stale_ttl)
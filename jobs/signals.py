@@ -1,7 +1,9 @@
 from allauth.account.signals import user_signed_up
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import UserProfile
+from .models import EmailVerification, Job, JobApplication, PhoneVerification, UserProfile
 
 
 @receiver(user_signed_up)
@@ -14,3 +16,56 @@ def create_profile_for_allauth_signup(request, user, **kwargs):
     one exists (e.g. edit_profile).
     """
     UserProfile.objects.get_or_create(user=user, defaults={'user_type': 'job_seeker'})
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def bump_feed_generation_on_job_change(sender, instance, **kwargs):
+    """
+    Verified postings are the top tier of /jobs/; retire cached anonymous
+    pages so a new or edited posting shows up immediately rather than after
+    the page-cache TTL (jobs/pagecache.py).
+    """
+    from .pagecache import bump_generation
+    bump_generation()
+
+
+@receiver(post_save, sender=UserProfile)
+def refresh_candidate_index_on_profile_save(sender, instance, **kwargs):
+    """
+    Recompute the profile's candidate-search columns (contact_verified,
+    search_vector) after every save: a full save() writes back whatever
+    copies of them the instance holds. See jobs/candidates.py.
+    """
+    from .candidates import refresh_candidates
+    refresh_candidates(UserProfile.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=PhoneVerification)
+@receiver(post_delete, sender=PhoneVerification)
+@receiver(post_save, sender=EmailVerification)
+@receiver(post_delete, sender=EmailVerification)
+def refresh_candidate_index_on_verification(sender, instance, **kwargs):
+    """A verification changed: recompute the profile's contact_verified."""
+    from .candidates import refresh_candidates
+    refresh_candidates(UserProfile.objects.filter(user_id=instance.user_id))
+
+
+@receiver(post_save, sender=User)
+def refresh_candidate_index_on_name_change(sender, instance, update_fields=None, **kwargs):
+    """The name is part of the search document; last_login saves skip this."""
+    if update_fields is not None and not {'first_name', 'last_name'} & set(update_fields):
+        return
+    from .candidates import refresh_candidates
+    refresh_candidates(UserProfile.objects.filter(user_id=instance.pk))
+
+
+@receiver(post_delete, sender=JobApplication)
+def rebuild_ats_rollup_on_application_delete(sender, instance, origin=None, **kwargs):
+    """
+    The ATS analytics rollup keeps counts of deleted applications; rebuild
+    the employer's rows on commit. Also fires for applications deleted with
+    their job or applicant. See jobs/ats_analytics.py.
+    """
+    from .ats_analytics import rebuild_after_delete
+    rebuild_after_delete(instance, origin)
@@ -399,7 +399,7 @@ def has_tooltip(listing):
     except Exception:
         return ''
 
-    breakdown = has.score_breakdown
+    breakdown = has.explained_breakdown
     if not breakdown:
         return ''
 
@@ -1004,6 +1004,48 @@ class CompanyModelTest(TestCase):
         self.assertEqual(found.name, 'New Company LLC')
 
 
+class CompanyResolverTest(TestCase):
+    """Indexed exact/alias/fuzzy company resolution (jobs/companies.py)"""
+
+    def setUp(self):
+        self.acme = Company.objects.create(name='Acme Corporation')
+        for name in ['Globex', 'Initech', 'Umbrella Health', 'Acme Tools']:
+            Company.objects.create(name=name)
+
+    def test_fuzzy_match_is_remembered_as_alias(self):
+        from jobs.companies import CompanyResolver
+        from jobs.models import CompanyAlias
+        ids = CompanyResolver().resolve_many(['Acme Corporation.', 'acme corporation'])
+        self.assertEqual(set(ids.values()), {self.acme.pk})
+        self.assertEqual(
+            list(CompanyAlias.objects.values_list('alias', 'company_id')),
+            [('acme corporation.', self.acme.pk)],
+        )
+        # A fresh resolver finds it by exact lookup, no fuzzy pass.
+        resolver = CompanyResolver()
+        with patch('jobs.companies.SequenceMatcher') as matcher:
+            self.assertEqual(
+                resolver.resolve_many(['Acme Corporation.']),
+                {'Acme Corporation.': self.acme.pk},
+            )
+            matcher.assert_not_called()
+
+    def test_new_names_in_one_batch_create_one_company(self):
+        from jobs.companies import CompanyResolver
+        resolver = CompanyResolver()
+        with self.assertNumQueries(3):
+            # bulk insert, pk lookup, alias insert
+            ids = resolver.resolve_many(['Zeta Labs Inc', 'Zeta Labs Inc.', 'Globex'])
+        self.assertEqual(ids['Zeta Labs Inc'], ids['Zeta Labs Inc.'])
+        self.assertEqual(resolver.last_created, {ids['Zeta Labs Inc']})
+        self.assertEqual(Company.objects.filter(name__startswith='Zeta').count(), 1)
+
+    def test_unrelated_name_is_not_matched(self):
+        company, created = Company.find_or_create('Acme Bakery')
+        self.assertTrue(created)
+        self.assertNotEqual(company.pk, self.acme.pk)
+
+
 class ScrapedJobListingModelTest(TestCase):
     """Test ScrapedJobListing model behavior"""
 
@@ -1030,6 +1072,50 @@ class ScrapedJobListingModelTest(TestCase):
         self.assertIsNotNone(self.listing.description_hash)
         self.assertEqual(len(self.listing.description_hash), 64)  # SHA-256 hex
 
+    def test_fingerprint_recomputed_only_when_inputs_change(self):
+        from unittest import mock
+        listing = ScrapedJobListing.objects.get(pk=self.listing.pk)
+        original = listing.description_hash
+        with mock.patch('jobs.fingerprints.description_hash') as rehash:
+            listing.status = 'closed'
+            listing.save()
+            listing.save(update_fields=['status'])
+        rehash.assert_not_called()
+
+        listing.description = '<p>We are looking for a STAFF engineer</p>'
+        listing.save()
+        self.assertNotEqual(listing.description_hash, original)
+        listing.refresh_from_db()
+        self.assertEqual(
+            listing.description_hash,
+            ScrapedJobListing.objects.get(pk=listing.pk).description_hash,
+        )
+
+    def test_status_only_save_is_a_plain_update(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        listing = ScrapedJobListing.objects.only('id', 'status').get(pk=self.listing.pk)
+        with CaptureQueriesContext(connection) as queries:
+            listing.status = 'closed'
+            listing.save(update_fields=['status'])
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('UPDATE'))
+
+    def test_fingerprint_listings_hashes_shared_descriptions_once(self):
+        from unittest import mock
+        from jobs import fingerprints
+        copies = [
+            ScrapedJobListing(title='Nurse', company_name='Care Co', description='Same text', location=city)
+            for city in ('Austin, TX', 'Dallas, TX', 'Houston, TX')
+        ]
+        with mock.patch.object(
+            fingerprints, 'description_hash', wraps=fingerprints.description_hash,
+        ) as rehash:
+            self.assertEqual(fingerprints.fingerprint_listings(copies), 3)
+            self.assertEqual(fingerprints.fingerprint_listings(copies), 0)
+        self.assertEqual(rehash.call_count, 1)
+        self.assertEqual(len({listing.description_hash for listing in copies}), 1)
+
     def test_days_since_first_seen(self):
         """days_since_first_seen should calculate correctly"""
         days = self.listing.days_since_first_seen()
@@ -1330,6 +1416,1639 @@ class MarketListingsViewTest(TestCase):
         self.assertEqual(response.status_code, 302)  # Redirect with error
 
 
+class UnifiedFeedPaginationTest(TestCase):
+    """Keyset-paginated /jobs/ feed (jobs/feed.py)"""
+
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123')
+        for i in range(3):
+            Job.objects.create(
+                title=f'Verified Role {i}', company='Test Corp',
+                description='Verified posting.', location='Austin, TX',
+                posted_by=self.employer,
+            )
+        now = timezone.now()
+        for i in range(30):
+            listing = ScrapedJobListing.objects.create(
+                source_ats='greenhouse',
+                source_url=f'https://boards.greenhouse.io/test/{i}',
+                company_name='Feed Corp',
+                title=f'Observed Role {i}',
+                description='Observed listing.',
+                location='Austin, TX',
+                published_to_board=True,
+                status='active',
+                date_posted_external=now - timedelta(days=i),
+            )
+            # Ties on purpose (i % 10) so the pk tiebreak is exercised.
+            HiringActivityScore.objects.create(
+                listing=listing, total_score=65 + (i % 10), score_breakdown={}
+            )
+
+    def _walk(self, sort_mode):
+        """Follow next cursors to the end; returns [(kind, pk)] in feed order."""
+        seen = []
+        params = {'country': '', 'sort': sort_mode}
+        pages = 0
+        while True:
+            response = self.client.get(reverse('job_list'), params)
+            self.assertEqual(response.status_code, 200)
+            page = response.context['page_obj']
+            seen.extend((item.preview_kind, item.id) for item in page)
+            pages += 1
+            if not page.has_next:
+                break
+            params = {'country': '', 'sort': sort_mode, 'cursor': page.next_cursor}
+        return seen, pages
+
+    def test_walks_every_row_once_in_each_mode(self):
+        for sort_mode in ('relevant', 'newest', 'activity'):
+            seen, pages = self._walk(sort_mode)
+            self.assertEqual(pages, 2)
+            self.assertEqual(len(seen), 33)
+            self.assertEqual(len(set(seen)), 33)
+            # Verified tier always comes first.
+            self.assertEqual([kind for kind, _pk in seen[:3]], ['v', 'v', 'v'])
+
+    def test_activity_mode_orders_by_score_then_pk(self):
+        seen, _pages = self._walk('activity')
+        observed = [pk for kind, pk in seen if kind == 'o']
+        expected = list(
+            ScrapedJobListing.objects.order_by('-activity_score__total_score', '-pk')
+            .values_list('pk', flat=True)
+        )
+        self.assertEqual(observed, expected)
+
+    def test_previous_cursor_returns_prior_page(self):
+        from jobs.feed import Feed, FeedCursor, FeedSource, observed_sort_keys, verified_sort_keys
+
+        def page(token):
+            feed = Feed([
+                FeedSource(Job.objects.all(), verified_sort_keys('relevant'), group=0),
+                FeedSource(ScrapedJobListing.objects.all(), observed_sort_keys('relevant'), group=1),
+            ])
+            return feed.page(FeedCursor.decode(token), page_size=10)
+
+        first = page(None)
+        second = page(first.next_cursor)
+        third = page(second.next_cursor)
+        self.assertEqual(third.number, 3)
+        # Page 2 links back to the un-cursored first page.
+        self.assertIsNone(second.previous_cursor)
+        back = page(third.previous_cursor)
+        self.assertEqual(back.number, 2)
+        self.assertEqual([obj.pk for obj in back], [obj.pk for obj in second])
+        self.assertEqual([type(obj) for obj in back], [type(obj) for obj in second])
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        response = self.client.get(reverse('job_list'), {'country': '', 'cursor': 'not-a-cursor!!'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['page_obj'].number, 1)
+
+    def test_score_save_updates_persisted_rank_keys(self):
+        listing = ScrapedJobListing.objects.get(title='Observed Role 0')
+        self.assertEqual(listing.feed_activity, 65)
+        self.assertEqual(listing.feed_posted_at, listing.date_posted_external)
+        self.assertAlmostEqual(listing.feed_relevance, 0.5 * 65 + 30, places=1)
+
+        score = listing.activity_score
+        score.total_score = 90
+        score.save()
+        listing.refresh_from_db()
+        self.assertEqual(listing.feed_activity, 90)
+        self.assertAlmostEqual(listing.feed_relevance, 0.5 * 90 + 30, places=1)
+
+    def test_refresh_feed_ranks_reages_freshness(self):
+        from jobs.feed import refresh_feed_ranks
+        later = timezone.now() + timedelta(days=10)
+        refresh_feed_ranks(ScrapedJobListing.objects.all(), now=later)
+
+        fresh = ScrapedJobListing.objects.get(title='Observed Role 0')
+        self.assertAlmostEqual(fresh.feed_relevance, 0.5 * 65 + 20, places=1)
+        # Posted 35 days before `later`: the bonus has fully decayed.
+        aged = ScrapedJobListing.objects.get(title='Observed Role 25')
+        self.assertEqual(aged.feed_relevance, 0.5 * aged.feed_activity)
+        # Nothing left to re-age outside the window on a second pass.
+        window = ScrapedJobListing.objects.filter(
+            feed_posted_at__gte=later - timedelta(days=30)
+        ).count()
+        self.assertEqual(refresh_feed_ranks(ScrapedJobListing.objects.all(), now=later), window)
+
+
+class ListingSearchTest(TestCase):
+    """Shared listing search (jobs/search.py)"""
+
+    def setUp(self):
+        self.client = Client()
+        self.listing = ScrapedJobListing.objects.create(
+            source_ats='greenhouse',
+            source_url='https://boards.greenhouse.io/test/search',
+            company_name='Search Corp',
+            title='Platform Engineer',
+            description='Run our Kubernetes clusters and CI pipelines.',
+            location='Denver, CO',
+            published_to_board=True,
+            status='active',
+        )
+
+    def test_normalize_query_caps_terms_and_strips_punctuation(self):
+        from jobs.search import MAX_TERMS, normalize_query
+        self.assertEqual(normalize_query('  senior   react;  remote!! '), 'senior react remote')
+        self.assertEqual(normalize_query('c++ .net c#'), 'c++ .net c#')
+        self.assertEqual(len(normalize_query(' '.join(['word'] * 50)).split()), MAX_TERMS)
+        self.assertEqual(normalize_query('x' * 500), 'x' * 100)
+        self.assertEqual(normalize_query('!!!'), '')
+
+    def test_description_matches_observed_listing(self):
+        response = self.client.get(reverse('job_list'), {'country': '', 'search': 'kubernetes'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item.id for item in response.context['page_obj']], [self.listing.pk])
+
+    def test_observed_rank_is_double_precision_keyset_key(self):
+        from django.db.models import FloatField
+        from django.db.models.functions import Cast
+        from jobs.search import ListingSearch
+        search = ListingSearch('kubernetes')
+        with patch.object(ListingSearch, '_uses_tsvector', return_value=True):
+            rank = search.observed_rank(ScrapedJobListing.objects.all())
+        # float4 ts_rank is widened in SQL so the cursor's float compares equal.
+        self.assertIsInstance(rank, Cast)
+        self.assertIsInstance(rank.output_field, FloatField)
+
+    def test_punctuation_only_query_is_no_search(self):
+        response = self.client.get(reverse('job_list'), {'country': '', 'search': '%%%'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['search_query'], '')
+        self.assertEqual(len(response.context['page_obj']), 1)
+
+
+class LocationNormalizationTest(TestCase):
+    """Location parsing into country/region/city (jobs/locations.py)"""
+
+    def test_parse_location(self):
+        from jobs.locations import parse_location
+        self.assertEqual(parse_location('Austin, TX 78701'), ('US', 'TX', 'Austin', False))
+        self.assertEqual(parse_location('San Francisco, CA'), ('US', 'CA', 'San Francisco', False))
+        self.assertEqual(parse_location('Toronto, ON, CA'), ('CA', 'ON', 'Toronto', False))
+        self.assertEqual(parse_location('Remote - US'), ('US', '', '', True))
+        self.assertEqual(parse_location('Berlin, Germany'), ('DE', '', 'Berlin', False))
+        self.assertEqual(parse_location('Test City'), ('', '', 'Test City', False))
+
+    def test_save_sets_columns_and_feed_filters_on_country(self):
+        us = ScrapedJobListing.objects.create(
+            source_ats='greenhouse', source_url='https://boards.greenhouse.io/test/us',
+            company_name='Loc Corp', title='US Role', description='x',
+            location='Denver, CO', published_to_board=True, status='active',
+        )
+        ScrapedJobListing.objects.create(
+            source_ats='greenhouse', source_url='https://boards.greenhouse.io/test/ca',
+            company_name='Loc Corp', title='Canada Role', description='x',
+            location='Vancouver, BC', published_to_board=True, status='active',
+        )
+        self.assertEqual((us.country_code, us.region_code, us.city), ('US', 'CO', 'Denver'))
+
+        response = self.client.get(reverse('job_list'))
+        self.assertEqual([item.id for item in response.context['page_obj']], [us.pk])
+
+        job = Job.objects.create(
+            title='Remote Role', company='Loc Corp', description='x',
+            location='Anywhere', remote_status='remote',
+        )
+        self.assertTrue(job.is_remote)
+        self.assertEqual(job.country_code, '')
+
+
+class AnonymousPageCacheTest(TestCase):
+    """Whole-response cache for anonymous /jobs/ pages (jobs/pagecache.py)"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(username='cacheemployer', password='testpass123')
+        Job.objects.create(
+            title='Cached Role', company='Cache Corp', description='x',
+            location='Austin, TX', posted_by=self.employer,
+        )
+
+    def test_second_anonymous_hit_is_served_from_cache(self):
+        first = self.client.get(reverse('job_list'), {'country': ''})
+        self.assertContains(first, 'Cached Role')
+        with self.assertNumQueries(1):  # the generation lookup
+            second = self.client.get(reverse('job_list'), {'country': ''})
+        # Same body; only the (per-request, re-masked) CSRF token differs.
+        self.assertEqual(len(second.content), len(first.content))
+        self.assertContains(second, 'Cached Role')
+        self.assertNotContains(second, '<!--page-cache:')
+        self.assertContains(second, 'Sign Up')
+
+    def test_job_save_bumps_generation(self):
+        self.client.get(reverse('job_list'), {'country': ''})
+        Job.objects.create(
+            title='Fresh Role', company='Cache Corp', description='x',
+            location='Austin, TX', posted_by=self.employer,
+        )
+        response = self.client.get(reverse('job_list'), {'country': ''})
+        self.assertContains(response, 'Fresh Role')
+
+    def test_authenticated_and_unknown_params_bypass_cache(self):
+        from jobs.pagecache import anonymous_page_key
+        from jobs.views import JOB_LIST_PARAMS
+        from django.test import RequestFactory
+        from django.contrib.auth.models import AnonymousUser
+
+        request = RequestFactory().get('/jobs/', {'country': '', 'utm_source': 'x'})
+        request.user = AnonymousUser()
+        self.assertIsNone(anonymous_page_key(request, 'job_list', JOB_LIST_PARAMS, ''))
+        request = RequestFactory().get('/jobs/', {'country': ''})
+        request.user = self.employer
+        self.assertIsNone(anonymous_page_key(request, 'job_list', JOB_LIST_PARAMS, ''))
+
+        self.client.login(username='cacheemployer', password='testpass123')
+        response = self.client.get(reverse('job_list'), {'country': ''})
+        self.assertContains(response, 'cacheemployer')
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'www.example.com'])
+    def test_key_varies_by_host_not_raw_spelling(self):
+        from jobs.pagecache import anonymous_page_key
+        from jobs.views import JOB_LIST_PARAMS
+        from django.test import RequestFactory
+        from django.contrib.auth.models import AnonymousUser
+
+        def key(host='testserver', variant='search=nurse'):
+            request = RequestFactory().get('/jobs/', HTTP_HOST=host)
+            request.user = AnonymousUser()
+            return anonymous_page_key(request, 'job_list', JOB_LIST_PARAMS, variant)
+
+        self.assertNotEqual(key(), key(host='www.example.com'))
+        self.assertEqual(key(), key())
+
+        # Spellings that normalize to the same search share one entry.
+        self.client.get(reverse('job_list'), {'country': '', 'search': 'Cached'})
+        with self.assertNumQueries(1):  # the generation lookup
+            response = self.client.get(reverse('job_list'), {'country': '', 'search': '  Cached!!'})
+        self.assertContains(response, 'Cached Role')
+
+    def test_generation_read_does_not_write(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from jobs.pagecache import current_generation
+
+        with CaptureQueriesContext(connection) as queries:
+            current_generation()
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].lstrip().upper().startswith('SELECT'))
+
+
+class SharedCacheTest(TestCase):
+    """Single-flight stale-while-revalidate reads (jobs/sharedcache.py)"""
+
+    def setUp(self):
+        from django.core.cache import caches
+        caches['shared'].clear()
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return self.builds
+
+    def test_fresh_value_is_not_rebuilt(self):
+        from jobs.sharedcache import get_or_refresh
+        self.assertEqual(get_or_refresh('k', self.build, ttl=60), 1)
+        self.assertEqual(get_or_refresh('k', self.build, ttl=60), 1)
+        self.assertEqual(self.builds, 1)
+
+    def test_stale_value_served_while_another_process_rebuilds(self):
+        from jobs.sharedcache import acquire_lock, get_or_refresh, refresh
+        refresh('k', self.build, ttl=0, stale_ttl=60)
+        self.assertTrue(acquire_lock('k'))  # another process is rebuilding
+        self.assertEqual(get_or_refresh('k', self.build, ttl=60), 1)
+        self.assertEqual(self.builds, 1)
+
+    def test_stale_value_rebuilt_by_lock_winner(self):
+        from jobs.sharedcache import acquire_lock, get_or_refresh, refresh
+        refresh('k', self.build, ttl=0, stale_ttl=60)
+        self.assertEqual(get_or_refresh('k', self.build, ttl=60), 2)
+        self.assertTrue(acquire_lock('k'))  # lock released after the rebuild
+
+    def test_release_only_removes_own_lock(self):
+        from jobs.sharedcache import acquire_lock, release_lock
+        first = acquire_lock('k', timeout=60)
+        self.assertIsNone(acquire_lock('k'))
+        release_lock('k', 'someone-else')
+        self.assertIsNone(acquire_lock('k'))
+        release_lock('k', first)
+        self.assertTrue(acquire_lock('k'))
+
+    def test_file_backend_lock_is_exclusive_and_owned(self):
+        import os
+        import tempfile
+        import time
+        from jobs.sharedcache import acquire_lock, release_lock
+        with tempfile.TemporaryDirectory() as directory, override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory},
+        }):
+            overrun = acquire_lock('k')
+            self.assertTrue(overrun)
+            self.assertIsNone(acquire_lock('k'))
+            [lock] = [name for name in os.listdir(directory) if name.endswith('.lock')]
+
+            # Past LOCK_TIMEOUT the lock is taken over; the overrunning
+            # holder's late release must leave its successor's lock alone.
+            old = time.time() - 600
+            os.utime(os.path.join(directory, lock), (old, old))
+            successor = acquire_lock('k')
+            self.assertTrue(successor)
+            release_lock('k', overrun)
+            self.assertIsNone(acquire_lock('k'))
+
+            release_lock('k', successor)
+            self.assertEqual(os.listdir(directory), [])
+            self.assertTrue(acquire_lock('k'))
+
+    def test_home_payload_shared_and_refreshed_by_command(self):
+        from django.core.management import call_command
+        from io import StringIO
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        with patch('jobs.homepage.build_home_payload') as build:
+            self.client.get(reverse('home'))
+            build.assert_not_called()
+        out = StringIO()
+        call_command('refresh_home_cache', stdout=out)
+        self.assertIn('Rebuilt homepage payload', out.getvalue())
+
+
+class HomeStatsTest(TestCase):
+    """Precomputed homepage blocks (HomeStat)"""
+
+    def setUp(self):
+        for index in range(3):
+            ScrapedJobListing.objects.create(
+                source_ats='greenhouse', source_url=f'https://example.com/home/{index}',
+                company_name='Home Co', title=f'Home Role {index}', description='Home',
+                published_to_board=index < 2,
+            )
+
+    def test_payload_reads_stored_blocks(self):
+        from jobs.homepage import STAT_BUILDERS, build_home_payload
+        from jobs.models import HomeStat
+        data = build_home_payload()  # cold: builds and stores every block
+        self.assertEqual(HomeStat.objects.count(), len(STAT_BUILDERS))
+        self.assertEqual((data['total_tracked'], data['total_rejected']), (3, 1))
+        self.assertEqual(len(data['fresh_listings']), 2)
+
+        ScrapedJobListing.objects.create(
+            source_ats='greenhouse', source_url='https://example.com/home/new',
+            company_name='Home Co', title='Home Role new', description='Home', published_to_board=True,
+        )
+        # stats read + verified count/list/companies + fresh cards
+        with self.assertNumQueries(5):
+            data = build_home_payload()
+        self.assertEqual(data['fresh_counts']['h24'], 2)  # as of the last refresh
+
+    def test_pipeline_refresh_moves_listing_blocks(self):
+        from jobs.homepage import LISTING_STATS, build_home_payload, refresh_home_stats
+        from jobs.models import HomeStat
+        build_home_payload()
+        companies_at = HomeStat.objects.get(part='companies').computed_at
+        ScrapedJobListing.objects.filter(published_to_board=True).update(status='closed')
+        refresh_home_stats(LISTING_STATS)
+        data = build_home_payload()
+        self.assertEqual((data['total_tracked'], data['fresh_counts']['h24']), (1, 0))
+        self.assertEqual(HomeStat.objects.get(part='companies').computed_at, companies_at)
+
+    def test_listing_block_counts_in_one_pass(self):
+        from jobs.homepage import LISTING_STATS, STAT_BUILDERS, refresh_home_stats
+        ScrapedJobListing.objects.filter(title='Home Role 0').update(
+            status='closed', date_removed=timezone.now(), repost_count=1,
+        )
+        # counts + distinct companies + fresh ids
+        with self.assertNumQueries(3):
+            stats = STAT_BUILDERS['listings'](timezone.now())
+        self.assertEqual(
+            (stats['total_observed'], stats['total_tracked'], stats['closed_24h'],
+             stats['reposts_24h'], stats['fresh_counts']['h24']),
+            (1, 2, 1, 1, 1),
+        )
+        self.assertNotIn('categories', refresh_home_stats(LISTING_STATS))
+
+
+class HASBatchScoringTest(TestCase):
+    """Batch (columnar) scoring must match calculate_score exactly"""
+
+    def setUp(self):
+        from directory.models import FeaturedEmployer
+
+        now = timezone.now()
+        FeaturedEmployer.objects.create(name='Featured Co', slug='featured-co')
+        slow = Company.objects.create(name='Slow Gov', industry='Government')
+        fast = Company.objects.create(name='Fast Retail', industry='Retail')
+        CompanyHiringProfile.objects.create(company=slow, boilerplate_ratio=0.85)
+        ScrapedJobListing.objects.create(
+            source_ats='lever', source_url='https://jobs.lever.co/fast/closed',
+            company_name='Fast Retail', company=fast, title='Closed Role',
+            description='closed', status='closed', date_removed=now - timedelta(days=3),
+        )
+        variants = [
+            dict(company_name='Featured Co', description='F' * 800, salary_min=90000,
+                 location='Austin, TX', skills_count=6, industry_category='TECHNOLOGY',
+                 has_requirements=True, has_benefits=True, classification_confidence=0.9),
+            dict(company_name='Slow Gov', company=slow, description='short', repost_count=2,
+                 publisher='Indeed', classification_confidence=0.2),
+            dict(company_name='Fast Retail', company=fast, description='G' * 333,
+                 location='Remote', repost_count=4, industry_category='technology',
+                 classification_confidence=0.5),
+            dict(company_name='', description='', source_ats='workday'),
+        ]
+        ages = [(0, 0, 0), (45, 120, 20), (20, 95, 9), (400, 30, 0)]
+        for index, (fields, (posted, first_seen, last_seen)) in enumerate(zip(variants, ages)):
+            fields.setdefault('source_ats', 'greenhouse')
+            listing = ScrapedJobListing.objects.create(
+                source_url=f'https://boards.greenhouse.io/batch/{index}',
+                title=f'Batch Role {index}', **fields,
+            )
+            ScrapedJobListing.objects.filter(pk=listing.pk).update(
+                date_first_seen=now - timedelta(days=first_seen),
+                date_last_seen=now - timedelta(days=last_seen),
+                date_posted_external=now - timedelta(days=posted),
+            )
+        self.now = now
+
+    def _listings(self):
+        return list(
+            ScrapedJobListing.objects.exclude(status='closed')
+            .select_related('company').order_by('pk')
+        )
+
+    def test_batch_matches_per_listing_path(self):
+        from jobs.scoring import HASEngine
+
+        with patch('django.utils.timezone.now', return_value=self.now):
+            engine = HASEngine()
+            engine.prepare_caches()
+            expected = [engine.calculate_score(listing) for listing in self._listings()]
+            results = engine.score_batch(self._listings(), now=self.now)
+
+            self.assertEqual(len(results), 4)
+            for result, (score, breakdown) in zip(results, expected):
+                self.assertEqual(result.total, score)
+                self.assertEqual(result.band, engine.get_score_band(score))
+                for signal, points in result.points.items():
+                    self.assertEqual(points, breakdown[signal]['points'], signal)
+                self.assertEqual(result.breakdown, breakdown)
+        # The variants exercise the batch-only lookups and the profile groups.
+        self.assertEqual({r.profile_key for r in results}, {'default', 'TECHNOLOGY'})
+        self.assertNotEqual(results[2].points['ats_behavior'], 0)
+        self.assertNotEqual(results[1].points['boilerplate_penalty'], 0)
+
+    def test_batch_lookups_are_per_batch(self):
+        from jobs.scoring import HASEngine
+
+        engine = HASEngine()
+        engine.prepare_caches()
+        listings = self._listings()
+        with self.assertNumQueries(2):  # hiring profiles + closing companies
+            results = engine.score_batch(listings)
+        with self.assertNumQueries(0):
+            for result in results:
+                result.breakdown
+
+
+    def test_save_batch_upserts_and_reconciles_listings(self):
+        from jobs.feed import relevance_score
+        from jobs.scoring import HASEngine
+
+        engine = HASEngine()
+        listings = self._listings()
+        # An existing, out-of-date score row must be overwritten, not duplicated.
+        HiringActivityScore.objects.create(listing=listings[0], total_score=10)
+        results = engine.score_batch(self._listings())
+        with self.assertNumQueries(2):  # upsert + reconciling UPDATE
+            self.assertEqual(engine.save_batch(results), 4)
+
+        threshold = engine.config['publish_threshold']
+        for result in results:
+            has = HiringActivityScore.objects.get(listing_id=result.listing.pk)
+            listing = ScrapedJobListing.objects.get(pk=result.listing.pk)
+            self.assertEqual(has.total_score, result.total)
+            self.assertEqual(has.score_band, result.band)
+            self.assertEqual(has.score_breakdown, result.stored_breakdown)
+            self.assertEqual(listing.published_to_board, result.total >= threshold)
+            self.assertEqual(listing.published_to_board, has.published_to_board)
+            self.assertEqual(listing.published_at is not None, listing.published_to_board)
+            self.assertEqual(listing.feed_activity, result.total)
+            self.assertAlmostEqual(
+                listing.feed_relevance,
+                relevance_score(result.total, listing.feed_posted_at), places=3,
+            )
+        self.assertEqual(HiringActivityScore.objects.count(), 4)
+        self.assertTrue(any(r.total >= threshold for r in results))
+
+        # Re-saving unchanged scores leaves the listings alone.
+        published = ScrapedJobListing.objects.filter(published_to_board=True).first()
+        rescored = engine.score_batch(self._listings())
+        with self.assertNumQueries(2):
+            engine.save_batch(rescored)
+        published_again = ScrapedJobListing.objects.get(pk=published.pk)
+        self.assertEqual(published_again.published_at, published.published_at)
+        self.assertEqual(published_again.feed_relevance, published.feed_relevance)
+
+    def test_save_batch_runs_no_per_listing_signals(self):
+        """Saving persists points only; explanations are rendered on read"""
+        from jobs.scoring import HASEngine
+
+        with patch('django.utils.timezone.now', return_value=self.now):
+            engine = HASEngine()
+            engine.prepare_caches()
+            results = engine.score_batch(self._listings(), now=self.now)
+            with patch.object(HASEngine, '_calculate', side_effect=AssertionError('_calculate called')):
+                engine.save_batch(results)
+
+            for result in results:
+                has = HiringActivityScore.objects.select_related('listing__company').get(
+                    listing_id=result.listing.pk,
+                )
+                self.assertNotIn('explanation', has.score_breakdown['freshness'])
+                # Formatted on read from the stored inputs (no engine, no
+                # queries), identical to the per-listing breakdown
+                with patch.object(HASEngine, '_calculate', side_effect=AssertionError('_calculate called')), \
+                        self.assertNumQueries(0):
+                    explained = has.explained_breakdown
+                self.assertEqual(explained, engine.calculate_score(has.listing)[1])
+
+
+class IncrementalRescoringTest(TestCase):
+    """Dirty-set tracking behind score_listings --incremental"""
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.company = Company.objects.create(name='Steady Co', industry='')
+        self.listings = []
+        for index in range(3):
+            listing = ScrapedJobListing.objects.create(
+                source_ats='greenhouse',
+                source_url=f'https://boards.greenhouse.io/steady/{index}',
+                company_name='Steady Co', company=self.company,
+                title=f'Steady Role {index}', description='S' * 600,
+            )
+            ScrapedJobListing.objects.filter(pk=listing.pk).update(
+                date_posted_external=self.now - timedelta(days=20),
+            )
+            self.listings.append(listing)
+        self.other = ScrapedJobListing.objects.create(
+            source_ats='lever', source_url='https://jobs.lever.co/other/1',
+            company_name='Other Co', title='Other Role', description='o',
+        )
+
+    def _run(self):
+        from django.core.management import call_command
+        from io import StringIO
+        out = StringIO()
+        call_command('score_listings', '--incremental', stdout=out)
+        return out.getvalue()
+
+    def test_rescore_at_is_next_freshness_boundary(self):
+        from jobs.scoring import HASEngine
+        listing = ScrapedJobListing.objects.select_related('company').get(pk=self.listings[0].pk)
+        result, = HASEngine().score_batch([listing], now=self.now)
+        self.assertEqual(
+            result.rescore_at,
+            listing.date_posted_external + timedelta(days=21),
+        )
+
+    def test_second_run_only_rescores_changed_companies(self):
+        self.assertIn('Scoring 4 listing(s)', self._run())
+        self.assertEqual(HiringActivityScore.objects.filter(rescore_at__lte=self.now).count(), 0)
+        self.assertIn('No listings to score', self._run())
+
+        # A role closing at Steady Co flips its ats_behavior input.
+        ScrapedJobListing.objects.create(
+            source_ats='greenhouse', source_url='https://boards.greenhouse.io/steady/closed',
+            company_name='Steady Co', company=self.company, title='Closed',
+            description='c', status='closed', date_removed=timezone.now(),
+        )
+        output = self._run()
+        self.assertIn('Scoring 3 listing(s)', output)
+        other_rescore_at = HiringActivityScore.objects.get(listing=self.other).rescore_at
+        self.assertTrue(other_rescore_at is None or other_rescore_at > timezone.now())
+
+    def test_signature_ignores_fresh_last_seen_but_not_inputs(self):
+        from jobs.scoring.incremental import mark_for_rescore, scoring_signature
+        listing = ScrapedJobListing.objects.get(pk=self.listings[0].pk)
+        before = scoring_signature(listing, 7)
+        listing.date_last_seen = timezone.now()
+        self.assertEqual(scoring_signature(listing, 7), before)
+        listing.salary_min = 90000
+        self.assertNotEqual(scoring_signature(listing, 7), before)
+
+        self._run()
+        self.assertEqual(mark_for_rescore([listing.pk]), 1)
+        self.assertIn('Scoring 1 listing(s)', self._run())
+
+
+class ParallelScoringTest(TestCase):
+    """Sharded scoring behind score_listings --workers"""
+
+    def setUp(self):
+        for index in range(5):
+            ScrapedJobListing.objects.create(
+                source_ats='greenhouse',
+                source_url=f'https://boards.greenhouse.io/shard/{index}',
+                company_name='Shard Co', title=f'Shard Role {index}',
+                description='S' * (200 * index),
+            )
+
+    def test_plan_shards_covers_every_pk_once(self):
+        from jobs.scoring.parallel import plan_shards
+        pks = [2, 3, 5, 8, 13, 21, 34]
+        shards = plan_shards(pks, 3)
+        self.assertEqual(shards, [(2, 5), (8, 21), (34, 34)])
+        self.assertEqual(plan_shards([], 4), [])
+        self.assertEqual(plan_shards(pks, 20), [(pk, pk) for pk in pks])
+
+    def test_shards_match_single_process(self):
+        from jobs.scoring import HASEngine
+        from jobs.scoring.parallel import (
+            _init_worker, _score_shard, empty_stats, merge_stats, plan_shards, score_rows,
+        )
+        queryset = ScrapedJobListing.objects.filter(status='active')
+        engine = HASEngine()
+        engine.prepare_caches()
+        expected = score_rows(
+            engine, queryset.select_related('company').order_by('pk'), save=False,
+        )
+
+        # What each pool worker runs, in-process (a child can't see the test DB).
+        _init_worker(engine.cache_snapshot())
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+        stats = empty_stats()
+        for first, last in plan_shards(pks, 2):
+            merge_stats(stats, _score_shard((queryset.query, first, last, True, 0)))
+        self.assertEqual(stats, expected)
+        self.assertEqual(HiringActivityScore.objects.count(), 5)
+
+
+class GenzjobsBatchSyncTest(TestCase):
+    """Set-based batch path of sync_genzjobs"""
+
+    def setUp(self):
+        from io import StringIO
+        from jobs.management.commands.sync_genzjobs import Command
+        self.command = Command(stdout=StringIO(), stderr=StringIO())
+        from jobs.companies import CompanyResolver
+        self.command._stale_days = 7
+        self.company = Company.objects.create(name='Acme Corp')
+        self.command._companies = CompanyResolver()
+        self.existing = ScrapedJobListing.objects.create(
+            genzjobs_id='gj-existing', source_ats='lever',
+            source_url='https://jobs.lever.co/acme/1', company_name='Acme Corp',
+            title='Old Title', description='old', published_to_board=True,
+        )
+
+    POSTED_AT = timezone.now() - timedelta(days=3)
+
+    def _gj(self, gj_id, **fields):
+        defaults = dict(
+            title='Backend Engineer', company='Acme Corp', description='Build APIs',
+            location='Austin, TX', source='greenhouse', apply_url=f'https://example.com/{gj_id}',
+            posted_at=self.POSTED_AT, skills='{python,django}',
+        )
+        defaults.update(fields)
+        from jobs.models import GenzjobsListing
+        return GenzjobsListing(id=gj_id, **defaults)
+
+    def test_batch_creates_and_updates(self):
+        batch = [
+            self._gj('gj-existing', title='New Title'),
+            self._gj('gj-new', company='Brand New Co', location='Remote', remote=True),
+        ]
+        result = self.command._sync_batch(batch, {'gj-new': 'TECHNOLOGY'}, {})
+
+        self.assertEqual(result['errors'], 0)
+        self.assertEqual(len(result['created_ids']), 1)
+        self.assertEqual(len(result['local_ids']), 2)
+        self.assertEqual(result['changed_ids'], [self.existing.pk])
+
+        existing = ScrapedJobListing.objects.get(pk=self.existing.pk)
+        self.assertEqual(existing.title, 'New Title')
+        self.assertEqual(existing.company, self.company)
+        self.assertTrue(existing.published_to_board)  # not a synced column
+        self.assertEqual(existing.country_code, 'US')
+        self.assertEqual(existing.feed_posted_at, batch[0].posted_at)
+        self.assertEqual(existing.skills_count, 2)
+
+        new = ScrapedJobListing.objects.get(genzjobs_id='gj-new')
+        self.assertEqual(new.pk, result['created_ids'][0])
+        self.assertEqual(new.company.name, 'Brand New Co')
+        self.assertEqual(new.industry_category, 'TECHNOLOGY')
+        self.assertTrue(new.is_remote)
+        self.assertEqual(len(new.description_hash), 64)
+
+    def test_unchanged_rows_are_skipped_or_touched(self):
+        from jobs.management.commands.sync_genzjobs import TOUCH_AFTER
+        batch = [self._gj('gj-same'), self._gj('gj-old')]
+        self.command._sync_batch(batch, {}, {})
+        ScrapedJobListing.objects.filter(genzjobs_id='gj-old').update(
+            date_last_seen=timezone.now() - TOUCH_AFTER - timedelta(minutes=1),
+        )
+        before = ScrapedJobListing.objects.get(genzjobs_id='gj-same').date_last_seen
+
+        result = self.command._sync_batch(
+            [self._gj('gj-same'), self._gj('gj-old'), self._gj('gj-existing')], {}, {},
+        )
+        self.assertEqual(result['unchanged'], 1)
+        self.assertEqual(result['touched'], 1)
+        self.assertEqual(result['local_ids'], [self.existing.pk])  # no fingerprint yet
+        self.assertEqual(
+            ScrapedJobListing.objects.get(genzjobs_id='gj-same').date_last_seen, before,
+        )
+        old = ScrapedJobListing.objects.get(genzjobs_id='gj-old')
+        self.assertGreater(old.date_last_seen, timezone.now() - timedelta(minutes=1))
+
+        # An upstream edit changes the fingerprint and rewrites the row.
+        result = self.command._sync_batch([self._gj('gj-same', title='Renamed')], {}, {})
+        self.assertEqual(len(result['local_ids']), 1)
+        self.assertEqual(ScrapedJobListing.objects.get(genzjobs_id='gj-same').title, 'Renamed')
+
+    def test_description_change_is_reported_for_reindexing(self):
+        result = self.command._sync_batch(
+            [self._gj('gj-existing', title='Old Title', description='old')], {}, {},
+        )
+        self.assertEqual(result['described_ids'], [])
+        result = self.command._sync_batch(
+            [self._gj('gj-existing', title='Old Title', description='new text')], {}, {},
+        )
+        self.assertEqual(result['described_ids'], [self.existing.pk])
+
+    def test_query_count_independent_of_batch_size(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def queries(count, prefix):
+            batch = [self._gj(f'{prefix}-{index}') for index in range(count)]
+            with CaptureQueriesContext(connection) as ctx:
+                self.command._sync_batch(batch, {}, {})
+            return len(ctx)
+
+        self.assertEqual(queries(2, 'small'), queries(10, 'large'))
+
+    def test_batch_matches_row_by_row(self):
+        batch = [self._gj('gj-a'), self._gj('gj-b', company='acme corp ')]
+        self.command._sync_batch(batch, {}, {})
+        bulk = {
+            row['genzjobs_id']: row for row in ScrapedJobListing.objects.filter(
+                genzjobs_id__in=['gj-a', 'gj-b'],
+            ).values('genzjobs_id', 'company_id', 'title_hash', 'country_code', 'skills_count')
+        }
+        ScrapedJobListing.objects.filter(genzjobs_id__in=['gj-a', 'gj-b']).delete()
+        self.command._sync_rows(batch, {})
+        rows = {
+            row['genzjobs_id']: row for row in ScrapedJobListing.objects.filter(
+                genzjobs_id__in=['gj-a', 'gj-b'],
+            ).values('genzjobs_id', 'company_id', 'title_hash', 'country_code', 'skills_count')
+        }
+        self.assertEqual(bulk, rows)
+
+
+class GenzjobsKeysetStreamTest(TestCase):
+    """genzjobs-side reads (keyset streams, watermarks, closure detection)"""
+
+    @classmethod
+    def setUpClass(cls):
+        # The unmanaged genzjobs table, created in the test database so the
+        # streams can run against it via .using('default').
+        from django.db import connection
+        from jobs.models import GenzjobsListing
+        with connection.schema_editor() as editor:
+            editor.create_model(GenzjobsListing)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        from django.db import connection
+        from jobs.models import GenzjobsListing
+        with connection.schema_editor() as editor:
+            editor.delete_model(GenzjobsListing)
+
+    def setUp(self):
+        from jobs.models import GenzjobsListing
+        self.base = timezone.now().replace(microsecond=0) - timedelta(hours=1)
+        # Two rows share a timestamp, so paging must break ties on id.
+        for gj_id, minutes, active in [
+            ('a1', 0, True), ('b2', 10, True), ('b1', 10, True), ('c1', 20, False), ('d1', 30, True),
+        ]:
+            GenzjobsListing.objects.using('default').create(
+                id=gj_id, title=gj_id, company='Co', source='lever', is_active=active,
+                updated_at=self.base + timedelta(minutes=minutes),
+            )
+        self.qs = GenzjobsListing.objects.using('default').filter(is_active=True)
+
+    def test_changed_batches_page_in_keyset_order(self):
+        from jobs.genzjobs import changed_batches
+        pages = [[gj.id for gj in batch] for batch in changed_batches(self.qs, batch_size=2)]
+        self.assertEqual(pages, [['a1', 'b1'], ['b2', 'd1']])
+
+        after = (self.base + timedelta(minutes=10), 'b1')
+        self.assertEqual(
+            [gj.id for batch in changed_batches(self.qs, after, 2) for gj in batch],
+            ['b2', 'd1'],
+        )
+
+    def test_active_ids_pages_by_id(self):
+        from jobs.genzjobs import active_ids
+        self.assertEqual(list(active_ids(self.qs, chunk_size=2)), ['a1', 'b1', 'b2', 'd1'])
+
+    @override_settings(DATABASE_ROUTERS=[], GENZJOBS_ENABLED=True)
+    def test_detect_closed_closes_missing_and_inactive(self):
+        from io import StringIO
+        from django.core.management import call_command
+        listings = {}
+        for gj_id in ['a1', 'c1', 'gone', 'd1']:
+            listings[gj_id] = ScrapedJobListing.objects.create(
+                genzjobs_id=gj_id, source_ats='lever', source_url=f'https://x.test/{gj_id}',
+                company_name='Co', title=gj_id, description='d',
+            )
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            call_command('detect_closed_genzjobs', stdout=StringIO())
+        # One page of active ids, one re-check of the chunk, one UPDATE (plus
+        # the page-cache generation bump).
+        self.assertEqual(sum('"job_listings"' in q['sql'] for q in ctx.captured_queries), 2)
+        self.assertEqual(sum(q['sql'].startswith('UPDATE') for q in ctx.captured_queries), 2)
+        statuses = dict(ScrapedJobListing.objects.values_list('genzjobs_id', 'status'))
+        self.assertEqual(
+            statuses, {'a1': 'active', 'c1': 'closed', 'gone': 'closed', 'd1': 'active'},
+        )
+
+    @override_settings(DATABASE_ROUTERS=[], GENZJOBS_ENABLED=True)
+    def test_sync_streams_from_watermark(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from jobs.models import SyncWatermark
+        call_command('sync_genzjobs', '--batch-size', '2', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(
+            set(ScrapedJobListing.objects.values_list('genzjobs_id', flat=True)), {'a1', 'b1', 'b2', 'd1'},
+        )
+        mark = SyncWatermark.objects.get(scope='*')
+        self.assertEqual((mark.high_water_at, mark.high_water_id), (self.base + timedelta(minutes=30), 'd1'))
+
+        out = StringIO()
+        call_command('sync_genzjobs', stdout=out, stderr=StringIO())
+        self.assertIn('1 unchanged', out.getvalue())  # d1, re-read inside the overlap
+
+    @override_settings(DATABASE_ROUTERS=[], GENZJOBS_ENABLED=True)
+    def test_failed_row_holds_watermark_before_it(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from jobs.management.commands.sync_genzjobs import Command
+        from jobs.models import SyncWatermark
+        apply_listing = Command._apply_listing
+
+        def fail_b2(command, local, gj, *args, **kwargs):
+            if gj.id == 'b2':
+                raise ValueError('bad row')
+            return apply_listing(command, local, gj, *args, **kwargs)
+
+        with patch.object(Command, '_apply_listing', fail_b2):
+            call_command('sync_genzjobs', '--batch-size', '2', stdout=StringIO(), stderr=StringIO())
+        # d1 synced, but the mark stays on b1 so the next run retries b2.
+        self.assertTrue(ScrapedJobListing.objects.filter(genzjobs_id='d1').exists())
+        mark = SyncWatermark.objects.get(scope='*')
+        self.assertEqual((mark.high_water_at, mark.high_water_id), (self.base + timedelta(minutes=10), 'b1'))
+
+        call_command('sync_genzjobs', stdout=StringIO(), stderr=StringIO())
+        self.assertTrue(ScrapedJobListing.objects.filter(genzjobs_id='b2').exists())
+        mark = SyncWatermark.objects.get(scope='*')
+        self.assertEqual(mark.high_water_id, 'd1')
+
+    @override_settings(DATABASE_ROUTERS=[], GENZJOBS_ENABLED=True)
+    def test_write_back_pages_local_rows_by_pk(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        for gj_id in ['a1', 'b1', 'b2', 'd1', 'gone']:
+            ScrapedJobListing.objects.create(
+                genzjobs_id=gj_id, source_ats='lever', source_url=f'https://x.test/{gj_id}',
+                company_name='Co', title=gj_id, description='d',
+                published_to_board=gj_id in ('a1', 'b2'),
+            )
+        out = StringIO()
+        with patch('jobs.management.commands.sync_genzjobs.CHUNK_SIZE', 2), \
+                CaptureQueriesContext(connection) as ctx:
+            call_command('sync_genzjobs', '--write-back', '--dry-run', stdout=out, stderr=StringIO())
+        self.assertIn('2 listing(s) would be updated', out.getvalue())
+        pages = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT "jobs_scrapedjoblisting"."id"') and 'LIMIT 2' in q['sql']
+        ]
+        self.assertEqual(len(pages), 3)
+
+    def test_verification_updates_send_only_differences(self):
+        from jobs.genzjobs import verification_updates
+        remote = {
+            'same': (True, '7'), 'unverify': (True, None), 'verify': (False, None),
+            'employer': (True, '3'), 'quiet': (False, '9'),
+        }
+        local = [
+            ('same', True, 7), ('unverify', False, None), ('verify', True, None),
+            ('employer', True, 4), ('quiet', False, 5), ('gone', True, None),
+        ]
+        updates, missing = verification_updates(local, remote)
+        self.assertEqual(updates, [
+            ('unverify', False, None), ('verify', True, None), ('employer', True, '4'),
+        ])
+        self.assertEqual(missing, ['gone'])
+
+    def test_prefetcher_bounds_lookahead_and_propagates_errors(self):
+        import time
+        from jobs.genzjobs import Prefetcher
+        produced = []
+
+        def items():
+            for index in range(6):
+                produced.append(index)
+                yield index
+            raise ValueError('remote went away')
+
+        prefetcher = Prefetcher(items(), depth=2)
+        seen = []
+        with self.assertRaisesMessage(ValueError, 'remote went away'):
+            for item in prefetcher:
+                if not seen:
+                    time.sleep(0.3)  # let the producer run into the bound
+                    # queue (2) + the one being put = at most 3 ahead of us
+                    self.assertLessEqual(len(produced), 4)
+                seen.append(item)
+        self.assertEqual(seen, list(range(6)))
+
+    def test_prefetcher_stops_producer_on_early_exit(self):
+        from jobs.genzjobs import Prefetcher
+        prefetcher = Prefetcher(iter(range(1000)), depth=1)
+        for item in prefetcher:
+            if item == 2:
+                break
+        self.assertFalse(prefetcher._thread.is_alive())
+
+    def test_watermark_round_trip_with_overlap(self):
+        from jobs.genzjobs import (
+            ALL_SOURCES, WATERMARK_OVERLAP, load_watermark, save_watermark, watermark_scope,
+        )
+        self.assertEqual(watermark_scope(None), ALL_SOURCES)
+        self.assertIsNone(load_watermark(ALL_SOURCES))
+        mark = self.base + timedelta(minutes=30)
+        save_watermark(ALL_SOURCES, mark, 'd1')
+        self.assertEqual(load_watermark(ALL_SOURCES), (mark - WATERMARK_OVERLAP, ''))
+        self.assertIsNone(load_watermark(watermark_scope('Lever')))
+
+
+class RepostDetectionTest(TestCase):
+    """MinHash/LSH repost linking (jobs/reposts.py)"""
+
+    DESCRIPTION = (
+        'We are hiring a warehouse associate to join our fulfillment team in '
+        'Columbus. You will pick, pack and ship customer orders, keep the floor '
+        'safe and organized, operate hand scanners and pallet jacks, and work '
+        'closely with shift leads to hit daily targets. Full benefits from day one.'
+    )
+
+    def _listing(self, company, days_ago, description=None, url=None):
+        listing = ScrapedJobListing.objects.create(
+            source_ats='greenhouse', company_name=company, title='Warehouse Associate',
+            source_url=url or f'https://boards.greenhouse.io/{company}/{days_ago}',
+            description=description or self.DESCRIPTION,
+            date_posted_external=timezone.now() - timedelta(days=days_ago),
+        )
+        return listing.pk
+
+    def test_edited_repost_links_to_latest_prior(self):
+        from jobs.reposts import detect_reposts
+        first = self._listing('Shipco', 60)
+        second = self._listing('Shipco', 30)
+        detect_reposts([first, second])
+        edited = self.DESCRIPTION.replace('Full benefits from day one.', 'Apply today!')
+        third = self._listing('Shipco', 1, description=edited)
+
+        links = detect_reposts([third])
+        self.assertEqual(links, {third: (second, 2)})
+        listing = ScrapedJobListing.objects.get(pk=third)
+        self.assertEqual(listing.previous_listing_id, second)
+        self.assertEqual(listing.repost_count, 2)
+
+    def test_other_company_same_day_and_unrelated_text_are_not_reposts(self):
+        from jobs.reposts import detect_reposts
+        original = self._listing('Shipco', 30)
+        same_day = self._listing('Shipco', 30, url='https://boards.greenhouse.io/shipco/other-city')
+        other_company = self._listing('Boxco', 1)
+        unrelated = self._listing('Shipco', 1, description=(
+            'Senior data engineer to own our streaming pipelines, Kafka and Spark '
+            'jobs, warehouse modelling in dbt and the on-call rotation for data '
+            'quality incidents across analytics.'
+        ))
+        self.assertEqual(detect_reposts([original, same_day, other_company, unrelated]), {})
+
+    def test_backfill_command_is_resumable(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from jobs.models import ListingMinHash
+        first = self._listing('Shipco', 60)
+        second = self._listing('Shipco', 30)
+        call_command('detect_reposts', '--batch-size', '1', stdout=StringIO())
+        self.assertEqual(ScrapedJobListing.objects.get(pk=second).previous_listing_id, first)
+        self.assertEqual(ListingMinHash.objects.count(), 2)
+        out = StringIO()
+        call_command('detect_reposts', stdout=out)
+        self.assertIn('Indexed 0 listing(s)', out.getvalue())
+
+    def test_short_description_is_marked_indexed(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from jobs.models import ListingMinHash, ListingMinHashBand
+        stub = self._listing('Shipco', 5, description='Apply on our site.')
+        call_command('detect_reposts', stdout=StringIO())
+        self.assertEqual(bytes(ListingMinHash.objects.get(listing_id=stub).signature), b'')
+        self.assertFalse(ListingMinHashBand.objects.filter(listing_id=stub).exists())
+        out = StringIO()
+        call_command('detect_reposts', stdout=out)
+        self.assertIn('Indexed 0 listing(s)', out.getvalue())
+
+    def test_reindexing_edited_listing_replaces_signature_and_link(self):
+        from jobs.models import ListingMinHashBand
+        from jobs.reposts import detect_reposts
+        first = self._listing('Shipco', 60)
+        second = self._listing('Shipco', 30)
+        detect_reposts([first, second])
+        bands_before = set(ListingMinHashBand.objects.filter(listing_id=second).values_list('band_key', flat=True))
+
+        ScrapedJobListing.objects.filter(pk=second).update(description=(
+            'Senior data engineer to own our streaming pipelines, Kafka and Spark '
+            'jobs, warehouse modelling in dbt and the on-call rotation for data '
+            'quality incidents across analytics.'
+        ))
+        self.assertEqual(detect_reposts([second]), {second: (None, 0)})
+        listing = ScrapedJobListing.objects.get(pk=second)
+        self.assertEqual((listing.previous_listing_id, listing.repost_count), (None, 0))
+        bands_after = set(ListingMinHashBand.objects.filter(listing_id=second).values_list('band_key', flat=True))
+        self.assertTrue(bands_after)
+        self.assertFalse(bands_before & bands_after)
+        # Re-indexing an unchanged listing leaves its link alone
+        self.assertEqual(detect_reposts([first, second]), {})
+
+
+class SalaryExtractTest(TestCase):
+    """Anchored salary scanner and the extract_salaries backfill"""
+
+    # Outputs of the extractor before the '$'-anchored scanner.
+    CORPUS = [
+        ('The base salary range for this role is $120,000 - $150,000 per year.', ('120000', '150000')),
+        ('Pay range: $185-240K depending on experience.', ('185000', '240000')),
+        ('<p>Compensation: $45/hr - $55/hr</p>', ('93600', '114400')),
+        ('We pay $1,200 - $1,500 weekly.', ('62400', '78000')),
+        ('Sign-on bonus of $10,000 - $20,000! Base salary $90,000 - $110,000.', ('90000', '110000')),
+        ('Sign-on bonus of $10,000 - $20,000 and more.', None),
+        ('Salary: CAD $80,000 - $100,000 annually.', None),
+        ('Base salary starting from $95,000.', ('95000', None)),
+        ('Compensation up to $140,000 per year.', (None, '140000')),
+        ('Salary $100,000 - $900,000.', None),
+        ('&lt;p&gt;Pay range: $70,000 &amp;ndash; $90,000&lt;/p&gt;', ('70000', '90000')),
+        ('&amp;lt;li&amp;gt;Salary: &amp;#36;88,000 to &amp;#36;99,000', ('88000', '99000')),
+        ('Salary: &#x24;60,000 - &#x24;75,000', ('60000', '75000')),
+        ('401(k) match up to $5,000. Salary $105K - $125K.', ('105000', '125000')),
+        ('Rate $95', ('197600', None)),
+        ('Salary range $$$$$100,000 - $120,000', ('100000', '120000')),
+        ('Up to $60/hr depending on experience; pay varies.', None),
+        ('Salary is $abc, not numbers; compensation $120,000.', ('120000', None)),
+        ('No compensation details here.', None),
+        ('', None),
+    ]
+
+    def test_corpus_matches_previous_extractor(self):
+        from decimal import Decimal
+        from jobs.salary_extract import extract_salary_range
+        for text, expected in self.CORPUS:
+            with self.subTest(text=text):
+                if expected is not None:
+                    expected = tuple(None if v is None else Decimal(v) for v in expected)
+                self.assertEqual(extract_salary_range(text), expected)
+
+    def test_backfill_writes_in_bulk(self):
+        from io import StringIO
+        from django.core.management import call_command
+        for index, (text, _expected) in enumerate(self.CORPUS[:6]):
+            listing = ScrapedJobListing.objects.create(
+                source_ats='greenhouse', source_url=f'https://example.com/salary/{index}',
+                company_name='Pay Co', title=f'Role {index}', description=text,
+            )
+            HiringActivityScore.objects.create(
+                listing=listing, total_score=50, score_band='uncertain', score_breakdown={},
+                rescore_at=timezone.now() + timedelta(days=1),
+            )
+        out = StringIO()
+        call_command(
+            'extract_salaries', '--all-statuses', '--batch-size', '4', '--workers', '2', stdout=out,
+        )
+        self.assertIn('Scanned 6 listings', out.getvalue())
+        self.assertIn('marked 5 score(s) for rescore', out.getvalue())
+        self.assertEqual(
+            sorted(ScrapedJobListing.objects.filter(salary_min__isnull=False).values_list('salary_min', flat=True)),
+            [62400, 90000, 93600, 120000, 185000],
+        )
+        # Only the listings that got a salary are due for --incremental
+        due = HiringActivityScore.objects.filter(rescore_at__lte=timezone.now())
+        self.assertEqual(
+            set(due.values_list('listing_id', flat=True)),
+            set(ScrapedJobListing.objects.filter(salary_min__isnull=False).values_list('pk', flat=True)),
+        )
+
+
+class ListingLinkCheckTest(TestCase):
+    """check_listing_links against a local stub HTTP server"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        import threading
+        from collections import Counter
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        hits = cls.hits = Counter()
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                hits[self.command, self.path] += 1
+                if self.path == '/gone':
+                    status = 404
+                elif self.path == '/flaky':
+                    status = 503 if hits[self.command, self.path] == 1 else 200
+                elif self.path == '/down':
+                    status = 502
+                elif self.path == '/no-head':
+                    status = 405 if self.command == 'HEAD' else 200
+                else:
+                    status = 200
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            do_HEAD = do_GET = _respond
+
+            def log_message(self, *args):
+                pass
+
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.base = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.hits.clear()
+        self.listings = {
+            path: ScrapedJobListing.objects.create(
+                source_ats='greenhouse', source_url=f'{self.base}{path}',
+                company_name='Link Co', title=f'Role {path}', description='Link check',
+                published_to_board=True,
+            )
+            for path in ('/ok', '/gone', '/flaky', '/down', '/no-head')
+        }
+
+    def test_check_classifies_retries_and_writes(self):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command(
+            'check_listing_links', '--retries', '1', '--backoff', '0', '--host-delay', '0', stdout=out,
+        )
+        self.assertIn('3 live, 1 dead, 1 errors (out of 5 checked, 2 retries)', out.getvalue())
+        self.assertEqual(self.hits['HEAD', '/flaky'], 2)
+        self.assertEqual(self.hits['GET', '/no-head'], 1)
+
+        status = {
+            path: ScrapedJobListing.objects.values_list('status', 'link_status_code').get(pk=listing.pk)
+            for path, listing in self.listings.items()
+        }
+        self.assertEqual(status, {
+            '/ok': ('active', 200), '/gone': ('closed', 404), '/flaky': ('active', 200),
+            '/down': ('active', None), '/no-head': ('active', 200),
+        })
+        self.assertFalse(ScrapedJobListing.objects.filter(link_last_checked__isnull=True).exists())
+
+    def test_per_host_spacing(self):
+        import time
+        from jobs.linkcheck import LIVE, LinkChecker
+        links = [(index, f'{self.base}/ok?{index}') for index in range(4)]
+        started = time.monotonic()
+        with LinkChecker(per_host=4, host_delay=0.1) as checker:
+            results = checker.check(links)
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+        self.assertEqual(sorted(results), [(index, LIVE, 200) for index in range(4)])
+
+    def test_interleave_by_host(self):
+        from jobs.linkcheck import interleave_by_host
+        links = [(1, 'https://a.test/1'), (2, 'https://a.test/2'), (3, 'https://b.test/1'), (4, 'https://a.test/3')]
+        self.assertEqual([key for key, _url in interleave_by_host(links)], [1, 3, 2, 4])
+
+
+class CompanyProfileRebuildTest(TestCase):
+    """Set-based update_company_profiles"""
+
+    def setUp(self):
+        now = timezone.now()
+        self.acme = Company.objects.create(name='Profile Acme')
+        self.quiet = Company.objects.create(name='Profile Quiet')
+        self.empty = Company.objects.create(name='Profile Empty')
+        rows = [
+            # (status, first seen days ago, removed days ago, description, salary, department)
+            ('active', 100, None, 'Same text', 90000, 'Eng'),
+            ('active', 5, None, 'Same text', None, 'Eng'),
+            ('closed', 60, 50, 'Other text', None, 'Sales'),
+            ('closed', 40, 10, 'Third text', 70000, ''),
+            ('closed', 25, 5, 'Fourth text', None, ''),
+        ]
+        for index, (status, seen, removed, description, salary, department) in enumerate(rows):
+            listing = ScrapedJobListing.objects.create(
+                source_ats='greenhouse', source_url=f'https://example.com/profile/{index}',
+                company_name='Profile Acme', company=self.acme, title=f'Role {index}',
+                description=description, salary_min=salary, department=department,
+            )
+            ScrapedJobListing.objects.filter(pk=listing.pk).update(
+                status=status,
+                date_first_seen=now - timedelta(days=seen),
+                date_last_seen=now - timedelta(days=seen),
+                date_removed=None if removed is None else now - timedelta(days=removed),
+            )
+        quiet = ScrapedJobListing.objects.create(
+            source_ats='lever', source_url='https://example.com/profile/quiet',
+            company_name='Profile Quiet', company=self.quiet, title='Quiet Role', description='Quiet',
+        )
+        ScrapedJobListing.objects.filter(pk=quiet.pk).update(
+            date_first_seen=now - timedelta(days=200), date_last_seen=now - timedelta(days=200),
+        )
+        CompanyHiringProfile.objects.create(company=self.quiet, glassdoor_rating=4.2)
+
+    def test_metrics_for_all_companies(self):
+        from jobs.company_profiles import profile_metrics
+        metrics = profile_metrics()
+        acme = metrics[self.acme.pk]
+        self.assertEqual(acme['total_active_listings'], 2)
+        self.assertEqual(acme['total_historical_listings'], 5)
+        self.assertEqual(acme['total_distinct_departments'], 3)
+        self.assertEqual(acme['avg_listing_lifespan_days'], 20)
+        self.assertEqual(acme['median_listing_lifespan_days'], 20.0)   # lifespans 10, 30, 20
+        self.assertAlmostEqual(acme['listing_close_rate_30d'], 2 / 3 * 100)
+        self.assertEqual((acme['net_job_movement_30d'], acme['net_job_movement_90d']), (0, 1))
+        self.assertEqual(acme['boilerplate_ratio'], 0.2)
+        self.assertEqual(acme['avg_description_length'], 9)   # 49 chars // 5
+        self.assertEqual(acme['has_salary_info_ratio'], 0.4)
+        self.assertEqual(acme['evergreen_listing_count'], 1)
+        self.assertEqual(acme['reputation_score'], 70.0)
+        self.assertEqual(metrics[self.empty.pk]['total_historical_listings'], 0)
+        self.assertIsNone(metrics[self.empty.pk]['median_listing_lifespan_days'])
+
+    def test_rebuild_upserts_and_limits_to_changed_companies(self):
+        from io import StringIO
+        from django.core.management import call_command
+        since = (timezone.now() - timedelta(days=7)).isoformat()
+        out = StringIO()
+        # companies, 2 aggregates, existing profiles, upsert + the homepage
+        # company block (2 counts, upsert)
+        with self.assertNumQueries(8):
+            call_command('update_company_profiles', '--companies-changed-since', since, stdout=out)
+        self.assertIn('Created 1 and updated 0', out.getvalue())
+        self.assertEqual(
+            set(CompanyHiringProfile.objects.values_list('company__name', flat=True)),
+            {'Profile Acme', 'Profile Quiet'},
+        )
+
+        call_command('update_company_profiles', stdout=out)
+        self.assertIn('Created 1 and updated 2', out.getvalue())
+        quiet = CompanyHiringProfile.objects.get(company=self.quiet)
+        self.assertEqual((quiet.total_historical_listings, quiet.glassdoor_rating), (1, 4.2))
+
+
+class PipelineAnalyticsRollupTest(TestCase):
+    """PipelineDailyRollup upkeep and the analytics dashboard"""
+
+    def setUp(self):
+        from .ats_analytics import rollup_counters
+
+        self.rollup_counters = rollup_counters
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123')
+        UserProfile.objects.create(user=self.employer, user_type='employer', company_name='Test Corp')
+        self.job = Job.objects.create(
+            title='Test Job', company='Test Corp', description='Test description',
+            location='Test City', posted_by=self.employer,
+        )
+        self.stages = {
+            stage.name: stage for stage in HiringStage.create_default_stages_for_employer(self.employer)
+        }
+        self.client.login(username='employer', password='testpass123')
+
+    def _apply(self, username):
+        seeker = User.objects.create_user(username=username, password='testpass123')
+        UserProfile.objects.create(user=seeker, user_type='job_seeker')
+        PhoneVerification.objects.create(user=seeker, phone_number='+15551234567', is_verified=True)
+        seeker_client = Client()
+        seeker_client.login(username=username, password='testpass123')
+        seeker_client.post(reverse('apply_job', args=[self.job.id]), {'cover_letter': 'Hello'})
+        return JobApplication.objects.get(job=self.job, applicant=seeker)
+
+    def _move(self, application, stage_name):
+        response = self.client.post(
+            reverse('move_application_stage', args=[application.id]),
+            {'stage_id': self.stages[stage_name].id},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def _stored(self):
+        from .models import PipelineDailyRollup
+        from .ats_analytics import ROLLUP_COUNTERS
+
+        totals = {}
+        for row in PipelineDailyRollup.objects.all():
+            entry = totals.setdefault((row.employer_id, row.date, row.stage_id), dict.fromkeys(ROLLUP_COUNTERS, 0))
+            for field in ROLLUP_COUNTERS:
+                entry[field] += getattr(row, field)
+        return totals
+
+    def test_views_keep_rollup_equal_to_rebuild(self):
+        """apply_job and move_application_stage increments match a full recompute"""
+        first = self._apply('seeker1')
+        second = self._apply('seeker2')
+        for stage_name in ('Screening', 'Interview', 'Screening'):
+            self._move(first, stage_name)
+        self._move(second, 'Screening')
+
+        stored = self._stored()
+        self.assertEqual(stored, dict(self.rollup_counters()))
+        screening = stored[self.employer.pk, timezone.localdate(), self.stages['Screening'].pk]
+        self.assertEqual((screening['entered'], screening['reached'], screening['exited']), (3, 2, 1))
+        received = stored[self.employer.pk, timezone.localdate(), None]
+        self.assertEqual(received['applications'], 2)
+
+    def test_deleting_applications_rebuilds_rollup_on_commit(self):
+        """Deleted applications (directly or with their job) drop out of the rollup"""
+        first = self._apply('seeker1')
+        self._apply('seeker2')
+        self._move(first, 'Screening')
+        other_job = Job.objects.create(
+            title='Other Job', company='Test Corp', description='x',
+            location='Test City', posted_by=self.employer,
+        )
+        JobApplication.objects.create(job=other_job, applicant=first.applicant)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            first.delete()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self._stored(), dict(self.rollup_counters()))
+        received = self._stored()[self.employer.pk, timezone.localdate(), None]
+        self.assertEqual(received['applications'], 2)
+
+        # One rebuild per employer for a delete() that cascades to many applications
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Job.objects.filter(posted_by=self.employer).delete()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self._stored(), {})
+
+    def test_rebuild_computes_durations_and_funnel(self):
+        """Window-function rebuild: LEAD durations, first visits for the funnel"""
+        from .ats_analytics import pipeline_metrics, rebuild_rollups
+
+        now = timezone.now()
+        seekers = [User.objects.create_user(username=f'dated{i}') for i in range(2)]
+        paths = [
+            # (stage, days ago) in order
+            [('Applied', 10), ('Screening', 8), ('Interview', 4), ('Screening', 3)],
+            [('Applied', 6), ('Screening', 5)],
+        ]
+        for seeker, path in zip(seekers, paths):
+            application = JobApplication.objects.create(job=self.job, applicant=seeker)
+            for stage_name, days_ago in path:
+                history = ApplicationStageHistory.objects.create(
+                    application=application, stage=self.stages[stage_name],
+                )
+                ApplicationStageHistory.objects.filter(pk=history.pk).update(
+                    changed_at=now - timedelta(days=days_ago),
+                )
+
+        self.assertGreater(rebuild_rollups(), 0)
+        metrics = pipeline_metrics(self.employer)
+        days = {row['stage']: row['avg_days'] for row in metrics['time_in_stage']}
+        # Applied: 2 days and 1 day; Screening: 4 days (the open visits don't count)
+        self.assertEqual(days['Applied'], 1.5)
+        self.assertEqual(days['Screening'], 4.0)
+        self.assertEqual(days['Interview'], 1.0)
+        funnel = {(row['from_stage'], row['to_stage']): (row['from_count'], row['to_count'])
+                  for row in metrics['conversion_rates']}
+        self.assertEqual(funnel['Applied', 'Screening'], (2, 2))
+        self.assertEqual(funnel['Screening', 'Interview'], (2, 1))
+        self.assertEqual(metrics['total_applications'], 2)
+
+    def test_dashboard_queries_do_not_grow_with_pipeline(self):
+        """The analytics dashboard runs the same queries for 1 or many applications"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def dashboard_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('analytics_dashboard'))
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        self._move(self._apply('seeker0'), 'Screening')
+        small = dashboard_queries()
+        for index in range(1, 5):
+            application = self._apply(f'seeker{index}')
+            for stage_name in ('Screening', 'Interview', 'Offer'):
+                self._move(application, stage_name)
+        self.assertEqual(dashboard_queries(), small)
+        response = self.client.get(reverse('analytics_dashboard'))
+        self.assertEqual(response.context['total_applications'], 5)
+        self.assertEqual(response.context['recent_applications'], 5)
+
+
+class AnalyticsExportStreamingTest(TestCase):
+    """Streaming analytics_export"""
+
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123')
+        UserProfile.objects.create(user=self.employer, user_type='employer', company_name='Test Corp')
+        self.stages = HiringStage.create_default_stages_for_employer(self.employer)
+        self.tag = ApplicationTag.objects.create(employer=self.employer, name='Priority', color='#ff0000')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Export Job {index}', company='Test Corp', description='Test description',
+                location='Test City', posted_by=self.employer,
+            )
+            for index in range(2)
+        ]
+        self.client.login(username='employer', password='testpass123')
+
+    def _add_applications(self, count, prefix):
+        for index in range(count):
+            seeker = User.objects.create_user(username=f'{prefix}{index}')
+            application = JobApplication.objects.create(
+                job=self.jobs[index % 2], applicant=seeker,
+                status=('pending', 'rejected')[index % 2],
+                current_stage=self.stages[1] if index % 3 == 0 else None,
+            )
+            ApplicationRating.objects.create(application=application, rater=self.employer, overall_rating=4)
+            ApplicationRating.objects.create(application=application, rater=seeker, overall_rating=5)
+            ApplicationTagAssignment.objects.create(application=application, tag=self.tag)
+
+    def _export(self, export_type, **params):
+        import csv
+        import gzip
+
+        response = self.client.get(reverse('analytics_export'), {'type': export_type, **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content)
+        if params.get('gzip'):
+            self.assertEqual(response['Content-Type'], 'application/gzip')
+            self.assertTrue(response['Content-Disposition'].endswith('.csv.gz"'))
+            body = gzip.decompress(body)
+        return list(csv.reader(body.decode().splitlines()))
+
+    def test_exports_and_gzip(self):
+        self._add_applications(4, 'seeker')
+
+        applications = self._export('applications')
+        self.assertEqual(applications[0][0], 'Job Title')
+        self.assertEqual(len(applications), 5)
+        self.assertEqual({row[6] for row in applications[1:]}, {'4.5'})
+        self.assertEqual({row[7] for row in applications[1:]}, {'Priority'})
+
+        jobs = {row[0]: row[5:] for row in self._export('jobs')[1:]}
+        # Two applications each: job 0 gets the pending ones, job 1 the rejected ones
+        self.assertEqual(jobs['Export Job 0'], ['2', '2', '0', '0', '0'])
+        self.assertEqual(jobs['Export Job 1'], ['2', '0', '0', '0', '2'])
+
+        pipeline = {(row[0], row[1]): row[2] for row in self._export('pipeline')[1:]}
+        self.assertEqual(len(pipeline), 2 * len(self.stages))
+        self.assertEqual(pipeline['Export Job 0', 'Screening'], '1')
+        self.assertEqual(pipeline['Export Job 1', 'Screening'], '1')
+
+        self.assertEqual(self._export('applications', gzip='1'), applications)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def export_queries(export_type):
+            with CaptureQueriesContext(connection) as queries:
+                self._export(export_type)
+            return len(queries)
+
+        self._add_applications(2, 'few')
+        before = {export_type: export_queries(export_type) for export_type in ('applications', 'pipeline', 'jobs')}
+        self._add_applications(12, 'many')
+        after = {export_type: export_queries(export_type) for export_type in ('applications', 'pipeline', 'jobs')}
+        self.assertEqual(after, before)
+
+    def test_keyset_pages(self):
+        from .csv_export import keyset_pages
+
+        self._add_applications(5, 'paged')
+        pages = list(keyset_pages(JobApplication.objects.all(), page_size=2))
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        pks = [application.pk for page in pages for application in page]
+        self.assertEqual(pks, sorted(pks))
+
+
+class CandidateSearchIndexTest(TestCase):
+    """Denormalized contact_verified and the paginated candidate search"""
+
+    def setUp(self):
+        self.client = Client()
+        self.employer = User.objects.create_user(username='employer', password='testpass123')
+        UserProfile.objects.create(user=self.employer, user_type='employer', company_name='Test Corp')
+        self.client.login(username='employer', password='testpass123')
+
+    def _seeker(self, username, verified_by=None, **fields):
+        user = User.objects.create_user(username=username, first_name=username.title())
+        profile = UserProfile.objects.create(user=user, user_type='job_seeker', **fields)
+        if verified_by == 'phone':
+            PhoneVerification.objects.create(user=user, phone_number='+15551234567', is_verified=True)
+        elif verified_by == 'email':
+            EmailVerification.objects.create(user=user, verification_token=f'token-{username}', is_verified=True)
+        return profile
+
+    def _verified(self, profile):
+        return UserProfile.objects.values_list('contact_verified', flat=True).get(pk=profile.pk)
+
+    def test_contact_verified_follows_verifications(self):
+        profile = self._seeker('ada')
+        self.assertFalse(self._verified(profile))
+
+        phone = PhoneVerification.objects.create(user=profile.user, phone_number='+15551234567')
+        self.assertFalse(self._verified(profile))
+        phone.is_verified = True
+        phone.save()
+        self.assertTrue(self._verified(profile))
+
+        # A full profile save doesn't write back the stale in-memory flag
+        profile.bio = 'Updated'
+        profile.save()
+        self.assertTrue(self._verified(profile))
+
+        phone.delete()
+        self.assertFalse(self._verified(profile))
+        EmailVerification.objects.create(user=profile.user, verification_token='token-ada', is_verified=True)
+        self.assertTrue(self._verified(profile))
+        self.assertEqual(self._verified(profile), UserProfile.objects.get(pk=profile.pk).is_verified())
+
+    def test_search_returns_verified_matches_only(self):
+        self._seeker('phoneuser', 'phone', skills='Python, Django')
+        self._seeker('emailuser', 'email', desired_title='Python Developer')
+        self._seeker('unverified', skills='Python')
+        self._seeker('hidden', 'phone', skills='Python', profile_searchable=False)
+        self._seeker('other', 'phone', skills='Accounting')
+
+        response = self.client.get(reverse('candidate_search'), {'search': 'python'})
+        self.assertEqual(response.status_code, 200)
+        usernames = {candidate.user.username for candidate in response.context['candidates']}
+        self.assertEqual(usernames, {'phoneuser', 'emailuser'})
+        self.assertEqual(response.context['total_results'], 2)
+
+    def test_paginated_with_fixed_query_count(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .views import CANDIDATES_PER_PAGE
+
+        def search_queries(**params):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('candidate_search'), params)
+            self.assertEqual(response.status_code, 200)
+            return response, len(queries)
+
+        for index in range(CANDIDATES_PER_PAGE + 1):
+            self._seeker(f'seeker{index}', ('phone', 'email')[index % 2])
+        response, first = search_queries()
+        self.assertEqual(len(response.context['candidates']), CANDIDATES_PER_PAGE)
+        self.assertEqual(response.context['total_results'], CANDIDATES_PER_PAGE + 1)
+
+        for index in range(CANDIDATES_PER_PAGE):
+            self._seeker(f'more{index}', 'phone')
+        response, more = search_queries()
+        self.assertEqual(more, first)
+
+        response, _ = search_queries(page=3)
+        self.assertEqual(len(response.context['candidates']), 1)
+
+
 class HASManagementCommandTest(TestCase):
     """Test HAS management commands"""
 
@@ -1,10 +1,10 @@
 """
 UnifiedListing wrapper for merging Job and ScrapedJobListing into a single feed.
 
-Normalizes both models into a common interface for templates.
+Normalizes both models into a common interface for templates. Ordering and
+pagination of the merged feed live in jobs/feed.py.
 """
 from django.urls import reverse
-from django.utils import timezone
 from datetime import timedelta
 
 
@@ -122,48 +122,3 @@ class UnifiedListing:
             return self._obj.activity_score.total_score
         except Exception:
             return None
-
-    def compute_sort_score(self, sort_mode):
-        now = timezone.now()
-        age_days = (now - self.posted_date).total_seconds() / 86400
-
-        # Verified postings always sort above observed in all modes.
-        # We add 100000 to ensure verified never interleaves with observed.
-        verified_boost = 100000 if self._is_verified else 0
-
-        if sort_mode == 'newest':
-            # Chronological within each group
-            return verified_boost + self.posted_date.timestamp() / 1e10
-
-        elif sort_mode == 'activity':
-            # HAS score descending; verified treated as score=100
-            if self._is_verified:
-                return verified_boost + (100 - min(age_days, 100))
-            has = self.has_score_value or 0
-            return has
-
-        else:
-            # "relevant" (default): blended score
-            freshness = max(0, 30 - age_days)  # 0-30 pts
-
-            if self._is_verified:
-                return verified_boost + freshness
-            else:
-                has = self.has_score_value or 0
-                return (has * 0.5) + freshness
-
-    @staticmethod
-    def merge_querysets(verified_qs, observed_qs, sort_mode='relevant'):
-        """
-        Wrap both querysets in UnifiedListing, merge, sort, and return a list.
-        """
-        items = []
-        for job in verified_qs:
-            items.append(UnifiedListing(job))
-        for listing in observed_qs:
-            items.append(UnifiedListing(listing))
-
-        reverse_sort = True  # Higher score = first
-        items.sort(key=lambda x: x.compute_sort_score(sort_mode), reverse=reverse_sort)
-
-        return items
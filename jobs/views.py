@@ -4,7 +4,7 @@ from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Q
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, QueryDict
 from django.utils import timezone
 from django.conf import settings
 from django.views.decorators.http import require_POST
@@ -24,7 +24,7 @@ from .models import (Job, UserProfile, JobApplication, PhoneVerification, EmailV
                      EmailLog, Message, EmployerTeam, TeamMember, TeamInvitation, ActivityLog,
                      ChatLog, TwoFactorCode, SiteVisit,
                      # HAS models
-                     Company, ScrapedJobListing, HiringActivityScore, CompanyHiringProfile, ListingFeedback)
+                     ScrapedJobListing, HiringActivityScore, ListingFeedback)
 from .forms import (JobSeekerSignUpForm, EmployerSignUpForm, RecruiterSignUpForm,
                    JobPostForm, JobApplicationForm, JobSeekerProfileForm,
                    EmployerProfileForm, RecruiterProfileForm)
@@ -47,204 +47,17 @@ def home(request):
 
     The page leads with what the HAS filter REJECTS (identity for first-time
     visitors), then "what changed since yesterday" + freshness tiers (the
-    return-visit hook). All expensive data is cached for 30 minutes, same
-    pattern/rationale as v1 — see the cache notes below.
+    return-visit hook). All expensive data is cached for 30 minutes — see
+    jobs/homepage.py.
     """
-    from datetime import timedelta
-    from django.core.cache import cache
-    from django.db.models import Avg, Count
+    from .homepage import get_home_payload
     from .unified import UnifiedListing
 
-    # Cache the expensive data for 30 minutes; the template still renders
-    # per-request so the (per-user) navbar auth state stays correct. Longer TTL
-    # keeps rebuilds rare so they're unlikely to land inside the daily 09:00 UTC
-    # rescore window (DB saturated → 60s timeout risk). Bumped key to v2 for the
-    # filter-first redesign payload.
-    CACHE_KEY = 'home_page_data_v3'  # v3: salary column removed, ticker title filter
-    CACHE_TTL = 1800
-
-    # NOTE: we cache RAW model instances (which pickle cleanly), not
-    # UnifiedListing wrappers — the wrapper's __getattr__ infinitely recurses
-    # under pickle. The wrapping is cheap; it's the DB queries we're caching.
-    data = cache.get(CACHE_KEY)
-    if data is None:
-        now = timezone.now()
-        day_ago = now - timedelta(hours=24)
-        week_ago = now - timedelta(days=7)
-
-        OBSERVED_LIVE = dict(published_to_board=True, status__in=['active', 'published'])
-        published = ScrapedJobListing.objects.filter(**OBSERVED_LIVE)
-
-        # ---- Hero: the filter numbers -----------------------------------
-        # Verified postings (employer-posted)
-        verified_jobs = list(Job.objects.filter(is_active=True).order_by('-posted_date')[:4])
-        total_verified = Job.objects.filter(is_active=True).count()
-        total_observed = published.count()
-        total_jobs = total_verified + total_observed
-
-        # Everything currently tracked from employer hiring systems that hasn't
-        # been confirmed closed. tracked - published = listings that did NOT
-        # clear the 65-point publish bar (the number the hero leads with).
-        total_tracked = ScrapedJobListing.objects.exclude(status='closed').count()
-        total_rejected = max(total_tracked - total_observed, 0)
-
-        # Distinct company count. Computed DB-side per table (one aggregate
-        # each) — see v1 note: pulling names into Python to union timed out
-        # during the 09:00 rescore. Slight double-count possible for a company
-        # in both tables; negligible for a homepage stat.
-        verified_companies = (
-            Job.objects.filter(is_active=True)
-            .values('company').distinct().count()
-        )
-        observed_companies = published.values('company_name').distinct().count()
-        total_companies = verified_companies + observed_companies
-
-        # ---- Freshness tiers (counts drive the "Beat the crowd" pills) --
-        fresh_counts = {
-            'h24': published.filter(date_first_seen__gte=day_ago).count(),
-            'h48': published.filter(date_first_seen__gte=now - timedelta(hours=48)).count(),
-            'd7': published.filter(date_first_seen__gte=week_ago).count(),
-        }
-
-        # Newest published listings for the card grid (score as tiebreaker).
-        # defer() the heavy columns the cards never read (see job_list note on
-        # raw_data/description_summary RSS cost).
-        fresh_listings = list(
-            published.select_related('activity_score')
-            .defer('description_summary', 'raw_data')
-            .order_by('-date_first_seen', '-activity_score__total_score')[:6]
-        )
-
-        # Compact per-card "why it's here" chips, derived from fields we
-        # already have in hand (not a full breakdown — that lives on the
-        # detail page). Keyed by pk because custom attrs shouldn't ride
-        # through the pickle cache.
-        fresh_reasons = {}
-        for listing in fresh_listings:
-            reasons = []
-            if listing.salary_min or listing.salary_max:
-                reasons.append('Salary listed')
-            days = listing.days_since_posted()
-            if days <= 2:
-                reasons.append('Posted in the last 48h')
-            elif days <= 7:
-                reasons.append('Posted this week')
-            if listing.repost_count == 0:
-                reasons.append('Not a repost')
-            try:
-                breakdown = listing.activity_score.score_breakdown or {}
-                velocity = breakdown.get('company_velocity', {})
-                if isinstance(velocity, dict) and velocity.get('points', 0) >= 4:
-                    reasons.append('Company hiring actively')
-            except (HiringActivityScore.DoesNotExist, AttributeError):
-                pass
-            fresh_reasons[listing.pk] = reasons[:3]
-
-        # ---- "What changed since yesterday" delta block ------------------
-        delta = {
-            'new_24h': fresh_counts['h24'],
-            'closed_24h': ScrapedJobListing.objects.filter(
-                date_removed__gte=day_ago
-            ).count(),
-            'reposts_24h': ScrapedJobListing.objects.filter(
-                date_first_seen__gte=day_ago, repost_count__gte=1
-            ).count(),
-            'ramping': CompanyHiringProfile.objects.filter(
-                net_job_movement_30d__gte=5
-            ).count(),
-            'quiet': CompanyHiringProfile.objects.filter(
-                total_active_listings__gte=10
-            ).filter(
-                Q(listing_close_rate_30d__isnull=True) | Q(listing_close_rate_30d__lte=0)
-            ).count(),
-        }
-
-        # ---- "Rejected today" ticker (anonymized) ------------------------
-        # Company names are deliberately withheld: a low score is a probability
-        # estimate of hiring activity, not an accusation of bad faith.
-        ticker_items = []
-        rejected_rows = (
-            ScrapedJobListing.objects.filter(
-                published_to_board=False, status__in=['active', 'stale']
-            )
-            .select_related('activity_score')
-            .defer('description', 'description_summary', 'raw_data')
-            .order_by('-date_last_seen')[:40]
-        )
-        for listing in rejected_rows:
-            try:
-                score = listing.activity_score.total_score
-            except (HiringActivityScore.DoesNotExist, AttributeError):
-                continue
-            # Skip junk titles (spammy feeds shout in all caps) — the ticker is
-            # brand surface, so only show listings that read like real roles.
-            title = (listing.title or '').strip()
-            if len(title) < 8 or (len(title) > 20 and title == title.upper()):
-                continue
-            if listing.repost_count >= 3:
-                reason = 'reposted %d times with near-identical text' % listing.repost_count
-            elif listing.days_since_posted() >= 90:
-                reason = 'open %d days' % listing.days_since_posted()
-            elif not (listing.salary_min or listing.salary_max):
-                reason = 'no salary, weak activity signals'
-            else:
-                reason = 'weak hiring-activity signals'
-            label = listing.get_job_category_display() if listing.job_category else 'Listing'
-            ticker_items.append({
-                'label': label,
-                'title': listing.title[:80],
-                'reason': reason,
-                'score': score,
-            })
-            if len(ticker_items) >= 6:
-                break
-
-        # ---- Employers ranked by behavior --------------------------------
-        # One grouped aggregate over the published set (~22k rows), cached.
-        # Ranked by average HAS among companies with a meaningful live count —
-        # behavior, not logo size.
-        # NOTE: no salary column here (yet). Structured salary_min/max is only
-        # populated for some feed sources; direct-ATS listings carry salary in
-        # description text the sync doesn't parse, so a "% salary listed" column
-        # would falsely shame the most transparent employers. Reinstate once
-        # salary extraction backfills the structured fields.
-        employer_rows = list(
-            published.values('company_name')
-            .annotate(
-                live=Count('id'),
-                avg_has=Avg('activity_score__total_score'),
-                new_week=Count('id', filter=Q(date_first_seen__gte=week_ago)),
-            )
-            .filter(live__gte=15, avg_has__isnull=False)
-            .order_by('-avg_has')[:6]
-        )
-        for row in employer_rows:
-            row['avg_has'] = round(row['avg_has'])
-
-        data = {
-            'verified_jobs': verified_jobs,
-            'fresh_listings': fresh_listings,
-            'fresh_reasons': fresh_reasons,
-            'fresh_counts': fresh_counts,
-            'delta': delta,
-            'ticker_items': ticker_items,
-            'employer_rows': employer_rows,
-            'total_jobs': total_jobs,
-            'total_tracked': total_tracked,
-            'total_rejected': total_rejected,
-            'total_companies': total_companies,
-            # Pre-formatted display strings (humanize isn't installed)
-            'fmt': {
-                'total_jobs': f'{total_jobs:,}',
-                'total_tracked': f'{total_tracked:,}',
-                'total_rejected': f'{total_rejected:,}',
-                'total_companies': f'{total_companies:,}',
-                'new_24h': f"{delta['new_24h']:,}",
-                'h48': f"{fresh_counts['h48']:,}",
-                'd7': f"{fresh_counts['d7']:,}",
-            },
-        }
-        cache.set(CACHE_KEY, data, CACHE_TTL)
+    # The expensive, user-independent data comes from the shared cache (one
+    # copy per deployment, rebuilt single-flight, kept warm by
+    # `refresh_home_cache`); see jobs/homepage.py. The template still renders
+    # per request so the (per-user) navbar auth state stays correct.
+    data = get_home_payload()
 
     # Wrap observed listings per-request (cheap; not cached — see note above)
     fresh_cards = [
@@ -292,11 +105,25 @@ def home(request):
     return render(request, 'jobs/home.html', context)
 
 
+# Every GET parameter job_list reads. A request carrying anything else is
+# rendered uncached (see jobs/pagecache.py). 'page' is the legacy Paginator
+# param, accepted and ignored.
+JOB_LIST_PARAMS = frozenset({
+    'search', 'location', 'country', 'salary', 'date_posted', 'job_type',
+    'experience', 'remote', 'source', 'activity', 'sort', 'cursor', 'page',
+})
+
+
 def job_list(request):
     import hashlib
+    import math
     from datetime import timedelta
     from django.core.cache import cache
-    from django.core.paginator import Paginator
+    from django.db.models import Count
+    from .feed import (Feed, FeedCursor, FeedSource, PAGE_SIZE, SORT_MODES,
+                       observed_sort_keys, verified_sort_keys)
+    from .pagecache import anonymous_page_key, serve_cached_page, store_cached_page
+    from .search import ListingSearch
     from .unified import UnifiedListing
 
     # Read filter params
@@ -319,6 +146,44 @@ def job_list(request):
     source_filter = request.GET.get('source', '')
     activity_filter = request.GET.get('activity', '')
     sort_mode = request.GET.get('sort', 'relevant')
+    if sort_mode not in SORT_MODES:
+        sort_mode = 'relevant'
+
+    # Keyset position for the merged feed. A malformed or tampered cursor just
+    # decodes to None (first page).
+    cursor = FeedCursor.decode(request.GET.get('cursor', ''))
+
+    # Search goes through jobs/search.py (see the filters below); the page
+    # only ever sees the normalized text.
+    search = ListingSearch(search_query)
+    search_query = search.text
+
+    # The normalized filters, as a querystring. Every link on the page is
+    # built from this rather than request.GET, so the rendered page depends
+    # only on it (and the cursor). 'country' is always written explicitly:
+    # job_list() re-defaults a completely empty querystring back to US-only,
+    # so a URL that merely omits country would switch the filter back on.
+    filters = QueryDict(mutable=True)
+    for param, value in [
+        ('search', search_query), ('location', location_filter), ('country', country_filter),
+        ('salary', salary_filter), ('date_posted', date_filter), ('job_type', job_type_filter),
+        ('experience', experience_filter), ('remote', remote_filter),
+        ('source', source_filter), ('activity', activity_filter),
+        ('sort', '' if sort_mode == 'relevant' else sort_mode),
+    ]:
+        if value or param == 'country':
+            filters[param] = value
+
+    # Anonymous hits are served whole from the page cache (keyed on the host,
+    # the normalized filters + cursor and the feed generation) with only the
+    # navbar/messages and CSRF token rendered fresh — see jobs/pagecache.py.
+    page_key = anonymous_page_key(
+        request, 'job_list', JOB_LIST_PARAMS,
+        (filters.urlencode(), cursor.encode() if cursor else ''),
+    )
+    cached_response = serve_cached_page(request, page_key)
+    if cached_response is not None:
+        return cached_response
 
     # --- Verified jobs queryset ---
     verified_qs = Job.objects.filter(is_active=True).filter(
@@ -331,52 +196,25 @@ def job_list(request):
         status__in=['active', 'published']
     ).select_related('activity_score')
 
-    # Apply shared filters to both
-    if search_query:
-        verified_qs = verified_qs.filter(
-            Q(title__icontains=search_query) |
-            Q(company__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(location__icontains=search_query)
-        )
-        # IMPORTANT: do NOT ILIKE the observed `description` column. It's a large
-        # free-text field on a ~67k-row table with no trigram index, so
-        # `description ILIKE '%term%'` forces a sequential substring scan over
-        # every published row. Measured on prod: searching title/company/location
-        # takes ~3.9s, but ADDING description pushes the SAME query to ~20.8s — and
-        # under concurrent load that's what tripped the 60s gunicorn timeout (a bot
-        # firing broad /jobs/?search= queries 500'd repeatedly, 2026-06-04). Title +
-        # company + location covers the searches users actually run. To restore
-        # description search cheaply, add a pg_trgm GIN index on description and put
-        # it back (see follow-up). Verified (Job) is tiny, so its description ILIKE
-        # above is free and stays.
-        observed_qs = observed_qs.filter(
-            Q(title__icontains=search_query) |
-            Q(company_name__icontains=search_query) |
-            Q(location__icontains=search_query)
-        )
+    # Apply shared filters to both. Search goes through jobs/search.py: a
+    # GIN-indexed tsvector over title/company/location/description for the
+    # observed table (the old ILIKE chain had to leave description out — a
+    # ~20.8s seq scan that 500'd under bot traffic), plain ILIKE for the tiny
+    # verified table.
+    if search:
+        verified_qs = search.filter_verified(verified_qs)
+        observed_qs = search.filter_observed(observed_qs)
 
     if location_filter:
         verified_qs = verified_qs.filter(location__icontains=location_filter)
         observed_qs = observed_qs.filter(location__icontains=location_filter)
 
     if country_filter == 'us':
-        # Match US locations: state abbreviations, "United States", city/state patterns
-        US_STATES = [
-            'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
-            'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
-            'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
-            'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
-            'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY',
-            'DC',
-        ]
-        us_q = Q(location__icontains='United States') | Q(location__icontains=', US')
-        for state in US_STATES:
-            # Match ", CA", ", CA " patterns (state abbrev after comma)
-            us_q |= Q(location__endswith=f', {state}')
-            us_q |= Q(location__icontains=f', {state} ')
-        verified_qs = verified_qs.filter(us_q)
-        observed_qs = observed_qs.filter(us_q)
+        # country_code is parsed from location when the row is saved
+        # (jobs/locations.py) and indexed — this used to be a ~100-term
+        # endswith/icontains OR chain over the 50 states.
+        verified_qs = verified_qs.filter(country_code='US')
+        observed_qs = observed_qs.filter(country_code='US')
 
     if salary_filter == 'with_salary':
         verified_qs = verified_qs.exclude(salary='')
@@ -420,105 +258,92 @@ def job_list(request):
     elif source_filter == 'observed':
         verified_qs = verified_qs.none()
 
-    # Drop heavy columns the card feed never reads before the rows are
-    # materialized into UnifiedListing objects. merge_querysets() pulls up to
-    # CAP rows from each queryset into memory and sorts them in Python, so on a
-    # 512MB worker these unused fields (especially the scraped raw_data JSON
-    # payload) were a major source of transient RSS under crawler load.
+    # Drop heavy columns the card feed never reads. The feed only materializes
+    # one page worth of rows per source now, but the scraped raw_data JSON
+    # payload, AI summary and full-text search vector are still dead weight on
+    # every one of them.
     # NOTE: 'description' is intentionally kept — the card renders a snippet of
-    # it, so deferring it would cause an N+1 on the paginated slice.
+    # it, so deferring it would cause an N+1 on the rendered page.
     # Job (verified) has no heavy columns beyond 'description', which the card
-    # snippet needs, so nothing is deferred there. ScrapedJobListing (observed)
-    # carries the bulky AI summary + raw scraped JSON the feed skips.
+    # snippet needs, so nothing is deferred there.
     # NOTE: only defer fields that actually exist — 'requirements' is NOT a
     # ScrapedJobListing field (it's the boolean has_requirements), and Job has no
     # 'requirements' at all; deferring a nonexistent field raises FieldError and
     # 500s the whole /jobs/ page.
-    observed_qs = observed_qs.defer('description_summary', 'raw_data')
-
-    # True counts against the fully-filtered (pre-cap) querysets. Unlike the old
-    # len()-after-slice (a LIMIT 500 query that can stop as soon as Postgres finds
-    # 500 matches), COUNT(*) has no LIMIT and must evaluate the WHERE clause across
-    # every matching row. The default (unfiltered) US-only filter is a ~100-term
-    # OR chain (2 conditions x 50 states) against the ~large observed table, which
-    # doesn't stay index-friendly across that many ORs — so an uncached COUNT(*)
-    # on every request risks being much slower than the old capped-fetch approach.
-    # Cache per unique filter combination (short TTL — counts don't need to be
-    # real-time, and this absorbs repeat hits on the default filter set, by far
-    # the most common case) instead of recomputing on every request.
-    count_cache_key = 'job_list_counts:' + hashlib.md5('|'.join([
+    observed_qs = observed_qs.defer('description_summary', 'raw_data', 'search_vector')
+
+    # True counts + facet counts against the fully-filtered querysets: one
+    # conditional aggregate per source (COUNT(*) FILTER (WHERE ...)), so the
+    # facets describe every match, not just the rendered page. These still have
+    # to visit every matching row (~20k for the default US filter, now an
+    # indexed country_code equality), so cache per unique filter combination
+    # (short TTL — counts don't need to be real-time, and this absorbs repeat
+    # hits on the default filter set, by far the most common case). Do NOT split
+    # these into per-facet .count() queries: seven more COUNT(*)s over the
+    # matching set per request is exactly the shape that tripped the 60s
+    # gunicorn timeout before.
+    now = timezone.now()
+    cutoff_24h = now - timedelta(hours=24)
+    cutoff_7d = now - timedelta(days=7)
+    count_cache_key = 'job_list_counts_v3:' + hashlib.md5('|'.join([
         search_query, location_filter, country_filter, salary_filter,
         date_filter, job_type_filter, experience_filter, remote_filter,
         source_filter, activity_filter,
     ]).encode()).hexdigest()
     cached_counts = cache.get(count_cache_key)
     if cached_counts is not None:
-        verified_count, observed_count = cached_counts
+        verified_stats, observed_stats = cached_counts
     else:
-        verified_count = verified_qs.count()
-        observed_count = observed_qs.count()
-        cache.set(count_cache_key, (verified_count, observed_count), 120)
+        verified_stats = verified_qs.aggregate(
+            total=Count('pk'),
+            h24=Count('pk', filter=Q(posted_date__gte=cutoff_24h)),
+            d7=Count('pk', filter=Q(posted_date__gte=cutoff_7d)),
+            salary=Count('pk', filter=~Q(salary='')),
+            remote=Count('pk', filter=Q(remote_status='remote')),
+        )
+        # feed_posted_at / feed_activity are the persisted rank columns, so
+        # these facets need no join to jobs_hiringactivityscore.
+        observed_stats = observed_qs.aggregate(
+            total=Count('pk'),
+            h24=Count('pk', filter=Q(feed_posted_at__gte=cutoff_24h)),
+            d7=Count('pk', filter=Q(feed_posted_at__gte=cutoff_7d)),
+            salary=Count('pk', filter=Q(salary_min__isnull=False) | Q(salary_max__isnull=False)),
+            remote=Count('pk', filter=Q(remote_status__icontains='remote')),
+            score80=Count('pk', filter=Q(feed_activity__gte=80)),
+        )
+        cache.set(count_cache_key, (verified_stats, observed_stats), 120)
+    verified_count = verified_stats['total']
+    observed_count = observed_stats['total']
     total_results = verified_count + observed_count
 
-    # Cap querysets for performance. merge_querysets() pulls these into memory and
-    # builds + sorts UnifiedListing objects in Python on EVERY /jobs/ request
-    # (regardless of page), so CAP directly drives per-request CPU/RSS. At 2000 the
-    # worst case was ~4000 objects/request, slow enough to trip the 60s gunicorn
-    # timeout under load. 500 caps it at ~1000 objects (~4x cheaper). Deep pages
-    # beyond this aren't reachable, which is fine: real users don't page that far
-    # and robots.txt already blocks crawlers from ?page=N.
-    CAP = 500
-    verified_qs = verified_qs[:CAP]
-    observed_qs = observed_qs[:CAP]
-    browsable_count = min(verified_count, CAP) + min(observed_count, CAP)
-    results_truncated = total_results > browsable_count
-
-    # Merge and sort
-    items = UnifiedListing.merge_querysets(verified_qs, observed_qs, sort_mode)
-
-    # --- Facet counts over the already-materialized result set -------------
-    # Computed in Python from `items`, which merge_querysets() has already
-    # pulled into memory and walked once (compute_sort_score touches
-    # posted_date and has_score_value on every element). So this second pass
-    # adds ZERO database queries and loads no new columns — it's the one place
-    # we can afford live facet counts. Do NOT reimplement these as per-facet
-    # .count() queries: the default US-only filter is a ~100-term OR chain, and
-    # running seven more COUNT(*)s across it per request is exactly the shape
-    # that tripped the 60s gunicorn timeout before (see the count-cache note).
-    #
-    # These describe the CAPPED browsable set, not the true total, so the
-    # template labels them "in these results" — a truncated set must never
-    # read as a global claim.
-    now = timezone.now()
-    cutoff_24h = now - timedelta(hours=24)
-    cutoff_7d = now - timedelta(days=7)
     facets = {
-        'h24': 0, 'd7': 0, 'salary': 0,
-        'remote': 0, 'score80': 0, 'verified': 0,
+        'h24': verified_stats['h24'] + observed_stats['h24'],
+        'd7': verified_stats['d7'] + observed_stats['d7'],
+        'salary': verified_stats['salary'] + observed_stats['salary'],
+        'remote': verified_stats['remote'] + observed_stats['remote'],
+        'score80': observed_stats['score80'],
+        'verified': verified_count,
     }
-    for entry in items:
-        if entry.is_verified:
-            facets['verified'] += 1
-        elif (entry.has_score_value or 0) >= 80:
-            facets['score80'] += 1
-        entry_posted = entry.posted_date
-        if entry_posted:
-            if entry_posted >= cutoff_24h:
-                facets['h24'] += 1
-            if entry_posted >= cutoff_7d:
-                facets['d7'] += 1
-        if entry.has_salary:
-            facets['salary'] += 1
-        if 'remote' in (entry.remote_status_display or '').lower():
-            facets['remote'] += 1
 
-    # Paginate
-    paginator = Paginator(items, 25)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # --- One page of the merged feed ----------------------------------------
+    # Each source is ordered in the database and read from the cursor's keyset
+    # position with LIMIT 26, then merged (see jobs/feed.py). Verified postings
+    # are group 0 so they always sort above observed, as before.
+    observed_keys = observed_sort_keys(sort_mode)
+    # "Most relevant" with a search term ranks observed matches by text
+    # relevance first (ts_rank), the stored relevance key breaking ties.
+    rank = search.observed_rank(observed_qs) if sort_mode == 'relevant' else None
+    if rank is not None:
+        observed_keys = [('_fk_rank', rank)] + observed_keys
+    feed = Feed([
+        FeedSource(verified_qs, verified_sort_keys(sort_mode), group=0, wrap=UnifiedListing),
+        FeedSource(observed_qs, observed_keys, group=1, wrap=UnifiedListing),
+    ])
+    page_obj = feed.page(cursor, page_size=PAGE_SIZE)
+    num_pages = max(1, math.ceil(total_results / PAGE_SIZE))
 
     # --- Per-row "why it's here" chips + preview keys ----------------------
-    # Only for the 25 rows actually rendered, never the full capped set.
+    # Only for the 25 rows actually rendered.
     # Attributes are set on the UnifiedListing wrapper (which has no __slots__
     # and is built fresh per request, so nothing rides through a cache).
     for entry in page_obj:
@@ -541,15 +366,8 @@ def job_list(request):
 
     # --- URL builders for chips, facets, and the sort control --------------
     def _url_with(**overrides):
-        """Current filter URL with params overridden. None removes a param.
-
-        Always writes 'country' explicitly. job_list() re-defaults a completely
-        empty querystring back to US-only, so a URL that merely omits country
-        would silently switch the filter back on instead of off.
-        """
-        params = request.GET.copy()
-        params.pop('page', None)
-        params.setlist('country', [country_filter])
+        """Current filter URL with params overridden. None removes a param."""
+        params = filters.copy()
         for key, value in overrides.items():
             if value is None:
                 params.pop(key, None)
@@ -579,10 +397,8 @@ def job_list(request):
     # Hidden inputs that let the standalone sort form preserve every other
     # filter without duplicating 'country' (which arrives twice from the
     # drawer's hidden-input + checkbox pair).
-    sort_params = request.GET.copy()
-    sort_params.pop('page', None)
+    sort_params = filters.copy()
     sort_params.pop('sort', None)
-    sort_params.setlist('country', [country_filter])
     sort_hidden = [(key, value) for key in sort_params for value in sort_params.getlist(key)]
 
     active_chips = []
@@ -615,17 +431,18 @@ def job_list(request):
         try:
             from directory.utils import get_directory_results
             directory_employers, dir_mapping = get_directory_results(
-                search_query, location_filter, limit=6
+                search, location_filter, limit=6
             )
             if dir_mapping:
                 directory_match_title = dir_mapping.canonical_title
         except Exception:
             pass  # Directory is optional — don't break search if it fails
 
-    # Build filter querystring for pagination links (all GET params except 'page')
-    filter_params = request.GET.copy()
-    filter_params.pop('page', None)
-    filter_querystring = filter_params.urlencode()
+    # Filter querystring for pagination links: the normalized filters, without
+    # the position. 'page' (the legacy Paginator param) is dropped, so old
+    # links just land on the first page; 'country' is explicit, so a ?cursor=
+    # URL keeps the default US-only filter.
+    filter_querystring = filters.urlencode()
 
     context = {
         'page_obj': page_obj,
@@ -643,7 +460,7 @@ def job_list(request):
         'total_results': total_results,
         'verified_count': verified_count,
         'observed_count': observed_count,
-        'results_truncated': results_truncated,
+        'num_pages': num_pages,
         'filter_querystring': filter_querystring,
         'directory_employers': directory_employers,
         'directory_match_title': directory_match_title,
@@ -667,8 +484,10 @@ def job_list(request):
         'experience_level_choices': Job.EXPERIENCE_LEVEL_CHOICES,
         'remote_status_choices': Job.REMOTE_STATUS_CHOICES,
         'score_band_choices': HiringActivityScore.SCORE_BAND_CHOICES,
+        'page_cache_holes': page_key is not None,
     }
-    return render(request, 'jobs/job_list.html', context)
+    response = render(request, 'jobs/job_list.html', context)
+    return store_cached_page(request, page_key, response)
 
 
 def listing_preview(request, kind, pk):
@@ -1571,6 +1390,8 @@ def bulk_upload_jobs(request):
 
 @login_required
 def apply_job(request, job_id):
+    from .ats_analytics import record_application
+
     job = get_object_or_404(Job, id=job_id)
 
     if hasattr(request.user, 'userprofile') and request.user.userprofile.user_type == 'employer':
@@ -1602,6 +1423,7 @@ def apply_job(request, job_id):
             application.job = job
             application.applicant = request.user
             application.save()
+            record_application(application)
 
             # Notify employer of new application
             if job.posted_by:
@@ -1996,6 +1818,8 @@ def ats_pipeline(request, job_id):
 @login_required
 def move_application_stage(request, application_id):
     """Move an application to a different stage (AJAX endpoint)"""
+    from .ats_analytics import record_stage_change
+
     if request.method != 'POST':
         return HttpResponse(status=405)
 
@@ -2017,13 +1841,14 @@ def move_application_stage(request, application_id):
     application.current_stage = new_stage
     application.save()
 
-    # Record the stage change in history
-    ApplicationStageHistory.objects.create(
+    # Record the stage change in history, and in the analytics rollup
+    history = ApplicationStageHistory.objects.create(
         application=application,
         stage=new_stage,
         changed_by=request.user,
         notes=notes
     )
+    record_stage_change(history)
 
     # Update legacy status field based on stage name
     stage_to_status = {
@@ -3110,8 +2935,8 @@ def analytics_dashboard(request):
         return redirect('home')
 
     from django.db.models import Count, Avg, Q
-    from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
     from datetime import timedelta
+    from .ats_analytics import applications_by_date as daily_applications, pipeline_metrics
 
     # Date range filter
     date_range = request.GET.get('range', '30')  # Default 30 days
@@ -3124,119 +2949,32 @@ def analytics_dashboard(request):
 
     # Get employer's jobs
     jobs = Job.objects.filter(posted_by=request.user)
-    job_ids = jobs.values_list('id', flat=True)
 
     # Basic stats
-    total_jobs = jobs.count()
-    active_jobs = jobs.filter(is_active=True).count()
-    total_applications = JobApplication.objects.filter(job__in=jobs).count()
-    recent_applications = JobApplication.objects.filter(
-        job__in=jobs,
-        applied_date__gte=start_date
-    ).count()
-
-    # Applications over time (for chart)
-    applications_by_date = JobApplication.objects.filter(
-        job__in=jobs,
-        applied_date__gte=start_date
-    ).annotate(
-        date=TruncDate('applied_date')
-    ).values('date').annotate(
-        count=Count('id')
-    ).order_by('date')
-
-    # Stage distribution
-    stages = HiringStage.objects.filter(employer=request.user)
-    stage_distribution = []
-    for stage in stages:
-        count = JobApplication.objects.filter(
-            job__in=jobs,
-            current_stage=stage
-        ).count()
-        stage_distribution.append({
-            'name': stage.name,
-            'color': stage.color,
-            'count': count
-        })
-
-    # Add applications without a stage
-    no_stage_count = JobApplication.objects.filter(
-        job__in=jobs,
-        current_stage__isnull=True
-    ).count()
-    if no_stage_count > 0:
-        stage_distribution.insert(0, {
-            'name': 'No Stage',
-            'color': '#e9ecef',
-            'count': no_stage_count
-        })
+    job_counts = jobs.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
 
-    # Conversion rates (stage to stage)
-    conversion_rates = []
-    ordered_stages = list(stages.order_by('order'))
-    for i, stage in enumerate(ordered_stages[:-1]):
-        current_count = JobApplication.objects.filter(
-            job__in=jobs,
-            stage_history__stage=stage
-        ).distinct().count()
-        next_stage = ordered_stages[i + 1]
-        next_count = JobApplication.objects.filter(
-            job__in=jobs,
-            stage_history__stage=next_stage
-        ).distinct().count()
-
-        rate = (next_count / current_count * 100) if current_count > 0 else 0
-        conversion_rates.append({
-            'from_stage': stage.name,
-            'to_stage': next_stage.name,
-            'from_count': current_count,
-            'to_count': next_count,
-            'rate': round(rate, 1)
-        })
+    # Applications over time (for chart), from the daily rollup
+    applications_by_date = daily_applications(request.user, timezone.localdate(start_date))
+    recent_applications = sum(day['count'] for day in applications_by_date)
 
-    # Average time in each stage
-    time_in_stage = []
-    for stage in stages:
-        # Calculate average time spent in this stage
-        stage_histories = ApplicationStageHistory.objects.filter(
-            stage=stage,
-            application__job__in=jobs
-        ).order_by('application', 'changed_at')
-
-        total_time = timedelta(0)
-        count = 0
-
-        for history in stage_histories:
-            # Find when they moved to the next stage
-            next_history = ApplicationStageHistory.objects.filter(
-                application=history.application,
-                changed_at__gt=history.changed_at
-            ).order_by('changed_at').first()
-
-            if next_history:
-                time_diff = next_history.changed_at - history.changed_at
-                total_time += time_diff
-                count += 1
-
-        avg_days = (total_time.total_seconds() / 86400 / count) if count > 0 else 0
-        time_in_stage.append({
-            'stage': stage.name,
-            'color': stage.color,
-            'avg_days': round(avg_days, 1)
-        })
+    # Stage distribution, conversion rates and time in stage (jobs/ats_analytics.py)
+    pipeline = pipeline_metrics(request.user)
 
     # Per-job performance
-    job_stats = []
-    for job in jobs[:10]:  # Top 10 jobs
-        app_count = job.applications.count()
-        avg_rating = job.applications.aggregate(
-            avg=Avg('ratings__overall_rating')
-        )['avg']
-        job_stats.append({
+    job_stats = [
+        {
             'job': job,
-            'applications': app_count,
-            'avg_rating': round(avg_rating, 1) if avg_rating else None
-        })
+            'applications': job.application_count,
+            'avg_rating': round(job.avg_rating, 1) if job.avg_rating else None
+        }
+        for job in jobs.annotate(
+            application_count=Count('applications', distinct=True),
+            avg_rating=Avg('applications__ratings__overall_rating'),
+        )[:10]  # Top 10 jobs
+    ]
 
     # Top rated candidates
     top_candidates = JobApplication.objects.filter(
@@ -3267,15 +3005,15 @@ def analytics_dashboard(request):
         'date_range': days,
         'start_date': start_date,
         # Basic stats
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs,
-        'total_applications': total_applications,
+        'total_jobs': job_counts['total'],
+        'active_jobs': job_counts['active'],
+        'total_applications': pipeline['total_applications'],
         'recent_applications': recent_applications,
         # Charts data
-        'applications_by_date': list(applications_by_date),
-        'stage_distribution': stage_distribution,
-        'conversion_rates': conversion_rates,
-        'time_in_stage': time_in_stage,
+        'applications_by_date': applications_by_date,
+        'stage_distribution': pipeline['stage_distribution'],
+        'conversion_rates': pipeline['conversion_rates'],
+        'time_in_stage': pipeline['time_in_stage'],
         # Tables
         'job_stats': job_stats,
         'top_candidates': top_candidates,
@@ -3289,85 +3027,28 @@ def analytics_dashboard(request):
 
 @login_required
 def analytics_export(request):
-    """Export analytics data as CSV"""
+    """Export analytics data as CSV, streamed (?gzip=1 for a .csv.gz)"""
     if not hasattr(request.user, 'userprofile') or request.user.userprofile.user_type != 'employer':
         messages.error(request, 'Access denied. Employer account required.')
         return redirect('home')
 
-    import csv
-    from django.http import HttpResponse
+    from django.http import StreamingHttpResponse
+    from .csv_export import EXPORTS, stream_csv
 
     export_type = request.GET.get('type', 'applications')
+    compress = request.GET.get('gzip') == '1'
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="rjrp_{export_type}_{timezone.now().strftime("%Y%m%d")}.csv"'
-
-    writer = csv.writer(response)
-
-    jobs = Job.objects.filter(posted_by=request.user)
-
-    if export_type == 'applications':
-        writer.writerow([
-            'Job Title', 'Applicant Name', 'Applicant Email', 'Applied Date',
-            'Current Stage', 'Status', 'Average Rating', 'Tags'
-        ])
-
-        applications = JobApplication.objects.filter(
-            job__in=jobs
-        ).select_related('job', 'applicant', 'current_stage').prefetch_related('tag_assignments__tag')
-
-        for app in applications:
-            tags = ', '.join([ta.tag.name for ta in app.tag_assignments.all()])
-            writer.writerow([
-                app.job.title,
-                app.applicant.get_full_name() or app.applicant.username,
-                app.applicant.email,
-                app.applied_date.strftime('%Y-%m-%d %H:%M'),
-                app.current_stage.name if app.current_stage else 'No Stage',
-                app.status,
-                app.get_average_rating() or 'Not Rated',
-                tags
-            ])
-
-    elif export_type == 'pipeline':
-        writer.writerow([
-            'Job Title', 'Stage', 'Applications Count', 'Avg Days in Stage'
-        ])
-
-        stages = HiringStage.objects.filter(employer=request.user).order_by('order')
-
-        for job in jobs:
-            for stage in stages:
-                count = job.applications.filter(current_stage=stage).count()
-                # Calculate avg time in stage for this job
-                writer.writerow([
-                    job.title,
-                    stage.name,
-                    count,
-                    'N/A'  # Could calculate avg time here
-                ])
-
-    elif export_type == 'jobs':
-        writer.writerow([
-            'Job Title', 'Company', 'Location', 'Posted Date', 'Status',
-            'Total Applications', 'Pending', 'Reviewed', 'Accepted', 'Rejected'
-        ])
-
-        for job in jobs:
-            apps = job.applications.all()
-            writer.writerow([
-                job.title,
-                job.company,
-                job.location,
-                job.posted_date.strftime('%Y-%m-%d'),
-                'Active' if job.is_active else 'Inactive',
-                apps.count(),
-                apps.filter(status='pending').count(),
-                apps.filter(status='reviewed').count(),
-                apps.filter(status='accepted').count(),
-                apps.filter(status='rejected').count(),
-            ])
+    # Rows are streamed page by page (jobs/csv_export.py); an unknown type is an empty file
+    header, rows = EXPORTS.get(export_type, ([], lambda employer: ()))
+    filename = f'rjrp_{export_type}_{timezone.now().strftime("%Y%m%d")}.csv'
+    if compress:
+        filename += '.gz'
 
+    response = StreamingHttpResponse(
+        stream_csv(header, rows(request.user), compress=compress),
+        content_type='application/gzip' if compress else 'text/csv',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
 
@@ -3446,6 +3127,9 @@ def job_analytics(request, job_id):
 # CANDIDATE SEARCH (FOR EMPLOYERS)
 # ============================================
 
+CANDIDATES_PER_PAGE = 20
+
+
 @login_required
 def candidate_search(request):
     """Search for candidates/job seekers (employer or verified recruiter)"""
@@ -3467,33 +3151,20 @@ def candidate_search(request):
         messages.warning(request, 'Your recruiter account must be fully verified and approved to search candidates.')
         return redirect('recruiter_dashboard')
 
-    # Base queryset: only verified job seekers with searchable profiles
-    candidates = UserProfile.objects.filter(
-        user_type='job_seeker',
-        profile_searchable=True
-    ).select_related('user')
-
-    # For recruiters, only show candidates who opted-in to recruiter contact
-    if is_recruiter:
-        candidates = candidates.filter(allow_recruiter_contact=True)
+    from django.core.paginator import Paginator
+    from .candidates import CandidateSearch, candidate_pool
 
-    # Only show candidates who have verified (at least email or phone)
-    verified_candidates = []
-    for profile in candidates:
-        if profile.is_verified():
-            verified_candidates.append(profile.id)
-    candidates = candidates.filter(id__in=verified_candidates)
+    # Base queryset: only verified job seekers with searchable profiles
+    # (contact_verified is is_verified() kept in SQL, see jobs/candidates.py).
+    # For recruiters, only candidates who opted-in to recruiter contact.
+    candidates = candidate_pool(recruiter=is_recruiter).select_related(
+        'user', 'user__phone_verification', 'user__email_verification'
+    ).defer('search_vector')
 
     # Search query (name, skills, title, bio)
     search_query = request.GET.get('search', '')
-    if search_query:
-        candidates = candidates.filter(
-            Q(user__first_name__icontains=search_query) |
-            Q(user__last_name__icontains=search_query) |
-            Q(skills__icontains=search_query) |
-            Q(desired_title__icontains=search_query) |
-            Q(bio__icontains=search_query)
-        )
+    search = CandidateSearch(search_query)
+    candidates = search.filter(candidates)
 
     # Location filter
     location_filter = request.GET.get('location', '')
@@ -3536,11 +3207,19 @@ def candidate_search(request):
         profile_searchable=True
     ).exclude(location='').values_list('location', flat=True).distinct().order_by('location')
 
-    # Order by most recently updated (using user's date_joined as proxy)
-    candidates = candidates.order_by('-user__date_joined')
+    # Best matches first when searching (Postgres), then most recently
+    # updated (using user's date_joined as proxy)
+    rank = search.rank(candidates)
+    if rank is not None:
+        candidates = candidates.annotate(rank=rank).order_by('-rank', '-user__date_joined', '-pk')
+    else:
+        candidates = candidates.order_by('-user__date_joined', '-pk')
+
+    page = Paginator(candidates, CANDIDATES_PER_PAGE).get_page(request.GET.get('page'))
 
     context = {
-        'candidates': candidates,
+        'candidates': page,
+        'page_obj': page,
         'search_query': search_query,
         'location_filter': location_filter,
         'skills_filter': skills_filter,
@@ -3549,7 +3228,7 @@ def candidate_search(request):
         'has_resume': has_resume,
         'has_linkedin': has_linkedin,
         'all_locations': all_locations,
-        'total_results': candidates.count(),
+        'total_results': page.paginator.count,
         'is_recruiter': is_recruiter,
     }
     return render(request, 'jobs/candidate_search.html', context)